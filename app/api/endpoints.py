@@ -1,8 +1,20 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request, Response
-from typing import Dict, Any
+import time
+import asyncio
+import logging
+import threading
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request, Response, HTTPException
+from typing import Dict, Any, List
 from pathlib import Path
+from xml.sax.saxutils import quoteattr
 
 from app.core import handle_call_connection, handle_frontend_connection, functions
+from app.core.event_broadcaster import AUDIO_SUBPROTOCOL
+from app.core.metrics import registry
+from app.core.loop_monitor import loop_monitor
+from app.core.profiler import ADMIN_TOKEN, check_admin_token, sample_stacks, render_collapsed
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter()
@@ -33,6 +45,48 @@ async def tools() -> list:
     return [f.schema for f in functions]
 
 
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Endpoint that returns worker metrics in the Prometheus text format."""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def require_admin(request: Request) -> None:
+    """Reject requests without the admin token (`Authorization: Bearer` or `X-Admin-Token`)."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    token = request.headers.get("x-admin-token")
+    authorization = request.headers.get("authorization", "")
+    if not token and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    if not check_admin_token(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/admin/profile")
+async def admin_profile(request: Request, seconds: float = 10.0, interval_ms: float = 5.0) -> Response:
+    """Endpoint that samples the event loop for a while and returns collapsed stacks for a flamegraph."""
+    require_admin(request)
+    # Handlers run on the event loop thread, which is the one to profile
+    loop_thread_id = threading.get_ident()
+    counts = await asyncio.get_running_loop().run_in_executor(
+        None, sample_stacks, loop_thread_id, max(0.1, seconds), max(1.0, interval_ms) / 1000
+    )
+    filename = f"profile-{int(time.time())}.collapsed"
+    return Response(
+        content=render_collapsed(counts),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/admin/slow-callbacks")
+async def admin_slow_callbacks(request: Request) -> List[Dict[str, Any]]:
+    """Endpoint that returns the recent event-loop stalls and the stacks that caused them."""
+    require_admin(request)
+    return loop_monitor.recent_slow_callbacks()
+
+
 @router.api_route("/twiml", methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD", "PATCH"])
 async def twiml(request: Request) -> Response:
     """Endpoint that returns TwiML template with WebSocket URL.
@@ -46,8 +100,22 @@ async def twiml(request: Request) -> Response:
         ws_url += "/"
     ws_url += "call"
     
-    # Replace the placeholder
+    # Twilio sends call details as query params (GET) or form fields (POST)
+    params = dict(request.query_params)
+    if request.method == "POST":
+        form = await request.form()
+        params.update({k: str(v) for k, v in form.items()})
+    
+    # The contact is the callee on outbound calls and the caller on inbound ones
+    if params.get("Direction", "").startswith("outbound"):
+        contact_number = params.get("To", "")
+    else:
+        contact_number = params.get("From", "")
+    
+    # Replace the placeholders
     twiml_content = twiml_template.replace("{{WS_URL}}", ws_url)
+    twiml_content = twiml_content.replace('"{{CONTACT_NUMBER}}"', quoteattr(contact_number))
+    twiml_content = twiml_content.replace('"{{CAMPAIGN_ID}}"', quoteattr(params.get("campaign_id", "")))
     
     # Return as XML
     return Response(content=twiml_content, media_type="text/xml")
@@ -62,16 +130,21 @@ async def websocket_call(websocket: WebSocket) -> None:
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"Error in Twilio WebSocket: {e}")
+        logger.error("Error in Twilio WebSocket: %s", e)
 
 
 @router.websocket("/logs")
 async def websocket_logs(websocket: WebSocket) -> None:
-    """WebSocket endpoint for frontend logging."""
-    await websocket.accept()
+    """WebSocket endpoint for frontend logging.
+    
+    Clients offering the binary audio subprotocol receive audio as raw
+    mu-law binary frames instead of base64 JSON.
+    """
+    binary_audio = AUDIO_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=AUDIO_SUBPROTOCOL if binary_audio else None)
     try:
-        await handle_frontend_connection(websocket)
+        await handle_frontend_connection(websocket, binary_audio)
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"Error in frontend WebSocket: {e}") 
\ No newline at end of file
+        logger.error("Error in frontend WebSocket: %s", e) 
\ No newline at end of file
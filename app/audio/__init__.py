@@ -0,0 +1,9 @@
+from app.audio.codec import (
+    ulaw_decode, ulaw_encode, decode_base64, encode_base64,
+    ULAW_DECODE_TABLE, ULAW_ENCODE_TABLE
+)
+from app.audio.analysis import (
+    frame_energy, frame_rms, rms, rms_dbfs, to_dbfs,
+    SAMPLE_RATE, FRAME_SAMPLES
+)
+from app.audio.resample import resample, upsample
@@ -0,0 +1,163 @@
+"""Answering machine detection from the first seconds of inbound audio."""
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app.audio.analysis import rms, to_dbfs, SAMPLE_RATE, FRAME_SAMPLES
+
+# Verdicts and events reported by AnsweringMachineDetector.process
+HUMAN = "human"
+MACHINE = "machine"
+UNKNOWN = "unknown"
+BEEP = "beep"
+
+# Frequency range of voicemail record tones, in Hz
+BEEP_MIN_HZ = 900
+BEEP_MAX_HZ = 2100
+
+
+class AnsweringMachineDetector:
+    """Classifies the callee as a person or a voicemail greeting.
+
+    People answer with a short greeting ("Hello?") and then wait; voicemail
+    greetings talk continuously for several seconds and end in a record
+    tone. The detector follows speech cadence frame by frame and checks each
+    frame's spectrum for a pure tone sustained over consecutive frames.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -40.0,
+        analysis_ms: int = 4000,
+        human_greeting_ms: int = 1500,
+        human_silence_ms: int = 800,
+        machine_greeting_ms: int = 2500,
+        beep_ms: int = 120,
+    ):
+        """Create a detector.
+
+        Args:
+            threshold_dbfs: Frame level above which a frame counts as speech
+            analysis_ms: Audio analyzed before giving up with UNKNOWN
+            human_greeting_ms: Longest greeting still typical of a person
+            human_silence_ms: Silence after a short greeting that means a person is waiting
+            machine_greeting_ms: Greeting length that means a recording
+            beep_ms: Tone duration that counts as a record beep
+        """
+        self.threshold_dbfs = threshold_dbfs
+        self.analysis_ms = analysis_ms
+        self.human_greeting_ms = human_greeting_ms
+        self.human_silence_ms = human_silence_ms
+        self.machine_greeting_ms = machine_greeting_ms
+        self.beep_frames = max(1, beep_ms // 20)
+
+        self.elapsed_ms = 0.0
+        self.greeting_ms = 0.0
+        self.silence_ms = 0.0
+        self.verdict: Optional[str] = None
+        self.reason: Optional[str] = None
+        self.decided_ms: Optional[float] = None
+        self.beep_detected = False
+
+        self._taper = np.hanning(FRAME_SAMPLES).astype(np.float32)
+        freqs = np.fft.rfftfreq(FRAME_SAMPLES, 1.0 / SAMPLE_RATE)
+        self._beep_bins = (freqs >= BEEP_MIN_HZ) & (freqs <= BEEP_MAX_HZ)
+        self._tone_run = 0
+        self._tone_bin = -1
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]]) -> Optional["AnsweringMachineDetector"]:
+        """Build a detector from the `amd` block of `conversation_settings`.
+
+        Args:
+            settings: Campaign conversation settings
+
+        Returns:
+            A detector, or None when AMD is not enabled
+        """
+        config = (settings or {}).get("amd") or {}
+        if not config.get("enabled"):
+            return None
+        options = (
+            "threshold_dbfs", "analysis_ms", "human_greeting_ms", "human_silence_ms",
+            "machine_greeting_ms", "beep_ms",
+        )
+        return cls(**{key: config[key] for key in options if key in config})
+
+    def _decide(self, verdict: str, reason: str) -> str:
+        self.verdict = verdict
+        self.reason = reason
+        self.decided_ms = self.elapsed_ms
+        return verdict
+
+    def _detect_tone(self, samples: np.ndarray) -> bool:
+        """Track a sustained pure tone in the beep band across consecutive frames"""
+        spectrum = np.abs(np.fft.rfft(samples[:FRAME_SAMPLES] * self._taper)) ** 2
+        total = spectrum.sum()
+        if total <= 0:
+            self._tone_run = 0
+            return False
+
+        peak = int(np.argmax(spectrum))
+        band = spectrum[max(0, peak - 1):peak + 2].sum()
+        tonal = self._beep_bins[peak] and band / total > 0.8
+        if tonal and abs(peak - self._tone_bin) <= 1:
+            self._tone_run += 1
+        else:
+            self._tone_run = 1 if tonal else 0
+        self._tone_bin = peak if tonal else -1
+        return self._tone_run >= self.beep_frames
+
+    def process(self, samples: np.ndarray) -> Optional[str]:
+        """Feed one 20 ms frame of PCM audio.
+
+        Args:
+            samples: int16 PCM samples at 8 kHz
+
+        Returns:
+            HUMAN, MACHINE or UNKNOWN on the frame the verdict is reached,
+            BEEP when a record tone is heard after a MACHINE verdict, else None
+        """
+        if len(samples) < FRAME_SAMPLES or self.beep_detected:
+            return None
+
+        self.elapsed_ms += len(samples) * 1000.0 / SAMPLE_RATE
+        speech = float(to_dbfs(rms(samples))) >= self.threshold_dbfs
+
+        if speech and self._detect_tone(samples):
+            self.beep_detected = True
+            if self.verdict is None:
+                self._decide(MACHINE, "beep")
+                return MACHINE
+            return BEEP if self.verdict == MACHINE else None
+        if not speech:
+            self._tone_run = 0
+
+        if self.verdict is not None:
+            return None
+
+        if speech:
+            if self.greeting_ms and self.silence_ms:
+                # Pauses between phrases are part of the greeting
+                self.greeting_ms += self.silence_ms
+            self.greeting_ms += len(samples) * 1000.0 / SAMPLE_RATE
+            self.silence_ms = 0.0
+        else:
+            self.silence_ms += len(samples) * 1000.0 / SAMPLE_RATE
+
+        if self.greeting_ms >= self.machine_greeting_ms:
+            return self._decide(MACHINE, "long_greeting")
+        if 0 < self.greeting_ms <= self.human_greeting_ms and self.silence_ms >= self.human_silence_ms:
+            return self._decide(HUMAN, "short_greeting")
+        if self.elapsed_ms >= self.analysis_ms:
+            return self._decide(UNKNOWN, "timeout")
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Detection outcome for the call summary"""
+        return {
+            "verdict": self.verdict,
+            "reason": self.reason,
+            "decided_ms": self.decided_ms,
+            "beep": self.beep_detected,
+        }
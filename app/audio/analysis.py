@@ -0,0 +1,58 @@
+"""Vectorized level and energy measurements on PCM audio."""
+from typing import Optional
+
+import numpy as np
+
+# Telephony sample rate and the 20 ms frame Twilio streams
+SAMPLE_RATE = 8000
+FRAME_SAMPLES = 160
+
+# Level reported for digital silence, in dBFS
+SILENCE_DBFS = -96.0
+
+# Full-scale amplitude of int16 audio
+_FULL_SCALE = 32768.0
+
+
+def frame_energy(samples: np.ndarray, frame_samples: int = FRAME_SAMPLES) -> np.ndarray:
+    """Mean energy (mean of squared samples) of each complete frame.
+
+    Args:
+        samples: int16 PCM samples
+        frame_samples: Samples per frame; a trailing partial frame is ignored
+
+    Returns:
+        float64 energy per frame
+    """
+    count = len(samples) // frame_samples
+    if count == 0:
+        return np.zeros(0)
+    frames = samples[:count * frame_samples].reshape(count, frame_samples).astype(np.float64)
+    return np.einsum("ij,ij->i", frames, frames) / frame_samples
+
+
+def frame_rms(samples: np.ndarray, frame_samples: int = FRAME_SAMPLES) -> np.ndarray:
+    """RMS amplitude of each complete frame"""
+    return np.sqrt(frame_energy(samples, frame_samples))
+
+
+def rms(samples: np.ndarray) -> float:
+    """RMS amplitude of a whole buffer"""
+    if len(samples) == 0:
+        return 0.0
+    values = samples.astype(np.float64)
+    return float(np.sqrt(np.dot(values, values) / len(values)))
+
+
+def to_dbfs(amplitude: np.ndarray, floor: Optional[float] = SILENCE_DBFS) -> np.ndarray:
+    """Convert RMS amplitudes to dBFS, clamped at `floor`"""
+    with np.errstate(divide="ignore"):
+        levels = 20.0 * np.log10(np.asarray(amplitude, dtype=np.float64) / _FULL_SCALE)
+    if floor is not None:
+        levels = np.maximum(levels, floor)
+    return levels
+
+
+def rms_dbfs(samples: np.ndarray) -> float:
+    """Level of a whole buffer in dBFS"""
+    return float(to_dbfs(rms(samples)))
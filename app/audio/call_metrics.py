@@ -0,0 +1,153 @@
+"""Conversation metrics of a two-channel call recording.
+
+Works on the files app.audio.recorder writes: interleaved 8 kHz mu-law,
+caller left and assistant right, as WAV or raw. Each channel is reduced to a
+per-frame speech mask by level, short gaps are bridged and blips dropped,
+and the metrics are counted on the masks. Everything is vectorized. Calls are
+analysed in a worker process after hangup, so nothing here runs on the
+event loop.
+"""
+import time
+import struct
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.audio.codec import ULAW_DECODE_TABLE
+from app.audio.analysis import frame_rms, to_dbfs, SAMPLE_RATE, FRAME_SAMPLES
+
+FRAME_MS = FRAME_SAMPLES * 1000 // SAMPLE_RATE
+
+# Frame level above which a channel counts as speaking
+SPEECH_THRESHOLD_DBFS = -35.0
+
+# Pauses shorter than this stay inside one utterance
+BRIDGE_GAP_MS = 300
+
+# Utterances shorter than this are noise
+MIN_SPEECH_MS = 120
+
+
+def read_recording_audio(path: str, fmt: str = "wav") -> np.ndarray:
+    """Read a recording as an (n, 2) uint8 array of mu-law samples.
+
+    Raises:
+        ValueError: If a WAV file has no data chunk
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if fmt == "wav":
+        position = 12
+        while True:
+            if position + 8 > len(data):
+                raise ValueError(f"{path} has no WAV data chunk")
+            chunk, size = struct.unpack_from("<4sI", data, position)
+            position += 8
+            if chunk == b"data":
+                # A recording cut off by a crash still has the placeholder size
+                data = data[position:position + size]
+                break
+            position += size + (size & 1)
+    samples = np.frombuffer(data, dtype=np.uint8)
+    return samples[:len(samples) // 2 * 2].reshape(-1, 2)
+
+
+def segments(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) frame indices of each run of True"""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def speech_segments(
+    samples: np.ndarray,
+    threshold_dbfs: float = SPEECH_THRESHOLD_DBFS,
+    bridge_frames: int = BRIDGE_GAP_MS // FRAME_MS,
+    min_frames: int = MIN_SPEECH_MS // FRAME_MS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Utterances in one channel of int16 audio, as frame (starts, ends)"""
+    starts, ends = segments(to_dbfs(frame_rms(samples)) >= threshold_dbfs)
+    if len(starts) > 1:
+        keep = starts[1:] - ends[:-1] > bridge_frames
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+    long_enough = ends - starts >= min_frames
+    return starts[long_enough], ends[long_enough]
+
+
+def to_mask(starts: np.ndarray, ends: np.ndarray, frames: int) -> np.ndarray:
+    """Per-frame mask that is True inside the segments"""
+    steps = np.zeros(frames + 1, dtype=np.int32)
+    np.add.at(steps, starts, 1)
+    np.add.at(steps, ends, -1)
+    return np.cumsum(steps[:-1]) > 0
+
+
+def conversation_metrics(
+    stereo: np.ndarray,
+    interruptions_ms: Optional[List[int]] = None,
+    threshold_dbfs: float = SPEECH_THRESHOLD_DBFS,
+) -> Dict[str, Any]:
+    """Talk time, silence, overlap, interruptions and response gaps of a call.
+
+    Args:
+        stereo: (n, 2) mu-law samples, caller then assistant
+        interruptions_ms: Media times at which the caller barged in and
+            assistant audio was cleared. When None, interruptions are counted
+            from the audio as caller utterances starting while the assistant
+            speaks.
+        threshold_dbfs: Frame level above which a channel counts as speaking
+
+    Returns:
+        Metric name to value; ratios are None when nobody spoke
+    """
+    caller_pcm = ULAW_DECODE_TABLE[stereo[:, 0]]
+    assistant_pcm = ULAW_DECODE_TABLE[stereo[:, 1]]
+    frames = len(stereo) // FRAME_SAMPLES
+    caller_starts, caller_ends = speech_segments(caller_pcm, threshold_dbfs)
+    assistant_starts, assistant_ends = speech_segments(assistant_pcm, threshold_dbfs)
+    caller = to_mask(caller_starts, caller_ends, frames)
+    assistant = to_mask(assistant_starts, assistant_ends, frames)
+
+    caller_frames = int(caller.sum())
+    assistant_frames = int(assistant.sum())
+    talk_frames = caller_frames + assistant_frames
+    silent_frames = int(np.count_nonzero(~(caller | assistant)))
+
+    if interruptions_ms is None:
+        interruptions = int(np.count_nonzero(assistant[caller_starts])) if frames else 0
+    else:
+        interruptions = len(interruptions_ms)
+
+    # A response is the first assistant utterance after a caller utterance
+    # ends, provided the caller has not started speaking again first
+    next_reply = np.searchsorted(assistant_starts, caller_ends)
+    has_reply = next_reply < len(assistant_starts)
+    reply_starts = assistant_starts[next_reply[has_reply]]
+    ends = caller_ends[has_reply]
+    next_caller = np.searchsorted(caller_starts, ends)
+    next_caller_start = np.append(caller_starts, frames + 1)[next_caller]
+    gaps = (reply_starts - ends)[reply_starts < next_caller_start]
+
+    return {
+        "duration_seconds": round(len(stereo) / SAMPLE_RATE, 2),
+        "caller_talk_seconds": round(caller_frames * FRAME_MS / 1000, 2),
+        "assistant_talk_seconds": round(assistant_frames * FRAME_MS / 1000, 2),
+        "talk_ratio": round(caller_frames / talk_frames, 3) if talk_frames else None,
+        "silence_pct": round(100 * silent_frames / frames, 1) if frames else None,
+        "overlap_seconds": round(int(np.count_nonzero(caller & assistant)) * FRAME_MS / 1000, 2),
+        "interruptions": interruptions,
+        "responses": len(gaps),
+        "response_gap_ms": round(float(gaps.mean()) * FRAME_MS) if len(gaps) else None,
+    }
+
+
+def analyze_recording(path: str, fmt: str = "wav", interruptions_ms: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Read and analyse a recording; runs in a worker process.
+
+    Returns:
+        conversation_metrics() plus `analysis_ms`, the worker's time on the job
+    """
+    start = time.perf_counter()
+    metrics = conversation_metrics(read_recording_audio(path, fmt), interruptions_ms)
+    metrics["analysis_ms"] = (time.perf_counter() - start) * 1000
+    return metrics
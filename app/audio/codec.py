@@ -0,0 +1,93 @@
+"""Lookup-table based G.711 mu-law codec."""
+import binascii
+from typing import Optional, Union
+
+import numpy as np
+
+# G.711 mu-law constants
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159  # on 14-bit magnitudes
+
+
+def _build_decode_table() -> np.ndarray:
+    """mu-law byte -> int16 sample, for all 256 codes"""
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = codes & 0x80
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + ULAW_BIAS) << exponent) - ULAW_BIAS
+    return np.where(sign != 0, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table() -> np.ndarray:
+    """int16 sample (indexed as uint16) -> mu-law byte, for all 65536 values.
+
+    Follows the 14-bit G.711 reference encoder (as used by audioop/sox).
+    """
+    samples = np.arange(65536, dtype=np.int32).astype(np.uint16).view(np.int16).astype(np.int32)
+    values = samples >> 2
+    mask = np.where(values < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(values), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment_ends = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+    segment = np.searchsorted(segment_ends, magnitude)
+    codes = (np.minimum(segment, 7) << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    codes = np.where(segment >= 8, 0x7F, codes)
+    return (codes ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE_TABLE = _build_decode_table()
+ULAW_ENCODE_TABLE = _build_encode_table()
+
+
+def ulaw_decode(data: Union[bytes, bytearray, memoryview, np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decode mu-law bytes to 16-bit linear PCM.
+
+    Args:
+        data: mu-law encoded audio
+        out: Optional preallocated int16 buffer of at least len(data) samples
+
+    Returns:
+        int16 samples (a view of `out` when given)
+    """
+    codes = data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+    if out is None:
+        return ULAW_DECODE_TABLE[codes]
+    target = out[:len(codes)]
+    np.take(ULAW_DECODE_TABLE, codes, out=target)
+    return target
+
+
+def ulaw_encode(samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Encode 16-bit linear PCM to mu-law bytes.
+
+    Args:
+        samples: int16 samples
+        out: Optional preallocated uint8 buffer of at least len(samples) bytes
+
+    Returns:
+        uint8 mu-law codes (a view of `out` when given)
+    """
+    index = np.asarray(samples, dtype=np.int16).view(np.uint16)
+    if out is None:
+        return ULAW_ENCODE_TABLE[index]
+    target = out[:len(index)]
+    np.take(ULAW_ENCODE_TABLE, index, out=target)
+    return target
+
+
+def decode_base64(payload: Union[str, bytes], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decode a base64 mu-law media payload (Twilio or Realtime) to PCM.
+
+    Args:
+        payload: Base64 encoded mu-law audio
+        out: Optional preallocated int16 buffer
+
+    Returns:
+        int16 samples (a view of `out` when given)
+    """
+    return ulaw_decode(binascii.a2b_base64(payload), out)
+
+
+def encode_base64(samples: np.ndarray) -> str:
+    """Encode PCM samples as a base64 mu-law media payload"""
+    return binascii.b2a_base64(ulaw_encode(samples).tobytes(), newline=False).decode("ascii")
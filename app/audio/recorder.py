@@ -0,0 +1,196 @@
+"""Two-channel call recording: caller left, assistant right, 8 kHz mu-law.
+
+Both channels live in preallocated ring buffers indexed by the call's media
+timeline. Caller frames land at their Twilio timestamp. Assistant audio lands
+where Twilio will play it: after what is already queued, or now if nothing
+is. A `clear` erases assistant audio that was queued but never played.
+Everything up to the newest caller frame is final. It is interleaved and
+handed to the background file writer about once a second, so recording costs
+the event loop a few array copies per frame.
+"""
+import os
+import base64
+import struct
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.audio.analysis import SAMPLE_RATE
+from app.services.file_writer import file_writer
+
+# Directory recordings are written to, one `<stream sid>.wav` file per call
+CALL_RECORDING_DIR = os.getenv("CALL_RECORDING_DIR", "recordings/audio")
+
+# Timeline held in memory; assistant audio queued further ahead than this is clipped
+RECORDING_WINDOW_SECONDS = 30
+
+# Final audio buffered before it is handed to the writer
+FLUSH_SAMPLES = SAMPLE_RATE
+
+# Mu-law code of a zero sample
+ULAW_SILENCE = 0xFF
+
+# WAVE_FORMAT_MULAW
+WAV_FORMAT_MULAW = 7
+
+
+def wav_header(data_bytes: int, channels: int = 2) -> bytes:
+    """Header of a mu-law WAV file holding `data_bytes` of interleaved samples"""
+    return (
+        b"RIFF" + struct.pack("<I", min(50 + data_bytes, 0xFFFFFFFF)) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHHH", 18, WAV_FORMAT_MULAW, channels, SAMPLE_RATE,
+                                SAMPLE_RATE * channels, channels, 8, 0)
+        + b"fact" + struct.pack("<II", 4, data_bytes // channels)
+        + b"data" + struct.pack("<I", data_bytes)
+    )
+
+
+class CallRecorder:
+    """Records one call's caller and assistant audio"""
+
+    def __init__(self, path: str, fmt: str = "wav", window_seconds: int = RECORDING_WINDOW_SECONDS,
+                 analytics: bool = False):
+        """Start a recording.
+
+        Args:
+            path: File to write
+            fmt: "wav" for a stereo mu-law WAV, "raw" for headerless interleaved mu-law
+            window_seconds: Timeline held in memory
+            analytics: Analyse the recording after hangup
+        """
+        self.path = path
+        self.fmt = fmt
+        self.size = window_seconds * SAMPLE_RATE
+        self.caller = np.full(self.size, ULAW_SILENCE, dtype=np.uint8)
+        self.assistant = np.full(self.size, ULAW_SILENCE, dtype=np.uint8)
+        self._out = np.empty(2 * self.size, dtype=np.uint8)
+        # Sample positions on the call timeline
+        self.flushed = 0
+        self.caller_end = 0
+        self.assistant_end = 0
+        self.data_bytes = 0
+        self.late_samples = 0
+        self.clipped_samples = 0
+        # Media times at which the caller cut off queued assistant audio
+        self.interruptions: List[int] = []
+        self.analytics = analytics
+        if fmt == "wav":
+            # Sizes are patched at close; until then readers read to the end of the file
+            file_writer.write(path, wav_header(0xFFFFFFFF - 50))
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]], stream_sid: str) -> Optional["CallRecorder"]:
+        """Build a recorder from a campaign's `recording` settings.
+
+        Example settings block:
+            {"recording": {"enabled": true, "format": "wav", "analytics": true}}
+
+        Returns:
+            A recorder, or None when recording is off
+        """
+        config = (settings or {}).get("recording") or {}
+        if not config.get("enabled"):
+            return None
+        fmt = config.get("format", "wav")
+        extension = "wav" if fmt == "wav" else "ulaw"
+        path = os.path.join(CALL_RECORDING_DIR, f"{stream_sid}.{extension}")
+        return cls(path, fmt, analytics=bool(config.get("analytics")))
+
+    def _put(self, ring: np.ndarray, position: int, data: np.ndarray) -> int:
+        """Copy samples into a ring at a timeline position; returns the position after them"""
+        end = position + len(data)
+        if position < self.flushed:
+            # Already written out
+            self.late_samples += min(len(data), self.flushed - position)
+            data = data[self.flushed - position:]
+            position = self.flushed
+        limit = self.flushed + self.size
+        if end > limit:
+            self.clipped_samples += end - max(position, limit)
+            data = data[:max(0, limit - position)]
+        if len(data):
+            start = position % self.size
+            first = min(len(data), self.size - start)
+            ring[start:start + first] = data[:first]
+            ring[:len(data) - first] = data[first:]
+        return end
+
+    def _fill(self, ring: np.ndarray, position: int, end: int) -> None:
+        """Reset a timeline range of a ring to silence"""
+        end = min(end, position + self.size)
+        if end <= position:
+            return
+        start = position % self.size
+        first = min(end - position, self.size - start)
+        ring[start:start + first] = ULAW_SILENCE
+        ring[:end - position - first] = ULAW_SILENCE
+
+    def add_caller(self, timestamp_ms: int, payload: str) -> None:
+        """Record an inbound frame at its Twilio media timestamp"""
+        data = np.frombuffer(base64.b64decode(payload), dtype=np.uint8)
+        end = self._put(self.caller, timestamp_ms * SAMPLE_RATE // 1000, data)
+        if end > self.caller_end:
+            self.caller_end = end
+            if end - self.flushed >= FLUSH_SAMPLES:
+                self.flush(end)
+
+    def add_assistant(self, timestamp_ms: int, payload: str) -> None:
+        """Record audio sent to Twilio at media time `timestamp_ms`; it plays after what is queued"""
+        data = np.frombuffer(base64.b64decode(payload), dtype=np.uint8)
+        position = max(self.assistant_end, timestamp_ms * SAMPLE_RATE // 1000)
+        self.assistant_end = self._put(self.assistant, position, data)
+
+    def clear_assistant(self, timestamp_ms: int, interruption: bool = False) -> None:
+        """Twilio playback was cleared at `timestamp_ms`; drop assistant audio that had not played.
+
+        Args:
+            timestamp_ms: Media time of the clear
+            interruption: The caller barged in, as opposed to e.g. a filler clip
+                making way for the response; counted only if audio was dropped
+        """
+        position = max(self.flushed, timestamp_ms * SAMPLE_RATE // 1000)
+        if self.assistant_end > position:
+            self._fill(self.assistant, position, self.assistant_end)
+            self.assistant_end = position
+            if interruption:
+                self.interruptions.append(timestamp_ms)
+
+    def flush(self, upto: int) -> None:
+        """Interleave the final timeline up to `upto` and hand it to the writer"""
+        count = min(upto, self.flushed + self.size) - self.flushed
+        if count <= 0:
+            return
+        start = self.flushed % self.size
+        first = min(count, self.size - start)
+        out = self._out
+        out[0:2 * first:2] = self.caller[start:start + first]
+        out[1:2 * first:2] = self.assistant[start:start + first]
+        if count > first:
+            out[2 * first:2 * count:2] = self.caller[:count - first]
+            out[2 * first + 1:2 * count:2] = self.assistant[:count - first]
+        file_writer.write(self.path, out[:2 * count].tobytes())
+        self._fill(self.caller, self.flushed, self.flushed + count)
+        self._fill(self.assistant, self.flushed, self.flushed + count)
+        self.flushed += count
+        self.data_bytes += 2 * count
+
+    def close(self) -> None:
+        """Write out the call up to its last caller frame and finish the file"""
+        self.flush(self.caller_end)
+        if self.fmt == "wav":
+            header = wav_header(self.data_bytes)
+
+            def patch_header(f) -> None:
+                f.seek(0)
+                f.write(header)
+
+            file_writer.run(self.path, patch_header)
+        file_writer.close(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "seconds": round(max(self.flushed, self.caller_end) / SAMPLE_RATE, 2),
+            "late_ms": self.late_samples * 1000 // SAMPLE_RATE,
+            "clipped_ms": self.clipped_samples * 1000 // SAMPLE_RATE,
+        }
@@ -0,0 +1,55 @@
+"""Upsampling of 8 kHz telephony audio for wideband consumers."""
+import numpy as np
+
+from app.audio.analysis import SAMPLE_RATE
+
+
+def resample(samples: np.ndarray, src_rate: int = SAMPLE_RATE, dst_rate: int = 16000) -> np.ndarray:
+    """Resample PCM audio by linear interpolation.
+
+    Meant for 8 kHz -> 16/24 kHz, where the source band limit already sits
+    well below the new Nyquist frequency and no anti-alias filter is needed.
+
+    Args:
+        samples: int16 PCM samples at `src_rate`
+        src_rate: Source sample rate in Hz
+        dst_rate: Target sample rate in Hz
+
+    Returns:
+        int16 PCM samples at `dst_rate`
+    """
+    if src_rate == dst_rate or len(samples) == 0:
+        return np.asarray(samples, dtype=np.int16)
+
+    count = int(round(len(samples) * dst_rate / src_rate))
+    positions = np.arange(count, dtype=np.float64) * (src_rate / dst_rate)
+    resampled = np.interp(positions, np.arange(len(samples)), samples.astype(np.float64))
+    return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+
+
+def upsample(samples: np.ndarray, factor: int) -> np.ndarray:
+    """Upsample by an integer factor (2 for 16 kHz, 3 for 24 kHz).
+
+    Uses the same linear interpolation as `resample`, but builds each output
+    phase from whole-array arithmetic instead of per-sample positions.
+
+    Args:
+        samples: int16 PCM samples
+        factor: Integer upsampling factor
+
+    Returns:
+        int16 PCM samples, `factor` times as many
+    """
+    if factor <= 1 or len(samples) == 0:
+        return np.asarray(samples, dtype=np.int16)
+
+    current = samples.astype(np.float32)
+    following = np.empty_like(current)
+    following[:-1] = current[1:]
+    following[-1] = current[-1]
+    step = following - current
+
+    out = np.empty((len(current), factor), dtype=np.float32)
+    for phase in range(factor):
+        out[:, phase] = current + step * (phase / factor)
+    return np.rint(out.reshape(-1)).astype(np.int16)
@@ -0,0 +1,121 @@
+"""Silence gating of inbound audio before it is sent to the Realtime API."""
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.audio.analysis import rms, to_dbfs, SAMPLE_RATE
+
+# Server VAD's default `silence_duration_ms`; the hangover must outlast it or
+# the server never sees the end of a turn
+SERVER_VAD_SILENCE_MS = 500
+
+
+class SilenceGate:
+    """Drops or thins out inbound frames once the line has been silent a while.
+
+    Every frame is forwarded while the caller speaks and for `hangover_ms`
+    afterwards, which must exceed the server VAD silence duration so turns
+    still end. Past the hangover only every `keepalive_every`-th silent frame
+    is forwarded (0 drops them all). The last `preroll_ms` of gated silence
+    is held back and sent ahead of the next speech frame, so server VAD
+    still gets padding before the onset.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -50.0,
+        hangover_ms: int = SERVER_VAD_SILENCE_MS + 500,
+        preroll_ms: int = 300,
+        keepalive_every: int = 0,
+    ):
+        """Create a gate.
+
+        Args:
+            threshold_dbfs: Frame level above which a frame counts as speech
+            hangover_ms: Silence forwarded after speech before gating starts
+            preroll_ms: Gated silence replayed ahead of new speech
+            keepalive_every: Forward every Nth gated frame; 0 forwards none
+        """
+        self.threshold_dbfs = threshold_dbfs
+        self.hangover_ms = hangover_ms
+        self.keepalive_every = keepalive_every
+        self._preroll: deque = deque(maxlen=max(1, preroll_ms // 20))
+        self._silence_ms = 0.0
+        self._gated = 0
+        self.frames_in = 0
+        self.frames_forwarded = 0
+        self.bytes_in = 0
+        self.bytes_saved = 0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]]) -> Optional["SilenceGate"]:
+        """Build a gate from the `silence_suppression` block of `conversation_settings`.
+
+        The default hangover is derived from the campaign's server VAD
+        `silence_duration_ms` when one is configured.
+
+        Args:
+            settings: Campaign conversation settings
+
+        Returns:
+            A gate, or None when silence suppression is not enabled
+        """
+        settings = settings or {}
+        config = settings.get("silence_suppression") or {}
+        if not config.get("enabled"):
+            return None
+        vad_silence_ms = (settings.get("turn_detection") or {}).get("silence_duration_ms", SERVER_VAD_SILENCE_MS)
+        return cls(
+            threshold_dbfs=float(config.get("threshold_dbfs", -50.0)),
+            hangover_ms=int(config.get("hangover_ms", vad_silence_ms + 500)),
+            preroll_ms=int(config.get("preroll_ms", 300)),
+            keepalive_every=int(config.get("keepalive_every", 0)),
+        )
+
+    def process(self, payload: str, samples: np.ndarray) -> List[str]:
+        """Decide which payloads to forward for one inbound frame.
+
+        Args:
+            payload: Base64 mu-law media payload of the frame
+            samples: The frame decoded to int16 PCM
+
+        Returns:
+            Payloads to send, oldest first; empty when the frame is gated
+        """
+        self.frames_in += 1
+        self.bytes_in += len(payload)
+
+        if len(samples) and float(to_dbfs(rms(samples))) >= self.threshold_dbfs:
+            self._silence_ms = 0.0
+            forward = list(self._preroll)
+            self._preroll.clear()
+            # Frames replayed from the preroll were counted as saved when gated
+            self.bytes_saved -= sum(len(p) for p in forward)
+            forward.append(payload)
+            self.frames_forwarded += len(forward)
+            return forward
+
+        self._silence_ms += len(samples) * 1000.0 / SAMPLE_RATE
+        if self._silence_ms <= self.hangover_ms:
+            self.frames_forwarded += 1
+            return [payload]
+
+        self._gated += 1
+        if self.keepalive_every and self._gated % self.keepalive_every == 0:
+            self.frames_forwarded += 1
+            return [payload]
+
+        self._preroll.append(payload)
+        self.bytes_saved += len(payload)
+        return []
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call traffic savings for the call summary"""
+        return {
+            "frames_in": self.frames_in,
+            "frames_forwarded": self.frames_forwarded,
+            "bytes_in": self.bytes_in,
+            "bytes_saved": self.bytes_saved,
+            "percent_saved": round(100.0 * self.bytes_saved / self.bytes_in, 1) if self.bytes_in else 0.0,
+        }
@@ -0,0 +1,81 @@
+"""Energy-based voice activity detection on inbound telephony audio."""
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app.audio.analysis import rms, to_dbfs, SAMPLE_RATE
+
+
+class EnergyBargeInDetector:
+    """Detects the caller talking over assistant audio.
+
+    A frame counts as speech when its level exceeds `threshold_dbfs`. Speech
+    must accumulate for `min_speech_ms` to trigger; quieter gaps shorter
+    than `hangover_ms` do not reset the count, so natural dips inside a
+    word are tolerated.
+    """
+
+    def __init__(self, threshold_dbfs: float = -35.0, min_speech_ms: int = 120, hangover_ms: int = 200):
+        """Create a detector.
+
+        Args:
+            threshold_dbfs: Frame level above which a frame counts as speech
+            min_speech_ms: Speech needed before a barge-in is reported
+            hangover_ms: Silence tolerated inside a speech run
+        """
+        self.threshold_dbfs = threshold_dbfs
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]]) -> Optional["EnergyBargeInDetector"]:
+        """Build a detector from the `barge_in` block of `conversation_settings`.
+
+        Args:
+            settings: Campaign conversation settings
+
+        Returns:
+            A detector, or None when local barge-in is not enabled
+        """
+        config = (settings or {}).get("barge_in") or {}
+        if not config.get("enabled"):
+            return None
+        return cls(
+            threshold_dbfs=float(config.get("threshold_dbfs", -35.0)),
+            min_speech_ms=int(config.get("min_speech_ms", 120)),
+            hangover_ms=int(config.get("hangover_ms", 200)),
+        )
+
+    def reset(self) -> None:
+        """Forget any speech in progress"""
+        self.speech_ms = 0.0
+        self.silence_ms = 0.0
+        self.triggered = False
+
+    def process(self, samples: np.ndarray) -> bool:
+        """Feed one frame of PCM audio.
+
+        Args:
+            samples: int16 PCM samples at 8 kHz
+
+        Returns:
+            True on the frame where a barge-in is first detected
+        """
+        if self.triggered or len(samples) == 0:
+            return False
+
+        duration_ms = len(samples) * 1000.0 / SAMPLE_RATE
+        if float(to_dbfs(rms(samples))) >= self.threshold_dbfs:
+            self.speech_ms += duration_ms
+            self.silence_ms = 0.0
+        elif self.speech_ms:
+            self.silence_ms += duration_ms
+            if self.silence_ms > self.hangover_ms:
+                self.speech_ms = 0.0
+                self.silence_ms = 0.0
+
+        if self.speech_ms >= self.min_speech_ms:
+            self.triggered = True
+            return True
+        return False
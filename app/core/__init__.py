@@ -3,4 +3,4 @@ from app.core.session_manager import (
     handle_call_connection, handle_frontend_connection
 )
 from app.core.function_handlers import functions
-from app.core.constants import SYSTEM_PROMPT, SYSTEM_PROMPT_2 
\ No newline at end of file
+from app.core.constants import SYSTEM_PROMPT, SYSTEM_PROMPT_2, SYSTEM_PROMPT_2_SURVEY
\ No newline at end of file
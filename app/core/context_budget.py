@@ -0,0 +1,216 @@
+"""Bounded Realtime conversation context for long calls."""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.tool_output import estimate_tokens
+
+# Rough Realtime audio token rate, per second of speech
+AUDIO_TOKENS_PER_SECOND = 10
+
+# Longest summary kept in the conversation, in characters
+SUMMARY_MAX_CHARS = 1200
+
+# Longest excerpt of one trimmed turn quoted in the summary
+EXCERPT_MAX_CHARS = 160
+
+
+@dataclass
+class ContextItem:
+    """One conversation item and its estimated token cost"""
+    item_id: str
+    item_type: str
+    role: Optional[str] = None
+    call_id: Optional[str] = None
+    text: str = ""
+    text_tokens: int = 0
+    audio_ms: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return self.text_tokens + self.audio_ms * AUDIO_TOKENS_PER_SECOND // 1000
+
+
+def item_text(item: Dict[str, Any]) -> str:
+    """Get the text of a Realtime conversation item: message text or transcripts, tool arguments or output"""
+    item_type = item.get("type")
+    if item_type == "function_call":
+        return f"{item.get('name', '')}({item.get('arguments', '')})"
+    if item_type == "function_call_output":
+        return item.get("output") or ""
+    parts = item.get("content") or []
+    return " ".join(p.get("text") or p.get("transcript") or "" for p in parts).strip()
+
+
+class ConversationContext:
+    """Tracks the items of a Realtime conversation and trims it to a token budget.
+
+    Once the estimated total exceeds `max_tokens`, the oldest items are
+    deleted until it drops to `target_tokens`. Tool calls and their outputs
+    go first, since they are the largest and stalest items; then the oldest
+    turns. The last `keep_recent` items are never trimmed. Trimmed turns can
+    be replaced by one short summary item at the start of the conversation.
+    """
+
+    def __init__(self, max_tokens: int = 12000, target_tokens: Optional[int] = None, keep_recent: int = 8, summary: bool = True):
+        """Create an empty context.
+
+        Args:
+            max_tokens: Estimated tokens that trigger trimming
+            target_tokens: Estimated tokens left after trimming; defaults to 75% of max_tokens
+            keep_recent: Newest items that are never trimmed
+            summary: Whether trimmed turns are replaced by a summary item
+        """
+        self.max_tokens = max_tokens
+        self.target_tokens = target_tokens if target_tokens is not None else max_tokens * 3 // 4
+        self.keep_recent = keep_recent
+        self.summary = summary
+        self.items: "OrderedDict[str, ContextItem]" = OrderedDict()
+        self.summary_item_id: Optional[str] = None
+        self.summary_text = ""
+        self.summaries = 0
+        self._pending_audio: Dict[str, int] = {}
+        self._speech_start: Dict[str, int] = {}
+        self.trimmed_items = 0
+        self.trimmed_tokens = 0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]]) -> Optional["ConversationContext"]:
+        """Build a context from the `context` block of `conversation_settings`.
+
+        Trimming is on by default so long calls stay bounded.
+
+        Args:
+            settings: Campaign conversation settings
+
+        Returns:
+            A context, or None when trimming is disabled
+        """
+        config = (settings or {}).get("context") or {}
+        if config.get("enabled") is False:
+            return None
+        max_tokens = int(config.get("max_tokens", 12000))
+        return cls(
+            max_tokens=max_tokens,
+            target_tokens=int(config["target_tokens"]) if "target_tokens" in config else None,
+            keep_recent=int(config.get("keep_recent", 8)),
+            summary=bool(config.get("summary", True)),
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(item.tokens for item in self.items.values())
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Track an item from a `conversation.item.created` event"""
+        item_id = item.get("id")
+        if not item_id:
+            return
+        text = item_text(item)
+        self.items[item_id] = ContextItem(
+            item_id=item_id,
+            item_type=item.get("type", "message"),
+            role=item.get("role"),
+            call_id=item.get("call_id"),
+            text=text,
+            text_tokens=estimate_tokens(text),
+            audio_ms=self._pending_audio.pop(item_id, 0),
+        )
+
+    def set_text(self, item_id: str, text: str) -> None:
+        """Update an item's text once its transcript is known"""
+        item = self.items.get(item_id)
+        if item:
+            item.text = text
+            item.text_tokens = estimate_tokens(text)
+
+    def add_audio(self, item_id: str, audio_ms: int) -> None:
+        """Account for audio in an item; caller audio is known before its item is created"""
+        if not item_id or audio_ms <= 0:
+            return
+        item = self.items.get(item_id)
+        if item:
+            item.audio_ms += audio_ms
+        else:
+            self._pending_audio[item_id] = self._pending_audio.get(item_id, 0) + audio_ms
+
+    def speech_started(self, item_id: Optional[str], audio_start_ms: Optional[int]) -> None:
+        """Note where server VAD heard the caller start an input item"""
+        if item_id and audio_start_ms is not None:
+            self._speech_start[item_id] = audio_start_ms
+
+    def speech_stopped(self, item_id: Optional[str], audio_end_ms: Optional[int]) -> None:
+        """Account for the caller audio of an input item once server VAD ends it"""
+        start = self._speech_start.pop(item_id, None) if item_id else None
+        if start is not None and audio_end_ms is not None:
+            self.add_audio(item_id, audio_end_ms - start)
+
+    def remove(self, item_id: str) -> None:
+        """Forget an item deleted by anyone"""
+        self.items.pop(item_id, None)
+
+    def over_budget(self) -> bool:
+        return self.total_tokens > self.max_tokens
+
+    def plan_trim(self) -> Tuple[List[str], Optional[str]]:
+        """Pick the items to delete and build the summary that replaces them.
+
+        Selected items are forgotten right away, so a trim in flight is not
+        planned twice. A new summary replaces the previous one and gets a
+        fresh `summary_item_id` for the item to create.
+
+        Returns:
+            Item IDs to delete, oldest first, and the summary text or None
+        """
+        position = {item_id: n for n, item_id in enumerate(self.items)}
+        items = list(self.items.values())
+        split = max(0, len(items) - self.keep_recent)
+        candidates = [i for i in items[:split] if i.item_id != self.summary_item_id]
+        # Tool calls whose other half is still recent are kept whole
+        recent_calls = {i.call_id for i in items[split:] if i.call_id}
+        tool_items = [
+            i for i in candidates
+            if i.item_type in ("function_call", "function_call_output") and i.call_id not in recent_calls
+        ]
+        turns = [i for i in candidates if i.item_type == "message"]
+
+        excess = self.total_tokens - self.target_tokens
+        selected: List[ContextItem] = []
+        for item in tool_items + turns:
+            if excess <= 0:
+                break
+            if item in selected:
+                continue
+            selected.append(item)
+            excess -= item.tokens
+            # A tool call and its output are deleted together
+            for other in tool_items:
+                if other.call_id and other.call_id == item.call_id and other is not item and other not in selected:
+                    selected.append(other)
+                    excess -= other.tokens
+
+        summary = None
+        trimmed_turns = [i for i in selected if i.item_type == "message" and i.text]
+        if self.summary and trimmed_turns:
+            excerpts = [f"{i.role or 'user'}: {i.text[:EXCERPT_MAX_CHARS]}" for i in trimmed_turns]
+            summary = (self.summary_text + "\n" + "\n".join(excerpts)).strip()[-SUMMARY_MAX_CHARS:]
+            self.summary_text = summary
+            if self.summary_item_id in self.items:
+                selected.append(self.items[self.summary_item_id])
+            self.summaries += 1
+            self.summary_item_id = f"context_summary_{self.summaries}"
+
+        for item in selected:
+            self.items.pop(item.item_id, None)
+            self.trimmed_items += 1
+            self.trimmed_tokens += item.tokens
+        return sorted((item.item_id for item in selected), key=position.get), summary
+
+    def stats(self) -> Dict[str, Any]:
+        """Context size and trimming totals for the call summary"""
+        return {
+            "items": len(self.items),
+            "tokens": self.total_tokens,
+            "trimmed_items": self.trimmed_items,
+            "trimmed_tokens": self.trimmed_tokens,
+        }
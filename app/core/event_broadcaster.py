@@ -0,0 +1,209 @@
+"""Fan-out of session events to `/logs` subscribers, off the audio critical path."""
+import json
+import zlib
+import base64
+import struct
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.core.metrics import registry, logs_events_dropped
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Events carrying audio payloads, excluded unless a subscriber asks for them,
+# mapped to the direction byte of the binary frame header
+AUDIO_EVENT_TYPES = {"caller_audio.delta": 0, "response.audio.delta": 1}
+
+# WebSocket subprotocol for binary audio delivery on `/logs`
+AUDIO_SUBPROTOCOL = "callhub.audio.v1"
+
+# Binary audio frame header: version, direction, session tag, stream timestamp (ms)
+AUDIO_FRAME_HEADER = struct.Struct(">BBII")
+AUDIO_FRAME_VERSION = 1
+
+
+def session_tag(stream_sid: Optional[str]) -> int:
+    """Compact 32-bit tag identifying a call in binary audio frames"""
+    return zlib.crc32(stream_sid.encode("utf-8")) if stream_sid else 0
+
+
+# Events a subscriber can fall behind by before the oldest ones are dropped
+DEFAULT_QUEUE_SIZE = 256
+
+
+class LogSubscriber:
+    """One `/logs` connection with its own bounded, drop-oldest queue"""
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        event_types: Optional[Set[str]] = None,
+        audio_sample_every: int = 0,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        """Create a subscriber.
+
+        Args:
+            ws: Frontend WebSocket connection
+            event_types: Event types to deliver; None delivers every non-audio event
+            audio_sample_every: Deliver every Nth audio event; 0 excludes audio
+            queue_size: Maximum number of undelivered events
+        """
+        self.ws = ws
+        self.event_types = event_types
+        self.audio_sample_every = audio_sample_every
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._audio_seen = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def wants(self, event_type: Optional[str]) -> bool:
+        """Check whether an event passes this subscriber's filters"""
+        if event_type in AUDIO_EVENT_TYPES:
+            if not self.audio_sample_every:
+                return False
+            if self.event_types is not None and event_type not in self.event_types:
+                return False
+            self._audio_seen += 1
+            return (self._audio_seen - 1) % self.audio_sample_every == 0
+        return self.event_types is None or event_type in self.event_types
+
+    def offer(self, event: Dict[str, Any], meta: Tuple[int, int]) -> None:
+        """Queue an event without waiting, dropping the oldest one when full"""
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+                logs_events_dropped.inc()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait((event, meta))
+
+    async def send(self, event: Dict[str, Any], meta: Tuple[int, int]) -> None:
+        """Deliver one event to the frontend"""
+        await self.ws.send_text(json.dumps(event))
+
+    async def run(self) -> None:
+        """Deliver queued events until the connection fails"""
+        try:
+            while True:
+                event, meta = await self.queue.get()
+                await self.send(event, meta)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("Stopped delivering to /logs subscriber: %s", e)
+
+
+class BinaryLogSubscriber(LogSubscriber):
+    """Subscriber on the binary audio subprotocol.
+
+    Audio is sent as raw mu-law in binary messages prefixed with
+    AUDIO_FRAME_HEADER; every other event stays JSON. The `logs.session`
+    control event maps session tags to stream SIDs.
+    """
+
+    def __init__(self, ws: WebSocket, audio_sample_every: int = 1, **kwargs: Any):
+        super().__init__(ws, audio_sample_every=audio_sample_every, **kwargs)
+
+    async def send(self, event: Dict[str, Any], meta: Tuple[int, int]) -> None:
+        direction = AUDIO_EVENT_TYPES.get(event.get("type"))
+        if direction is None:
+            await self.ws.send_text(json.dumps(event))
+            return
+
+        tag, timestamp = meta
+        header = AUDIO_FRAME_HEADER.pack(AUDIO_FRAME_VERSION, direction, tag, timestamp & 0xFFFFFFFF)
+        await self.ws.send_bytes(header + base64.b64decode(event.get("delta") or ""))
+
+
+class EventBroadcaster:
+    """Publishes session events to every `/logs` subscriber"""
+
+    def __init__(self):
+        self.subscribers: Set[LogSubscriber] = set()
+        self.session_tag = 0
+
+    def start_session(self, stream_sid: Optional[str]) -> None:
+        """Announce a new call and tag its binary audio frames"""
+        self.session_tag = session_tag(stream_sid)
+        self.publish({"type": "logs.session", "session": self.session_tag, "streamSid": stream_sid})
+
+    def has_subscribers(self) -> bool:
+        return bool(self.subscribers)
+
+    def subscribe(self, subscriber: LogSubscriber) -> LogSubscriber:
+        """Register a subscriber and start its delivery task"""
+        self.subscribers.add(subscriber)
+        subscriber._task = asyncio.create_task(self._deliver(subscriber))
+        return subscriber
+
+    async def _deliver(self, subscriber: LogSubscriber) -> None:
+        try:
+            await subscriber.run()
+        finally:
+            # A failed connection stops receiving events at once, not when its handler notices
+            self.subscribers.discard(subscriber)
+
+    def unsubscribe(self, subscriber: LogSubscriber) -> None:
+        """Remove a subscriber and stop its delivery task"""
+        self.subscribers.discard(subscriber)
+        if subscriber._task:
+            subscriber._task.cancel()
+            subscriber._task = None
+
+    def publish(self, event: Dict[str, Any], timestamp: Optional[int] = None) -> None:
+        """Hand an event to every interested subscriber. Never waits.
+
+        Args:
+            event: Event to deliver
+            timestamp: Stream time of audio events, in milliseconds
+        """
+        if not self.subscribers:
+            return
+        event_type = event.get("type")
+        meta = (self.session_tag, timestamp or 0)
+        for subscriber in self.subscribers:
+            if subscriber.wants(event_type):
+                subscriber.offer(event, meta)
+
+
+def parse_subscription(params: Dict[str, str]) -> Dict[str, Any]:
+    """Read subscriber options from `/logs` query parameters.
+
+    `events` is a comma-separated list of event types, `audio` delivers every
+    Nth audio event (0, the default, excludes them) and `queue` bounds the
+    number of undelivered events.
+
+    Args:
+        params: Query parameters of the WebSocket request
+
+    Returns:
+        Keyword arguments for LogSubscriber
+    """
+    options: Dict[str, Any] = {}
+    events = params.get("events")
+    if events:
+        options["event_types"] = {e.strip() for e in events.split(",") if e.strip()}
+    for param, option in (("audio", "audio_sample_every"), ("queue", "queue_size")):
+        try:
+            if params.get(param):
+                options[option] = max(0, int(params[param]))
+        except ValueError:
+            logger.warning("Ignoring invalid /logs %s parameter: %s", param, params[param])
+    if options.get("queue_size") == 0:
+        del options["queue_size"]
+    return options
+
+
+# Process-wide broadcaster shared by all calls
+event_broadcaster = EventBroadcaster()
+
+registry.gauge("callhub_logs_subscribers", "Connected /logs subscribers",
+               callback=lambda: len(event_broadcaster.subscribers))
+registry.gauge("callhub_logs_queue_depth", "Events waiting in /logs subscriber queues",
+               callback=lambda: sum(s.queue.qsize() for s in list(event_broadcaster.subscribers)))
@@ -0,0 +1,126 @@
+"""Per-call recording of inbound Twilio and Realtime events, for replay.
+
+A recording is `MAGIC` followed by frames. Each frame is a `FRAME_HEADER`
+(payload length, source, seconds since the call started on the monotonic
+clock) and its payload:
+
+- METADATA: the first frame, an orjson object describing the call
+- TWILIO / MODEL: the message exactly as received
+- TOOL: orjson `{call_id, name, output}` of each tool result, so a replay
+  needs no database
+
+Frames are buffered per call and handed to the background file writer in
+chunks, so recording costs the event loop a buffer append.
+"""
+import os
+import time
+import random
+import struct
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+import orjson
+
+from app.services.file_writer import file_writer
+
+# Directory recordings are written to, one `<stream sid>.chev` file per call
+EVENT_RECORDING_DIR = os.getenv("EVENT_RECORDING_DIR", "recordings/events")
+
+# Buffered bytes, or seconds since the last hand-off, that trigger a write
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 1.0
+
+MAGIC = b"CHEV1\n"
+FRAME_HEADER = struct.Struct("<IBd")
+
+# Frame sources
+METADATA = 0
+TWILIO = 1
+MODEL = 2
+TOOL = 3
+SOURCE_NAMES = {METADATA: "metadata", TWILIO: "twilio", MODEL: "model", TOOL: "tool"}
+
+
+class EventRecorder:
+    """Records one call's inbound events"""
+
+    def __init__(self, path: str, metadata: Dict[str, Any]):
+        """Start a recording.
+
+        Args:
+            path: File to write
+            metadata: Call details stored in the first frame
+        """
+        self.path = path
+        self.start = time.monotonic()
+        self.events = 0
+        self._buffer = bytearray(MAGIC)
+        self._last_flush = self.start
+        self._append(METADATA, orjson.dumps(metadata, default=str), 0.0)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[Dict[str, Any]], stream_sid: str, metadata: Dict[str, Any]
+    ) -> Optional["EventRecorder"]:
+        """Build a recorder from a campaign's `event_recording` settings.
+
+        Example settings block:
+            {"event_recording": {"enabled": true, "sample_rate": 0.1}}
+
+        Returns:
+            A recorder, or None when recording is off or the call is not sampled
+        """
+        config = (settings or {}).get("event_recording") or {}
+        if not config.get("enabled"):
+            return None
+        sample_rate = float(config.get("sample_rate", 1.0))
+        if sample_rate < 1 and random.random() >= sample_rate:
+            return None
+        return cls(os.path.join(EVENT_RECORDING_DIR, f"{stream_sid}.chev"), metadata)
+
+    def _append(self, source: int, payload: bytes, offset: float) -> None:
+        self._buffer += FRAME_HEADER.pack(len(payload), source, offset)
+        self._buffer += payload
+
+    def record(self, source: int, data: Union[str, bytes]) -> None:
+        """Record an inbound message as received"""
+        now = time.monotonic()
+        self._append(source, data.encode() if isinstance(data, str) else data, now - self.start)
+        self.events += 1
+        if len(self._buffer) >= FLUSH_BYTES or now - self._last_flush >= FLUSH_INTERVAL:
+            self.flush(now)
+
+    def record_tool(self, call_id: Optional[str], name: Optional[str], output: str) -> None:
+        """Record a tool result so a replay can serve it without running the tool"""
+        self.record(TOOL, orjson.dumps({"call_id": call_id, "name": name, "output": output}))
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Hand the buffered frames to the writer thread"""
+        self._last_flush = now or time.monotonic()
+        if self._buffer:
+            file_writer.write(self.path, bytes(self._buffer))
+            self._buffer = bytearray()
+
+    def close(self) -> None:
+        self.flush()
+        file_writer.close(self.path)
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, int, bytes]]:
+    """Read a recording's frames as (seconds since call start, source, payload).
+
+    Raises:
+        ValueError: If the file is not a recording
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not an event recording")
+    position = len(MAGIC)
+    while position + FRAME_HEADER.size <= len(data):
+        length, source, offset = FRAME_HEADER.unpack_from(data, position)
+        position += FRAME_HEADER.size
+        if position + length > len(data):
+            # Truncated by a crash mid-write
+            break
+        yield offset, source, data[position:position + length]
+        position += length
@@ -1,7 +1,12 @@
-from typing import Dict, Any, List
+import logging
+from typing import Dict, Any, List, Optional
 
 from app.models import FunctionHandler
 from app.core.vb_function_handlers import vb_functions
+from app.core.survey_state import SurveyState, next_question_schema
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 # Function registry
 functions: List[FunctionHandler] = []
@@ -27,9 +32,8 @@ def note_question_answers(args: Dict[str, Any]) -> Dict[str, Any]:
             answer_text = str(answer)
 
         # Simulate storing the answer (e.g., log, write to DB, etc.)
-        print(f"[Note] Voter ID: {voter_id}")
-        print(f"Question ID: {question_id_value}, Text: {question_text}")
-        print(f"Answer ID: {answer_id_value}, Text: {answer_text}")
+        logger.info("[Note] Voter ID: %s, question %s (%s), answer %s (%s)",
+                    voter_id, question_id_value, question_text, answer_id_value, answer_text)
 
         # Return acknowledgment
         return {
@@ -44,8 +48,8 @@ def note_question_answers(args: Dict[str, Any]) -> Dict[str, Any]:
             }
         }
     except Exception as e:
-        print(f"Error in note_question_answers: {e}")
-        print(f"Raw args: {args}")
+        logger.error("Error in note_question_answers: %s", e)
+        logger.debug("Raw args: %s", args)
         # Return a generic response for robustness
         return {
             "status": "error",
@@ -95,5 +99,29 @@ functions.append(FunctionHandler(
     handler=note_question_answers
 ))
 
+
+async def next_question(args: Dict[str, Any], survey: Optional[SurveyState] = None) -> Dict[str, Any]:
+    """Record the caller's answer, if any, and get the next survey question.
+
+    Args:
+        args: Tool arguments from the model
+        survey: The call's survey progress; the session manager passes it in
+    """
+    if not survey:
+        return {"error": "No survey is configured for this call"}
+
+    if args.get("choice_id") or args.get("answer_text") or args.get("skip"):
+        error = survey.answer(args.get("question_id"), args.get("choice_id"), args.get("answer_text"), bool(args.get("skip")))
+        if error:
+            return {"error": error, "current": survey.next_question()}
+    return survey.next_question()
+
+
+# Survey progress is kept on the call's session, not in the database
+functions.append(FunctionHandler(
+    schema=next_question_schema,
+    handler=next_question
+))
+
 # Add VB System functions to the registry
 functions.extend(vb_functions) 
\ No newline at end of file
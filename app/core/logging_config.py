@@ -0,0 +1,162 @@
+"""Non-blocking structured logging.
+
+Records are queued on the calling thread and formatted and written by one
+listener thread, so a slow stdout never holds up audio forwarding. Message
+formatting is deferred to that thread too: log with `%s` arguments, not
+f-strings, and pass values that are not mutated afterwards.
+"""
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import contextvars
+import logging.handlers
+from typing import Dict, Any, Optional, Tuple
+
+from app.core.metrics import registry
+from app.core.tracing import current_trace
+
+# Level below DEBUG for per-frame media logging
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+# Per-frame media logging is compiled out unless enabled at startup; the hot
+# path checks this constant before building any log record
+TRACE_MEDIA = os.getenv("LOG_TRACE_MEDIA", "") == "1"
+
+# Records a message template may emit per second before it is rate limited
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "20"))
+
+# Records waiting for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Distinct message templates tracked by the rate limiter before it starts over
+RATE_LIMIT_KEYS = 10000
+
+# Stream SID of the call the current task works for
+session_id_var: contextvars.ContextVar = contextvars.ContextVar("session_id", default=None)
+
+logs_dropped = registry.counter("callhub_log_records_dropped_total", "Log records dropped", ("reason",))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class SessionFilter(logging.Filter):
+    """Stamps each record with the call and, if the call is traced, the trace it belongs to"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.session_id = session_id_var.get()
+        trace = current_trace.get()
+        record.trace_id = trace.trace_id if trace is not None and trace.sampled else None
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per message template, so one noisy log line cannot flood the writer.
+
+    The number of records dropped since the last one let through is reported
+    in the next record's `suppressed` field.
+    """
+
+    def __init__(self, rate: float = LOG_RATE_LIMIT, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets: Dict[Tuple[str, Any], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= RATE_LIMIT_KEYS:
+                # Pre-formatted messages make every record a new key
+                self._buckets.clear()
+            # [tokens, last refill, suppressed]
+            bucket = self._buckets[key] = [self.burst, now, 0]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            logs_dropped.inc_labels("rate_limited")
+            return False
+        bucket[0] -= 1
+        record.suppressed = bucket[2]
+        bucket[2] = 0
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and never blocks on a full queue"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            logs_dropped.inc_labels("queue_full")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        session_id = getattr(record, "session_id", None)
+        if session_id:
+            entry["session_id"] = session_id
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """Route all logging through a queue to a writer thread.
+
+    Args:
+        level: Root level name; defaults to LOG_LEVEL or INFO
+        fmt: "json" (default, from LOG_FORMAT) or "text"
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    fmt = fmt or os.getenv("LOG_FORMAT", "json")
+
+    writer = logging.StreamHandler()
+    if fmt == "text":
+        writer.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    else:
+        writer.setFormatter(JsonFormatter())
+
+    handler = DeferredQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    handler.addFilter(SessionFilter())
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(TRACE if TRACE_MEDIA else level.upper())
+
+    _listener = logging.handlers.QueueListener(handler.queue, writer)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,103 @@
+"""Event-loop lag sampling. One blocked callback stalls audio on every call."""
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from app.core.metrics import registry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How often the loop is probed, in milliseconds
+LOOP_LAG_INTERVAL_MS = int(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+
+# How long the loop may stay blocked before the blocking stack is captured
+SLOW_CALLBACK_MS = int(os.getenv("SLOW_CALLBACK_MS", "100"))
+
+# Slow callbacks kept for `/admin/slow-callbacks`
+SLOW_CALLBACK_HISTORY = 50
+
+# Buckets of the loop lag histogram, in milliseconds
+LOOP_LAG_BUCKETS_MS = (1, 5, 10, 20, 50, 100, 250, 500, 1000, 5000)
+
+loop_lag_ms = registry.histogram(
+    "callhub_event_loop_lag_ms", "Delay of a scheduled wake-up on the event loop", buckets=LOOP_LAG_BUCKETS_MS
+)
+slow_callbacks_total = registry.counter(
+    "callhub_slow_callbacks_total", "Times the event loop stayed blocked past SLOW_CALLBACK_MS"
+)
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic sleep wakes up, i.e. how long the loop was busy.
+
+    A watchdog thread also checks that the probe keeps ticking. When the loop
+    has been blocked for `slow_callback_ms`, it captures the loop thread's
+    stack, which is the callback doing the blocking.
+    """
+
+    def __init__(self, interval_ms: int = LOOP_LAG_INTERVAL_MS, slow_callback_ms: int = SLOW_CALLBACK_MS):
+        self.interval = interval_ms / 1000
+        self.slow_callback = slow_callback_ms / 1000
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.loop_thread_id: Optional[int] = None
+        self.slow_callbacks: deque = deque(maxlen=SLOW_CALLBACK_HISTORY)
+        self._last_tick = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        registry.gauge("callhub_event_loop_lag_last_ms", "Lag of the latest loop probe", callback=lambda: self.last_lag_ms)
+
+    def start(self) -> None:
+        """Start probing on the running loop, and the watchdog thread"""
+        if self._task is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.create_task(self.run())
+        if self.slow_callback > 0:
+            self._watchdog = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._last_tick = time.monotonic()
+            lag_ms = max(0.0, (loop.time() - scheduled) * 1000)
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            loop_lag_ms.observe(lag_ms)
+
+    def watch(self) -> None:
+        """Watchdog thread: capture the loop's stack once per stall"""
+        reported_tick = None
+        while True:
+            time.sleep(self.slow_callback / 2)
+            tick = self._last_tick
+            blocked = time.monotonic() - tick - self.interval
+            if blocked < self.slow_callback or tick == reported_tick:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            reported_tick = tick
+            stack = "".join(traceback.format_stack(frame))
+            self.slow_callbacks.append({"time": time.time(), "blocked_ms": round(blocked * 1000, 1), "stack": stack})
+            slow_callbacks_total.inc()
+            logger.warning("Event loop blocked for %.0f ms in:\n%s", blocked * 1000, stack)
+
+    def recent_slow_callbacks(self) -> List[Dict[str, Any]]:
+        """Slow callbacks captured so far, newest last"""
+        return list(self.slow_callbacks)
+
+
+# Process-wide monitor
+loop_monitor = LoopLagMonitor()
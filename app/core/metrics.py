@@ -0,0 +1,223 @@
+"""In-process metrics shared by every call on this worker, exposed at `/metrics`.
+
+Everything is updated from the event loop thread, so counters are plain
+integer increments without locks and are cheap enough for every media frame.
+"""
+import bisect
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple, Union
+
+# Latency buckets, in milliseconds
+LATENCY_BUCKETS_MS = (25, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.value = 0
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment an unlabeled counter; the media-frame fast path"""
+        self.value += amount
+
+    def inc_labels(self, *label_values: str, amount: float = 1) -> None:
+        """Increment the series of one label set"""
+        self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def series(self) -> List[Tuple[Dict[str, str], float]]:
+        if not self.labels:
+            return [({}, self.value)]
+        return [(dict(zip(self.labels, values)), count) for values, count in list(self._series.items())]
+
+
+class Gauge:
+    """Current value, set directly or read from a callback at scrape time.
+
+    A callback returns a number, or for labeled gauges a dict of label
+    value tuples to numbers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], Union[float, Dict[Tuple[str, ...], float]]]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.callback = callback
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def series(self) -> List[Tuple[Dict[str, str], float]]:
+        value = self.callback() if self.callback else self.value
+        if isinstance(value, dict):
+            return [(dict(zip(self.labels, values)), v) for values, v in value.items()]
+        return [({}, value)]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels.
+
+    Observations only touch plain lists and ints on the event loop thread,
+    so recording one is a dict lookup and a bisect.
+    """
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        """Create a histogram.
+
+        Args:
+            name: Metric name
+            description: Help text
+            labels: Label names; `observe` takes their values in the same order
+            buckets: Upper bounds of the buckets, ascending
+        """
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation"""
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def series(self) -> List[Tuple[Dict[str, str], List[int], float, int]]:
+        """Snapshot of every label set as (labels, cumulative bucket counts, sum, count)"""
+        snapshot = []
+        for label_values, series in list(self._series.items()):
+            cumulative, total = [], 0
+            for count in series[:-1]:
+                total += count
+                cumulative.append(total)
+            snapshot.append((dict(zip(self.labels, label_values)), cumulative, series[-1], total))
+        return snapshot
+
+
+class MetricsRegistry:
+    """Holds the worker's metrics by name"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        """Create or get a counter"""
+        if name not in self.metrics:
+            self.metrics[name] = Counter(name, description, labels)
+        return self.metrics[name]
+
+    def gauge(self, name: str, description: str, labels: Sequence[str] = (), callback: Optional[Callable] = None) -> Gauge:
+        """Create or get a gauge; a callback given later replaces the current one"""
+        if name not in self.metrics:
+            self.metrics[name] = Gauge(name, description, labels, callback)
+        elif callback is not None:
+            self.metrics[name].callback = callback
+        return self.metrics[name]
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS_MS) -> Histogram:
+        """Create or get a histogram"""
+        if name not in self.metrics:
+            self.metrics[name] = Histogram(name, description, labels, buckets)
+        return self.metrics[name]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self.metrics.values()):
+            try:
+                if isinstance(metric, Histogram):
+                    render_histogram(metric, lines)
+                else:
+                    kind = "counter" if isinstance(metric, Counter) else "gauge"
+                    lines.append(f"# HELP {metric.name} {metric.description}")
+                    lines.append(f"# TYPE {metric.name} {kind}")
+                    for labels, value in metric.series():
+                        lines.append(f"{metric.name}{format_labels(labels)} {format_value(value)}")
+            except Exception as e:
+                # A failing callback must not take the whole scrape down
+                lines.append(f"# {metric.name} unavailable: {e}")
+        return "\n".join(lines) + "\n"
+
+    def get(self, name: str) -> Optional[Any]:
+        return self.metrics.get(name)
+
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    """Render a label set as `{name="value",...}`"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def escape_label(value: Any) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_histogram(histogram: Histogram, lines: List[str]) -> None:
+    lines.append(f"# HELP {histogram.name} {histogram.description}")
+    lines.append(f"# TYPE {histogram.name} histogram")
+    for labels, cumulative, total, count in histogram.series():
+        for bound, bucket_count in zip(list(histogram.buckets) + [float("inf")], cumulative):
+            lines.append(f"{histogram.name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {bucket_count}")
+        lines.append(f"{histogram.name}_sum{format_labels(labels)} {format_value(total)}")
+        lines.append(f"{histogram.name}_count{format_labels(labels)} {count}")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a small list of values, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+
+# Turn latency: from server VAD detecting the end of caller speech to ...
+vad_to_response_ms = registry.histogram(
+    "callhub_turn_response_created_ms", "Caller speech end to response.created", ("campaign",)
+)
+vad_to_first_delta_ms = registry.histogram(
+    "callhub_turn_first_delta_ms", "Caller speech end to the first response.audio.delta", ("campaign",)
+)
+vad_to_twilio_ms = registry.histogram(
+    "callhub_turn_first_audio_sent_ms", "Caller speech end to the first audio sent to Twilio", ("campaign",)
+)
+call_first_audio_ms = registry.histogram(
+    "callhub_call_first_audio_ms", "Twilio start to the first audio sent to the caller", ("campaign",)
+)
+tool_call_ms = registry.histogram(
+    "callhub_tool_call_ms", "Wall time of tool calls", ("campaign", "tool")
+)
+
+# Traffic and tool counters
+audio_frames_in = registry.counter("callhub_audio_frames_in_total", "Media messages received from Twilio")
+audio_frames_out = registry.counter("callhub_audio_frames_out_total", "Media messages sent to Twilio")
+audio_frames_rejected = registry.counter("callhub_audio_frames_rejected_total", "Malformed media messages from Twilio that were skipped")
+model_connects = registry.counter("callhub_model_connects_total", "Realtime API connection attempts", ("result",))
+tool_calls = registry.counter("callhub_tool_calls_total", "Tool calls by outcome", ("tool", "result"))
+tool_cache_lookups = registry.counter("callhub_tool_cache_lookups_total", "Session tool cache lookups", ("result",))
+logs_events_dropped = registry.counter("callhub_logs_events_dropped_total", "Events dropped by slow /logs subscribers")
@@ -0,0 +1,59 @@
+"""In-process sampling profiler for diagnosing stalls on a live worker."""
+import os
+import sys
+import time
+import hmac
+from collections import Counter
+from typing import Dict, Optional
+
+# Shared secret for the `/admin` endpoints; they are disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Longest profile one request may run, in seconds
+MAX_PROFILE_SECONDS = 60
+
+
+def check_admin_token(token: Optional[str]) -> bool:
+    """Check a presented admin token in constant time"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def collapse_frame(frame) -> str:
+    """Render a stack as one collapsed-stack line, root first"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """Sample a thread's stack at a fixed interval.
+
+    Runs on a worker thread so the sampled loop keeps serving calls.
+
+    Args:
+        thread_id: Thread to sample, normally the event loop thread
+        seconds: How long to sample
+        interval: Time between samples
+
+    Returns:
+        Collapsed stack -> number of samples
+    """
+    counts: Counter = Counter()
+    deadline = time.monotonic() + min(seconds, MAX_PROFILE_SECONDS)
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            counts[collapse_frame(frame)] += 1
+        del frame
+        time.sleep(interval)
+    return dict(counts)
+
+
+def render_collapsed(counts: Dict[str, int]) -> str:
+    """Render samples in the collapsed-stack format read by flamegraph.pl and speedscope"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items(), key=lambda item: -item[1]))
@@ -1,22 +1,77 @@
+import os
 import json
+import binascii
 import logging
 import asyncio
 import time
-from typing import Dict, Any, Optional, Union
+from typing import Awaitable, Dict, Any, List, Optional, Set, Union
+from urllib.parse import urlparse
+import numpy as np
 import websockets
 from websockets.exceptions import ConnectionClosed
 from fastapi import WebSocket
 from models import Session
-from app.core.function_handlers import functions
-from app.core.constants import SYSTEM_PROMPT_2
+from app.core.function_handlers import functions, next_question
+from app.core.vb_function_handlers import read_only_tools, tool_entities, prefetch_args
+from app.core.tool_cache import ToolResultCache
+from app.core.tool_prefetch import FunctionCallPrefetcher
+from app.core.tool_output import ToolOutputStats, compact_json
+from app.core.context_budget import ConversationContext
+from app.core.turn_timing import TurnTimer
+from app.core.metrics import registry, audio_frames_in, audio_frames_out, audio_frames_rejected, model_connects, tool_calls
+from app.core.logging_config import session_id_var, TRACE, TRACE_MEDIA
+from app.core.event_recorder import EventRecorder, TWILIO, MODEL
+from app.core.tracing import start_trace, span, current_span, exporter, SPAN_KIND_CLIENT, SPAN_KIND_SERVER
+from app.core.survey_state import SurveyState
+from app.audio.codec import decode_base64
+from app.audio.vad import EnergyBargeInDetector
+from app.audio.silence import SilenceGate
+from app.audio.amd import AnsweringMachineDetector, MACHINE, BEEP
+from app.audio.recorder import CallRecorder
+from app.core.event_broadcaster import (
+    event_broadcaster, LogSubscriber, BinaryLogSubscriber, parse_subscription
+)
+from app.core.constants import SYSTEM_PROMPT_2, SYSTEM_PROMPT_2_SURVEY
+from app.services.contact_index import contact_index
+from app.services.filler_audio import filler_library, voicemail_library, FILLER_DELAY_SECONDS, DEFAULT_PERSONA
+from app.services.vb_system import get_vb_utilities
+from app.services.greeting_cache import greeting_cache, greeting_key, GreetingRecorder
+from app.services.call_analytics import call_analytics
+
+# Realtime voice used for every call
+MODEL_VOICE = "ash"
+
+# Realtime API endpoint; the load test points this at a local fake server
+REALTIME_URL = os.getenv(
+    "OPENAI_REALTIME_URL", "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-12-17"
+)
+
+# How long a local barge-in waits for server VAD to confirm it, by default
+BARGE_IN_CONFIRM_MS = 800
+
+# Disposition recorded for calls answered by a machine, by default
+AMD_DISPOSITION = "ANSWERING_MACHINE"
+
+# How long to wait for the record beep before leaving a voicemail, by default
+AMD_BEEP_WAIT_MS = 5000
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Global session instance - Define it at module level
 _session = Session()
 
+# Post-call writes still running; holding them stops them being garbage-collected
+_background_tasks: Set[asyncio.Task] = set()
+
+# Reused decode buffer for inbound media frames (up to 1 s of 8 kHz audio)
+_media_samples = np.empty(8000, dtype=np.int16)
+
+registry.gauge("callhub_active_sessions", "Calls connected to this worker",
+               callback=lambda: 1 if _session.twilio_conn else 0)
+registry.gauge("callhub_model_connections", "Open Realtime API connections",
+               callback=lambda: 1 if _session.model_conn and _session.model_conn.open else 0)
+
 
 # Getter and setter functions for session management
 def get_session() -> Session:
@@ -66,8 +121,21 @@ async def handle_call_connection(ws: WebSocket) -> None:
                     # If both fail, might be a disconnection
                     break
     except Exception as e:
-        logger.error(f"Error in Twilio connection: {e}")
+        logger.error("Error in Twilio connection: %s", e)
     finally:
+        if _session.call_recorder:
+            _session.call_recorder.close()
+            if _session.call_recorder.analytics:
+                submit_call_analytics(_session.call_recorder)
+        await emit_call_summary()
+        end_call_trace()
+        if _session.event_recorder:
+            _session.event_recorder.close()
+            _session.event_recorder = None
+        if _session.survey_state and _session.caller_context:
+            run_in_background(flush_survey_answers(
+                _session.caller_context["subscriber_id"], _session.survey_state.pending_answers()
+            ))
         await cleanup_connection(_session.model_conn)
         await cleanup_connection(_session.twilio_conn)
         _session.twilio_conn = None
@@ -76,20 +144,55 @@ async def handle_call_connection(ws: WebSocket) -> None:
         _session.last_assistant_item = None
         _session.response_start_timestamp = None
         _session.latest_media_timestamp = None
-        if not _session.frontend_conn:
+        _session.caller_context = None
+        if _session.tool_cache:
+            _session.tool_cache.cancel_pending()
+        _session.tool_cache = None
+        _session.tool_prefetcher = None
+        _session.tool_output_stats = None
+        _session.conversation_context = None
+        _session.turn_timer = None
+        _session.local_playback = None
+        _session.greeting_played = None
+        _session.greeting_recorder = None
+        if _session.barge_in_reconcile:
+            _session.barge_in_reconcile.cancel()
+        _session.barge_in_reconcile = None
+        _session.barge_in_detector = None
+        _session.silence_gate = None
+        if _session.amd_beep_wait:
+            _session.amd_beep_wait.cancel()
+        _session.amd_beep_wait = None
+        _session.amd = None
+        if _session.survey_loader:
+            _session.survey_loader.cancel()
+        _session.survey_loader = None
+        _session.survey_state = None
+        _session.suppress_response_audio = False
+        _session.playback_end_timestamp = None
+        _session.call_recorder = None
+        _session.trace = None
+        _session.call_span = None
+        _session.response_span = None
+        if not event_broadcaster.has_subscribers():
             # Reset session if no other connections
             reset_session()
 
 
-async def handle_frontend_connection(ws: WebSocket) -> None:
+async def handle_frontend_connection(ws: WebSocket, binary_audio: bool = False) -> None:
     """Handle frontend WebSocket connections.
 
+    Any number of frontends may subscribe; each gets its own bounded queue
+    so a slow tab never holds up the call.
+
     Args:
         ws: The WebSocket connection from the frontend
+        binary_audio: Whether the frontend negotiated the binary audio subprotocol
     """
-    # Close existing connection if any
-    await cleanup_connection(_session.frontend_conn)
-    _session.frontend_conn = ws
+    subscriber_class = BinaryLogSubscriber if binary_audio else LogSubscriber
+    subscriber = event_broadcaster.subscribe(
+        subscriber_class(ws, **parse_subscription(dict(ws.query_params)))
+    )
 
     try:
         # FastAPI WebSocket receive pattern
@@ -108,11 +211,11 @@ async def handle_frontend_connection(ws: WebSocket) -> None:
                     # If both fail, might be a disconnection
                     break
     except Exception as e:
-        logger.error(f"Error in frontend connection: {e}")
+        logger.error("Error in frontend connection: %s", e)
     finally:
-        await cleanup_connection(_session.frontend_conn)
-        _session.frontend_conn = None
-        if not _session.twilio_conn and not _session.model_conn:
+        event_broadcaster.unsubscribe(subscriber)
+        await cleanup_connection(ws)
+        if not _session.twilio_conn and not _session.model_conn and not event_broadcaster.has_subscribers():
             # Reset session if no other connections
             reset_session()
 
@@ -126,13 +229,11 @@ async def handle_function_call(item: Dict[str, Any]) -> str:
     Returns:
         JSON string with function result
     """
-    logger.info(f"Handling function call: {item}")
+    logger.info("Handling function call %s (%s)", item.get("name"), item.get("call_id"))
+    logger.debug("Function call item: %s", item)
 
     function_name = item.get("name")
-    # Handle both dictionary and object schemas
-    fn_def = next((f for f in functions if
-                  (hasattr(f.schema, 'get') and f.schema.get("name") == function_name) or
-                  (hasattr(f.schema, 'name') and f.schema.name == function_name)), None)
+    fn_def = find_function(function_name)
     if not fn_def:
         error_msg = f"No handler found for function: {function_name}"
         logger.error(error_msg)
@@ -145,28 +246,133 @@ async def handle_function_call(item: Dict[str, Any]) -> str:
             "error": "Invalid JSON arguments for function call."
         })
 
+    if function_name == "next_question":
+        # Works on this call's survey progress, once it has loaded
+        if _session.survey_loader and not _session.survey_loader.done():
+            await asyncio.shield(_session.survey_loader)
+        return compact_json(await next_question(args, _session.survey_state))
+
+    survey = _session.survey_state
+    if function_name == "save_survey_response" and survey and survey.get_question(args.get("question_id")):
+        # Held with the call's other answers and written in one batch at hangup, for the caller
+        subscriber_id = (_session.caller_context or {}).get("subscriber_id")
+        if str(args.get("subscriber_id")) != str(subscriber_id):
+            logger.warning(
+                "save_survey_response named subscriber %s; recording the answer for the caller, subscriber %s",
+                args.get("subscriber_id"), subscriber_id,
+            )
+        survey.record_answer(args["question_id"], args.get("choice_id"), args.get("answer_text"))
+        return json.dumps({"status": "success", "recorded": True})
+
+    cache = _session.tool_cache
+    cacheable = cache is not None and cache.is_cacheable(function_name)
+    pending = None
+    if cacheable and _session.tool_prefetcher:
+        # Prefetches run on the key arguments only, so extra arguments still match
+        pending = cache.pop_pending(function_name, _session.tool_prefetcher.key_arguments(function_name, args))
+    if pending is not None:
+        logger.info("Reusing prefetched %s result", function_name)
+        try:
+            output = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                # This call itself is being cancelled
+                pending.cancel()
+                raise
+            # The prefetch was invalidated by a write
+            output = await run_function(fn_def, args)
+    else:
+        if cacheable:
+            cached = cache.get(function_name, args)
+            if cached is not None:
+                logger.info("Serving %s from session cache", function_name)
+                return cached
+        output = await run_function(fn_def, args)
+
+    if cacheable:
+        if not is_error_output(output):
+            cache.put(function_name, args, output)
+    elif cache is not None:
+        cache.invalidate(function_name, args)
+    return output
+
+
+def find_function(function_name: Optional[str]) -> Optional[Any]:
+    """Find the registered handler for a function name.
+
+    Args:
+        function_name: Name of the function the model called
+
+    Returns:
+        The matching FunctionHandler, or None
+    """
+    # Handle both dictionary and object schemas
+    return next((f for f in functions if
+                 (hasattr(f.schema, 'get') and f.schema.get("name") == function_name) or
+                 (hasattr(f.schema, 'name') and f.schema.name == function_name)), None)
+
+
+async def run_function(fn_def: Any, args: Dict[str, Any]) -> str:
+    """Run a function handler and serialize its result.
+
+    Args:
+        fn_def: FunctionHandler to run
+        args: Parsed function arguments
+
+    Returns:
+        JSON string with function result, or an error payload
+    """
+    function_name = fn_def.schema.get('name') if hasattr(fn_def.schema, 'get') else fn_def.schema.name
     try:
-        function_name = fn_def.schema.get('name') if hasattr(fn_def.schema, 'get') else fn_def.schema.name
-        logger.info(f"Calling function: {function_name} {args}")
+        logger.info("Calling function: %s", function_name)
+        logger.debug("Function arguments: %s", args)
         result = fn_def.handler(args)
         if asyncio.iscoroutine(result):
             result = await result
         # Ensure result is a string
         if isinstance(result, str):
             return result
-        return json.dumps(result)
+        return compact_json(result)
     except Exception as e:
-        error_msg = f"Error running function {item.get('name')}: {str(e)}"
+        error_msg = f"Error running function {function_name}: {str(e)}"
         logger.error(error_msg)
         return json.dumps({"error": error_msg})
 
 
+def start_prefetch(function_name: str, args: Dict[str, Any]) -> None:
+    """Speculatively run a read-only tool so its call can reuse the result.
+
+    Args:
+        function_name: Read-only tool the model is calling
+        args: Key arguments streamed so far
+    """
+    cache = _session.tool_cache
+    fn_def = find_function(function_name)
+    if not cache or not fn_def or not cache.is_cacheable(function_name):
+        return
+    if cache.has(function_name, args):
+        return
+    cache.add_pending(function_name, args, asyncio.create_task(run_function(fn_def, args)))
+
+
+def is_error_output(output: str) -> bool:
+    """Check whether a tool output is an error payload that must not be memoized."""
+    try:
+        parsed = json.loads(output)
+    except (json.JSONDecodeError, TypeError):
+        return True
+    return isinstance(parsed, dict) and "error" in parsed
+
+
 async def handle_twilio_message(data: str) -> None:
     """Handle messages from Twilio WebSocket.
 
     Args:
         data: JSON message from Twilio
     """
+    if _session.event_recorder:
+        _session.event_recorder.record(TWILIO, data)
+
     try:
         msg = json.loads(data)
     except json.JSONDecodeError:
@@ -177,12 +383,50 @@ async def handle_twilio_message(data: str) -> None:
 
     if event_type == "start":
         _session.stream_sid = msg.get("start", {}).get("streamSid")
+        session_id_var.set(_session.stream_sid)
         _session.latest_media_timestamp = 0
         _session.last_assistant_item = None
         _session.response_start_timestamp = None
+        _session.caller_context = resolve_caller(msg.get("start", {}))
+        _session.turn_timer = TurnTimer(
+            (_session.caller_context or {}).get("campaign_id")
+            or (msg.get("start", {}).get("customParameters") or {}).get("campaign_id")
+        )
+        start_call_trace(msg.get("start", {}))
+        _session.conversation_settings = load_conversation_settings(msg.get("start", {}))
+        _session.barge_in_detector = EnergyBargeInDetector.from_settings(_session.conversation_settings)
+        _session.barge_in_stats = {"local": 0, "confirmed": 0, "false_positive": 0}
+        _session.silence_gate = SilenceGate.from_settings(_session.conversation_settings)
+        _session.amd = AnsweringMachineDetector.from_settings(_session.conversation_settings)
+        _session.tool_cache = ToolResultCache(read_only_tools, tool_entities)
+        _session.tool_prefetcher = FunctionCallPrefetcher(prefetch_args)
+        _session.tool_output_stats = ToolOutputStats()
+        _session.conversation_context = ConversationContext.from_settings(_session.conversation_settings)
+        _session.event_recorder = EventRecorder.from_settings(_session.conversation_settings, _session.stream_sid, {
+            "stream_sid": _session.stream_sid,
+            "call_sid": msg.get("start", {}).get("callSid"),
+            "started_at": time.time(),
+            "caller_context": _session.caller_context,
+            "conversation_settings": _session.conversation_settings,
+        })
+        if _session.event_recorder:
+            _session.event_recorder.record(TWILIO, data)
+        _session.call_recorder = CallRecorder.from_settings(_session.conversation_settings, _session.stream_sid)
+        if _session.caller_context:
+            campaign_id = _session.caller_context["campaign_id"]
+            survey_config = contact_index.get_survey(campaign_id)
+            if survey_config is not None:
+                _session.survey_state = SurveyState.from_config(survey_config)
+            else:
+                _session.survey_loader = asyncio.create_task(load_survey_state(_session.stream_sid, campaign_id))
+        event_broadcaster.start_session(_session.stream_sid)
+        await start_greeting()
         await try_connect_model()
 
     elif event_type == "media":
+        audio_frames_in.inc()
+        if TRACE_MEDIA:
+            logger.log(TRACE, "Media frame at %s", msg.get("media", {}).get("timestamp"))
         # Ensure timestamp is an integer
         try:
             timestamp = msg.get("media", {}).get("timestamp")
@@ -191,14 +435,68 @@ async def handle_twilio_message(data: str) -> None:
             else:
                 _session.latest_media_timestamp = 0
         except (ValueError, TypeError):
-            logger.warning(f"Invalid timestamp format: {msg.get('media', {}).get('timestamp')}")
+            logger.warning("Invalid timestamp format: %s", msg.get("media", {}).get("timestamp"))
             _session.latest_media_timestamp = 0
 
+        payload = msg.get("media", {}).get("payload")
+        detector = _session.barge_in_detector
+        gate = _session.silence_gate
+        amd = _session.amd
+        if amd and (amd.beep_detected or amd.verdict not in (None, MACHINE)):
+            amd = None
+        samples = None
+        try:
+            if (detector or gate or amd) and payload:
+                samples = decode_base64(payload, _media_samples)
+            if _session.call_recorder and payload:
+                _session.call_recorder.add_caller(_session.latest_media_timestamp, payload)
+        except (ValueError, binascii.Error) as e:
+            # Bad base64, or more than the decode buffer holds; drop the frame, keep the call
+            audio_frames_rejected.inc()
+            logger.warning("Skipping malformed media frame at %s (%d chars): %s",
+                           _session.latest_media_timestamp, len(payload), e)
+            return
+
         if _session.model_conn and _session.model_conn.open:
-            await json_send(_session.model_conn, {
-                "type": "input_audio_buffer.append",
-                "audio": msg.get("media", {}).get("payload")
-            })
+            for audio in (gate.process(payload, samples) if gate and samples is not None else [payload]):
+                await json_send(_session.model_conn, {
+                    "type": "input_audio_buffer.append",
+                    "audio": audio
+                })
+
+        if amd and samples is not None:
+            amd_event = amd.process(samples)
+            if amd_event == MACHINE:
+                await handle_machine_detected()
+            elif amd_event == BEEP:
+                await leave_voicemail()
+
+        if detector and samples is not None:
+            if is_assistant_playing():
+                if detector.process(samples):
+                    await handle_local_barge_in()
+            elif detector.speech_ms or detector.triggered:
+                detector.reset()
+
+        if event_broadcaster.has_subscribers():
+            event_broadcaster.publish(
+                {"type": "caller_audio.delta", "delta": payload},
+                _session.latest_media_timestamp
+            )
+    elif event_type == "mark":
+        mark_name = msg.get("mark", {}).get("name")
+        if _session.local_playback and mark_name == _session.local_playback:
+            # Twilio finished playing the local clip, nothing left to cut
+            _session.local_playback = None
+        if mark_name == "voicemail":
+            # Message left on the answering machine; hang up
+            await close_all_connections()
+
+    elif event_type == "dtmf":
+        digit = msg.get("dtmf", {}).get("digit")
+        if digit:
+            await handle_dtmf(digit)
+
     elif event_type == "close":
         await close_all_connections()
 
@@ -222,6 +520,140 @@ async def handle_frontend_message(data: str) -> None:
         _session.saved_config = msg.get("session")
 
 
+def resolve_caller(start: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Resolve the contact on the line from the Twilio start metadata.
+
+    Args:
+        start: The `start` payload of the Twilio start event
+
+    Returns:
+        Caller context for the prompt, or None if the number is unknown
+    """
+    params = start.get("customParameters") or {}
+    contact_number = params.get("contact_number")
+    if not contact_number:
+        return None
+
+    entry = contact_index.lookup(contact_number, params.get("campaign_id"))
+    if not entry:
+        logger.info("No indexed contact for caller number")
+        return None
+
+    context = entry.to_context()
+    campaign = contact_index.get_campaign(entry.campaign_id)
+    if campaign:
+        context["campaign_name"] = campaign.get("campaign_name") or ""
+        context["persona_name"] = campaign.get("persona_name") or ""
+    logger.info("Resolved caller to contact %s (subscriber %s)", entry.contact_id, entry.subscriber_id)
+    return context
+
+
+def load_conversation_settings(start: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the conversation settings of the call's campaign from the contact index.
+
+    Args:
+        start: The `start` payload of the Twilio start event
+
+    Returns:
+        The campaign's `conversation_settings`, or an empty dict
+    """
+    campaign_id = (_session.caller_context or {}).get("campaign_id")
+    if not campaign_id:
+        campaign_id = (start.get("customParameters") or {}).get("campaign_id")
+    campaign = contact_index.get_campaign(campaign_id)
+    return (campaign or {}).get("conversation_settings") or {}
+
+
+async def load_survey_state(stream_sid: str, campaign_id: str) -> None:
+    """Load a survey the contact index has not cached yet, in the background.
+
+    Args:
+        stream_sid: Call the survey is loaded for
+        campaign_id: Campaign of the resolved caller
+    """
+    try:
+        utils = await get_vb_utilities()
+        survey = SurveyState.from_config(await utils.get_survey_config(campaign_id))
+    except Exception as e:
+        logger.error("Failed to load survey for campaign %s: %s", campaign_id, e)
+        return
+
+    # The call may have ended while the survey was loading
+    if survey and _session.stream_sid == stream_sid:
+        _session.survey_state = survey
+
+
+def submit_call_analytics(recorder: CallRecorder) -> None:
+    """Queue the finished recording for post-call analytics in the process pool."""
+    context = _session.caller_context or {}
+    call_analytics.submit(recorder.path, recorder.fmt, list(recorder.interruptions), {
+        "stream_sid": _session.stream_sid,
+        "campaign_id": context.get("campaign_id"),
+        "contact_id": context.get("contact_id"),
+        "subscriber_id": context.get("subscriber_id"),
+    })
+
+
+async def flush_survey_answers(subscriber_id: str, answers: List[Dict[str, Any]]) -> None:
+    """Write the call's survey answers in one batch after hangup."""
+    if not answers:
+        return
+    try:
+        utils = await get_vb_utilities()
+        saved = await utils.survey_dao.save_survey_responses(subscriber_id, answers)
+    except Exception as e:
+        logger.error("Failed to save survey answers for subscriber %s: %s", subscriber_id, e)
+        saved = []
+    if len(saved) == len(answers):
+        logger.info("Saved %d survey answers for subscriber %s", len(saved), subscriber_id)
+    else:
+        logger.error(
+            "%d survey answers for subscriber %s not saved (questions %s)",
+            len(answers) - len(saved), subscriber_id, [a.get("question_id") for a in answers],
+        )
+
+
+def run_in_background(coro: Awaitable[Any]) -> asyncio.Task:
+    """Start a task that outlives the call, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def base_instructions() -> str:
+    """Get the base prompt of this call.
+
+    Calls with a campaign survey on the session (loaded or loading) walk it
+    through `next_question`; others keep the built-in survey script.
+    """
+    if _session.survey_state or _session.survey_loader:
+        return SYSTEM_PROMPT_2_SURVEY
+    return SYSTEM_PROMPT_2
+
+
+def build_instructions() -> str:
+    """Build the model instructions, including the resolved caller context."""
+    context = _session.caller_context
+    if not context:
+        return base_instructions()
+
+    lines = [
+        f"- Contact ID: {context['contact_id']}",
+        f"- Subscriber ID: {context['subscriber_id']}",
+        f"- Campaign ID: {context['campaign_id']}",
+    ]
+    if context.get("campaign_name"):
+        lines.append(f"- Campaign name: {context['campaign_name']}")
+    if context.get("contact_name"):
+        lines.append(f"- Contact name: {context['contact_name']}")
+    location = ", ".join(v for v in (context.get("contact_city"), context.get("contact_state")) if v)
+    if location:
+        lines.append(f"- Location: {location}")
+
+    return base_instructions() + "\n\n## Caller Context\n" + "\n".join(lines)
+
+
 async def try_connect_model() -> None:
     """Try to connect to OpenAI Realtime API."""
     if not _session.twilio_conn or not _session.stream_sid or not _session.openai_api_key:
@@ -231,41 +663,58 @@ async def try_connect_model() -> None:
         return
 
     try:
-        _session.model_conn = await websockets.connect(
-            "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-12-17",
-            extra_headers={
-                "Authorization": f"Bearer {_session.openai_api_key}",
-                "OpenAI-Beta": "realtime=v1",
-            }
-        )
-
-        # Configure the model with complete settings directly in code
-        # We're not using frontend config since it's not available
-        await json_send(_session.model_conn, {
-            "type": "session.update",
-            "session": {
-                "modalities": ["text", "audio"],
-                "turn_detection": {"type": "server_vad"},
-                "voice": "ash",
-                "input_audio_transcription": {"model": "whisper-1"},
-                "input_audio_format": "g711_ulaw",
-                "output_audio_format": "g711_ulaw",
-                "input_audio_transcription": {
-                    "model": "whisper-1",
-                    "language": "en"
-                },
-                "tools": [f.schema for f in functions],  # Include external functions/tools
-                "temperature": 0.7,  # Standard temperature for balanced creativity and consistency
-                "instructions": SYSTEM_PROMPT_2  # Core instruction to the assistant (use 'system' not 'instructions')
-            }
-        })
-        print("Model connection established")
+        with span("model.connect", {"server.address": urlparse(REALTIME_URL).hostname}, kind=SPAN_KIND_CLIENT):
+            _session.model_conn = await websockets.connect(
+                REALTIME_URL,
+                extra_headers={
+                    "Authorization": f"Bearer {_session.openai_api_key}",
+                    "OpenAI-Beta": "realtime=v1",
+                }
+            )
+            model_connects.inc_labels("ok")
+
+            # Configure the model with complete settings directly in code
+            # We're not using frontend config since it's not available
+            await json_send(_session.model_conn, {
+                "type": "session.update",
+                "session": {
+                    "modalities": ["text", "audio"],
+                    "turn_detection": {"type": "server_vad"},
+                    "voice": MODEL_VOICE,
+                    "input_audio_transcription": {"model": "whisper-1"},
+                    "input_audio_format": "g711_ulaw",
+                    "output_audio_format": "g711_ulaw",
+                    "input_audio_transcription": {
+                        "model": "whisper-1",
+                        "language": "en"
+                    },
+                    "tools": [f.schema for f in functions],  # Include external functions/tools
+                    "temperature": 0.7,  # Standard temperature for balanced creativity and consistency
+                    "instructions": build_instructions()  # Core instruction to the assistant (use 'system' not 'instructions')
+                }
+            })
+            logger.info("Model connection established")
+
+            if _session.greeting_played:
+                # The caller already heard the cached greeting; keep the model from repeating it
+                await json_send(_session.model_conn, {
+                    "type": "conversation.item.create",
+                    "item": {
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "text", "text": _session.greeting_played}]
+                    }
+                })
+            else:
+                # Speak first, so the caller hears the opening line (captured for the greeting cache)
+                await json_send(_session.model_conn, {"type": "response.create"})
 
         # Start listener task for model messages
         asyncio.create_task(handle_model_connection())
 
     except Exception as e:
-        logger.error(f"Error connecting to OpenAI: {e}")
+        logger.error("Error connecting to OpenAI: %s", e)
+        model_connects.inc_labels("error")
         await close_model()
 
 
@@ -285,7 +734,7 @@ async def handle_model_connection() -> None:
     except ConnectionClosed:
         logger.info("OpenAI model connection closed")
     except Exception as e:
-        logger.error(f"Error in model connection: {e}")
+        logger.error("Error in model connection: %s", e)
     finally:
         await close_model()
 
@@ -296,44 +745,143 @@ async def handle_model_message(data: str) -> None:
     Args:
         data: JSON message from OpenAI
     """
+    if _session.event_recorder:
+        _session.event_recorder.record(MODEL, data)
+
     try:
         event = json.loads(data)
     except json.JSONDecodeError:
         logger.error("Invalid JSON from OpenAI")
         return
 
-    if _session.frontend_conn:
-        try:
-            await json_send(_session.frontend_conn, event)
-        except Exception as e:
-            logger.error(f"Error sending to frontend: {e}")
+    # Only queues the event; delivery happens on each subscriber's own task
+    event_broadcaster.publish(event, _session.latest_media_timestamp)
 
     event_type = event.get("type")
 
     if event_type == "input_audio_buffer.speech_started":
+        if _session.barge_in_reconcile:
+            # Server VAD agrees with the local barge-in
+            _session.barge_in_reconcile.cancel()
+            _session.barge_in_reconcile = None
+            _session.barge_in_stats["confirmed"] += 1
+        if _session.conversation_context:
+            _session.conversation_context.speech_started(event.get("item_id"), event.get("audio_start_ms"))
         await handle_truncation()
 
+    elif event_type == "input_audio_buffer.speech_stopped":
+        if _session.turn_timer:
+            _session.turn_timer.speech_stopped()
+        if _session.conversation_context:
+            _session.conversation_context.speech_stopped(event.get("item_id"), event.get("audio_end_ms"))
+
+    elif event_type == "conversation.item.created":
+        if _session.conversation_context:
+            _session.conversation_context.add(event.get("item", {}))
+
+    elif event_type == "conversation.item.deleted":
+        if _session.conversation_context:
+            _session.conversation_context.remove(event.get("item_id"))
+
+    elif event_type == "conversation.item.input_audio_transcription.completed":
+        if _session.conversation_context:
+            _session.conversation_context.set_text(event.get("item_id"), event.get("transcript", ""))
+
+    elif event_type == "session.created":
+        logger.info("Realtime session %s", event.get("session", {}).get("id"))
+        if _session.call_span:
+            _session.call_span.set_attribute("openai.session_id", event.get("session", {}).get("id"))
+
+    elif event_type == "response.created":
+        _session.suppress_response_audio = False
+        if _session.turn_timer:
+            _session.turn_timer.response_created()
+        if _session.trace and _session.trace.sampled:
+            start_response_span(event.get("response", {}))
+
     elif event_type == "response.audio.delta":
+        if _session.suppress_response_audio:
+            # Caller barged in locally; drop the rest of this response
+            return
+        if _session.turn_timer:
+            _session.turn_timer.audio_delta()
+        if _session.local_playback:
+            await stop_local_playback()
+        if _session.greeting_recorder:
+            _session.greeting_recorder.add_delta(event.get("delta"))
         if _session.twilio_conn and _session.stream_sid:
             if _session.response_start_timestamp is None:
                 _session.response_start_timestamp = _session.latest_media_timestamp or 0
 
+            # Track when Twilio will have played everything sent so far
+            latest = _session.latest_media_timestamp or 0
+            playback_from = max(_session.playback_end_timestamp or 0, latest)
+            delta_ms = len(event.get("delta") or "") * 3 // 32
+            _session.playback_end_timestamp = playback_from + delta_ms
+            if _session.conversation_context:
+                _session.conversation_context.add_audio(event.get("item_id"), delta_ms)
+
             if event.get("item_id"):
                 _session.last_assistant_item = event.get("item_id")
+            if _session.call_recorder:
+                _session.call_recorder.add_assistant(latest, event.get("delta"))
             await json_send(_session.twilio_conn, {
                 "event": "media",
                 "streamSid": _session.stream_sid,
                 "media": {"payload": event.get("delta")}
             })
+            audio_frames_out.inc()
+            if _session.turn_timer:
+                _session.turn_timer.audio_sent()
             await json_send(_session.twilio_conn, {
                 "event": "mark",
                 "streamSid": _session.stream_sid
             })
+    elif event_type == "response.audio_transcript.done":
+        if _session.greeting_recorder:
+            _session.greeting_recorder.transcript = event.get("transcript", "")
+        if _session.conversation_context:
+            _session.conversation_context.set_text(event.get("item_id"), event.get("transcript", ""))
+
+    elif event_type == "response.done":
+        if _session.response_span:
+            end_response_span(event.get("response", {}))
+        if _session.greeting_recorder:
+            await finish_greeting_capture(event)
+        if _session.conversation_context and _session.conversation_context.over_budget():
+            await trim_context()
+
+    elif event_type == "response.output_item.added":
+        if _session.tool_prefetcher:
+            _session.tool_prefetcher.on_item_added(event.get("item", {}))
+
+    elif event_type == "response.function_call_arguments.delta":
+        if _session.tool_prefetcher:
+            ready = _session.tool_prefetcher.on_arguments_delta(event.get("item_id"), event.get("delta", ""))
+            if ready:
+                start_prefetch(*ready)
+
     elif event_type == "response.output_item.done":
         item = event.get("item", {})
+        if _session.tool_prefetcher:
+            _session.tool_prefetcher.finish(item.get("id"))
         if item.get("type") == "function_call":
+            filler_task = asyncio.create_task(play_filler_after_delay())
+            started = time.perf_counter()
             try:
-                output = await handle_function_call(item)
+                with span("tool.call", {"tool.name": item.get("name"), "tool.call_id": item.get("call_id")}) as tool_span:
+                    output = await handle_function_call(item)
+                    if tool_span and is_error_output(output):
+                        tool_span.set_error("tool returned an error")
+                filler_task.cancel()
+                tool_calls.inc_labels(item.get("name") or "unknown", "error" if is_error_output(output) else "ok")
+                if _session.turn_timer:
+                    _session.turn_timer.tool_finished(item.get("name") or "unknown", started)
+                if _session.event_recorder:
+                    _session.event_recorder.record_tool(item.get("call_id"), item.get("name"), output)
+                if _session.tool_output_stats:
+                    size, tokens = _session.tool_output_stats.record(item.get("name"), output)
+                    logger.info("Tool output %s: %d bytes, ~%d tokens", item.get("name"), size, tokens)
 
                 if _session.model_conn and _session.model_conn.open:
                     await json_send(_session.model_conn, {
@@ -349,11 +897,314 @@ async def handle_model_message(data: str) -> None:
                         "type": "response.create"
                     })
             except Exception as e:
-                logger.error(f"Error handling function call: {e}")
+                filler_task.cancel()
+                logger.error("Error handling function call: %s", e)
+
+
+def current_persona() -> Optional[str]:
+    """Get the persona of the campaign on the line, if known."""
+    if _session.caller_context:
+        return _session.caller_context.get("persona_name") or None
+    return None
+
+
+async def play_filler_after_delay() -> None:
+    """Play a filler clip if a tool call is still running after the delay."""
+    await asyncio.sleep(FILLER_DELAY_SECONDS)
+
+    frames = filler_library.get_clip(current_persona())
+    if frames:
+        await play_local_audio(frames, "filler")
+
+
+async def play_local_audio(frames: List[str], name: str) -> None:
+    """Stream locally cached audio to Twilio, followed by a mark named after it.
+
+    Args:
+        frames: Base64 mu-law media payloads
+        name: Mark name echoed back by Twilio once playback finishes
+    """
+    if not _session.twilio_conn or not _session.stream_sid:
+        return
+
+    _session.local_playback = name
+    for payload in frames:
+        if _session.call_recorder:
+            _session.call_recorder.add_assistant(_session.latest_media_timestamp or 0, payload)
+        await json_send(_session.twilio_conn, {
+            "event": "media",
+            "streamSid": _session.stream_sid,
+            "media": {"payload": payload}
+        })
+    audio_frames_out.inc(len(frames))
+    if _session.turn_timer:
+        _session.turn_timer.audio_sent()
+    await json_send(_session.twilio_conn, {
+        "event": "mark",
+        "streamSid": _session.stream_sid,
+        "mark": {"name": name}
+    })
+
+
+async def stop_local_playback(interruption: bool = False) -> None:
+    """Cut a playing local clip by clearing Twilio's playback buffer.
+
+    Args:
+        interruption: The caller cut the clip off, rather than the response audio replacing it
+    """
+    if not _session.local_playback:
+        return
+
+    _session.local_playback = None
+    await clear_twilio_playback(interruption)
+
+
+async def clear_twilio_playback(interruption: bool = False) -> None:
+    """Drop the audio queued on Twilio, and from the call recording.
+
+    Args:
+        interruption: The caller barged in; the recording counts it for call analytics
+    """
+    if _session.call_recorder:
+        _session.call_recorder.clear_assistant(_session.latest_media_timestamp or 0, interruption)
+    if _session.twilio_conn and _session.stream_sid:
+        await json_send(_session.twilio_conn, {
+            "event": "clear",
+            "streamSid": _session.stream_sid
+        })
+
+
+def current_greeting_key() -> Optional[str]:
+    """Get the greeting cache key of this call, or None if it is personalized.
+
+    Greetings of calls with a known contact name would address the next
+    caller by the wrong name, so only campaign-generic openings are cached.
+    The key covers the campaign but no other caller details, so one greeting
+    serves every unnamed caller of a campaign.
+    """
+    context = _session.caller_context or {}
+    if context.get("contact_name"):
+        return None
+    campaign = f"{context.get('campaign_id', '')}\n{context.get('campaign_name', '')}" if context else ""
+    return greeting_key(current_persona() or DEFAULT_PERSONA, MODEL_VOICE, base_instructions(), campaign)
+
+
+async def start_greeting() -> None:
+    """Play the cached greeting right away, or arrange to capture one."""
+    key = current_greeting_key()
+    if not key:
+        return
+
+    greeting = greeting_cache.get(key)
+    if greeting:
+        _session.greeting_played = greeting.transcript
+        await play_local_audio(greeting.frames, "greeting")
+    else:
+        _session.greeting_recorder = GreetingRecorder(key)
+
+
+async def finish_greeting_capture(event: Dict[str, Any]) -> None:
+    """Store the captured greeting once the first response is done.
+
+    A response cut short still yields a greeting if its first
+    GREETING_MAX_SECONDS were captured.
+    """
+    recorder = _session.greeting_recorder
+    _session.greeting_recorder = None
+    if recorder and (recorder.full or event.get("response", {}).get("status") == "completed"):
+        await greeting_cache.save(recorder)
+
+
+def is_assistant_playing() -> bool:
+    """Check whether Twilio is still playing assistant or local audio."""
+    if _session.local_playback:
+        return True
+    if _session.playback_end_timestamp is None:
+        return False
+    return (_session.latest_media_timestamp or 0) < _session.playback_end_timestamp
+
+
+async def handle_local_barge_in() -> None:
+    """Interrupt the assistant as soon as local VAD hears the caller.
+
+    Clears Twilio playback and truncates the model's item like server VAD
+    would, then waits for `input_audio_buffer.speech_started` to confirm.
+    If it never comes, the interruption was a false positive and the model
+    is asked to carry on.
+    """
+    _session.barge_in_stats["local"] += 1
+    _session.suppress_response_audio = True
+    had_item = bool(_session.last_assistant_item)
+    await handle_truncation()
+
+    if not had_item:
+        await clear_twilio_playback(interruption=True)
+    if _session.model_conn and _session.model_conn.open:
+        await json_send(_session.model_conn, {"type": "response.cancel"})
+
+    confirm_ms = ((_session.conversation_settings or {}).get("barge_in") or {}).get("confirm_ms", BARGE_IN_CONFIRM_MS)
+    _session.barge_in_reconcile = asyncio.create_task(reconcile_barge_in(confirm_ms / 1000))
+
+
+async def reconcile_barge_in(delay: float) -> None:
+    """Resume the model if server VAD did not confirm a local barge-in."""
+    await asyncio.sleep(delay)
+    _session.barge_in_reconcile = None
+    _session.barge_in_stats["false_positive"] += 1
+    _session.suppress_response_audio = False
+    logger.info("Local barge-in not confirmed by server VAD, resuming response")
+    if _session.model_conn and _session.model_conn.open:
+        await json_send(_session.model_conn, {"type": "response.create"})
+
+
+def amd_settings() -> Dict[str, Any]:
+    """Get the `amd` block of the campaign's conversation settings."""
+    return (_session.conversation_settings or {}).get("amd") or {}
+
+
+async def handle_machine_detected() -> None:
+    """Release the model and hang up or leave a message on an answering machine."""
+    logger.info("Answering machine detected (%s), releasing model connection", _session.amd.reason)
+    subscriber_id = (_session.caller_context or {}).get("subscriber_id")
+    if subscriber_id:
+        run_in_background(record_amd_disposition(subscriber_id, amd_settings().get("disposition", AMD_DISPOSITION)))
+
+    await stop_local_playback()
+    await close_model()
+
+    if amd_settings().get("action") == "message" and voicemail_library.get_clip(current_persona()):
+        if _session.amd.beep_detected:
+            await leave_voicemail()
+        else:
+            _session.amd_beep_wait = asyncio.create_task(
+                leave_voicemail_after(amd_settings().get("beep_wait_ms", AMD_BEEP_WAIT_MS) / 1000)
+            )
+    else:
+        await close_all_connections()
+
+
+async def record_amd_disposition(subscriber_id: str, disposition: str) -> None:
+    """Record the answering-machine outcome without holding up the call."""
+    try:
+        utils = await get_vb_utilities()
+        await utils.call_dao.update_subscriber_disposition(subscriber_id, disposition)
+    except Exception as e:
+        logger.error("Failed to record answering machine disposition: %s", e)
+
+
+async def leave_voicemail_after(delay: float) -> None:
+    """Leave the voicemail message if no record beep was heard in time."""
+    await asyncio.sleep(delay)
+    _session.amd_beep_wait = None
+    await leave_voicemail()
+
+
+async def leave_voicemail() -> None:
+    """Play the cached voicemail message; Twilio's `voicemail` mark ends the call."""
+    if _session.amd_beep_wait:
+        _session.amd_beep_wait.cancel()
+        _session.amd_beep_wait = None
+    if _session.local_playback == "voicemail":
+        return
+
+    frames = voicemail_library.get_clip(current_persona())
+    if frames:
+        await play_local_audio(frames, "voicemail")
+    else:
+        await close_all_connections()
+
+
+async def handle_dtmf(digit: str) -> None:
+    """Record a keypad answer to the current survey question without the model.
+
+    The digit is resolved to a `survey_choice` of the current question and
+    recorded with the call's other answers; the model only gets a note so it
+    can move on. A keypress interrupts the assistant like speech would.
+
+    Args:
+        digit: Digit pressed by the caller
+    """
+    survey = _session.survey_state
+    question = survey.current_question if survey else None
+    choice = survey.choice_for_digit(question["id"], digit) if question else None
+
+    if is_assistant_playing():
+        _session.suppress_response_audio = True
+        await handle_truncation()
+        if _session.model_conn and _session.model_conn.open:
+            await json_send(_session.model_conn, {"type": "response.cancel"})
+
+    subscriber_id = (_session.caller_context or {}).get("subscriber_id")
+    if choice and subscriber_id:
+        question_id = str(question["id"])
+        survey.record_answer(question_id, choice["id"])
+        survey.keypad_answers += 1
+        note = (
+            f"The caller pressed {digit} on the keypad, answering question {question_id} "
+            f"(\"{question.get('question_text', '')}\") with \"{choice.get('choice_text', '')}\". "
+            "The answer is already recorded; do not record it again. Continue with the next question."
+        )
+    elif question:
+        note = (
+            f"The caller pressed {digit} on the keypad, which is not an option for question "
+            f"{question['id']}. Repeat the options."
+        )
+    else:
+        note = f"The caller pressed {digit} on the keypad."
+    logger.info("DTMF %s: %s", digit, note)
+
+    if _session.model_conn and _session.model_conn.open:
+        await json_send(_session.model_conn, {
+            "type": "conversation.item.create",
+            "item": {
+                "type": "message",
+                "role": "system",
+                "content": [{"type": "input_text", "text": note}]
+            }
+        })
+        await json_send(_session.model_conn, {"type": "response.create"})
+
+
+async def trim_context() -> None:
+    """Delete stale conversation items once the context is over budget.
+
+    Runs at turn boundaries. Trimmed turns are replaced by one summary item
+    at the start of the conversation.
+    """
+    context = _session.conversation_context
+    if not _session.model_conn or not _session.model_conn.open:
+        return
+
+    before = context.total_tokens
+    item_ids, summary = context.plan_trim()
+    for item_id in item_ids:
+        await json_send(_session.model_conn, {
+            "type": "conversation.item.delete",
+            "item_id": item_id
+        })
+    if summary:
+        await json_send(_session.model_conn, {
+            "type": "conversation.item.create",
+            "previous_item_id": "root",
+            "item": {
+                "id": context.summary_item_id,
+                "type": "message",
+                "role": "system",
+                "content": [{"type": "input_text", "text": f"Earlier in this call:\n{summary}"}]
+            }
+        })
+    logger.info("Trimmed %d conversation items, ~%d -> ~%d tokens", len(item_ids), before, context.total_tokens)
 
 
 async def handle_truncation() -> None:
     """Handle audio truncation when user starts speaking."""
+    await stop_local_playback(interruption=True)
+    _session.playback_end_timestamp = None
+    recorder = _session.greeting_recorder
+    if recorder and recorder.audio and not recorder.full:
+        # Caller cut into the greeting before its first seconds were captured
+        recorder.discard()
+
     if not _session.last_assistant_item or _session.response_start_timestamp is None:
         return
 
@@ -373,34 +1224,122 @@ async def handle_truncation() -> None:
                 "audio_end_ms": audio_end_ms
             })
 
-        if _session.twilio_conn and _session.stream_sid:
-            await json_send(_session.twilio_conn, {
-                "event": "clear",
-                "streamSid": _session.stream_sid
-            })
+        await clear_twilio_playback(interruption=True)
 
         _session.last_assistant_item = None
         _session.response_start_timestamp = None
     except Exception as e:
-        logger.error(f"Error in handle_truncation: {e}")
+        logger.error("Error in handle_truncation: %s", e)
         _session.last_assistant_item = None
         _session.response_start_timestamp = None
 
 
+def start_call_trace(start: Dict[str, Any]) -> None:
+    """Start the call's trace and its root span at the Twilio `start` event.
+
+    The trace is current for this task and every task created after it,
+    including the model listener and the survey loader.
+    """
+    campaign_id = (_session.caller_context or {}).get("campaign_id") \
+        or (start.get("customParameters") or {}).get("campaign_id")
+    _session.trace = start_trace({"twilio.stream_sid": _session.stream_sid})
+    _session.call_span = _session.trace.start_span("call", {
+        "twilio.call_sid": start.get("callSid"),
+        "callhub.campaign_id": campaign_id,
+    }, kind=SPAN_KIND_SERVER)
+    current_span.set(_session.call_span)
+    if _session.trace.sampled:
+        logger.info("Tracing call as %s", _session.trace.trace_id)
+
+
+def start_response_span(response: Dict[str, Any]) -> None:
+    """Time a model response from `response.created` to `response.done`.
+
+    Spans started by this task meanwhile, such as tool calls, nest under it.
+    """
+    if _session.response_span:
+        end_response_span({"status": "superseded"})
+    _session.response_span = _session.trace.start_span(
+        "model.response", {"openai.response_id": response.get("id")},
+        kind=SPAN_KIND_CLIENT, parent=_session.call_span
+    )
+    current_span.set(_session.response_span)
+
+
+def end_response_span(response: Dict[str, Any]) -> None:
+    s = _session.response_span
+    _session.response_span = None
+    current_span.set(_session.call_span)
+    status = response.get("status")
+    s.set_attribute("openai.response_status", status)
+    usage = response.get("usage") or {}
+    s.set_attribute("openai.input_tokens", usage.get("input_tokens"))
+    s.set_attribute("openai.output_tokens", usage.get("output_tokens"))
+    if status in ("failed", "incomplete"):
+        s.set_error(str((response.get("status_details") or {}).get("reason") or status))
+    s.end()
+
+
+def end_call_trace() -> None:
+    """End the call's open spans and write its trace out"""
+    if _session.response_span:
+        end_response_span({"status": "call_ended"})
+    if _session.call_span:
+        _session.call_span.end()
+        _session.call_span = None
+    exporter.flush()
+
+
+def build_call_summary() -> Dict[str, Any]:
+    """Collect per-call statistics for the summary emitted at hangup."""
+    summary: Dict[str, Any] = {"stream_sid": _session.stream_sid}
+    if _session.caller_context:
+        summary["contact_id"] = _session.caller_context.get("contact_id")
+        summary["campaign_id"] = _session.caller_context.get("campaign_id")
+    if _session.tool_cache:
+        summary["tool_cache"] = _session.tool_cache.stats()
+    if _session.tool_output_stats:
+        summary["tool_output"] = _session.tool_output_stats.stats()
+    if _session.conversation_context:
+        summary["context"] = _session.conversation_context.stats()
+    if _session.turn_timer:
+        summary["latency"] = _session.turn_timer.summary()
+    if _session.barge_in_detector:
+        summary["barge_in"] = _session.barge_in_stats
+    if _session.silence_gate:
+        summary["silence_suppression"] = _session.silence_gate.stats()
+    if _session.amd:
+        summary["amd"] = _session.amd.stats()
+    if _session.survey_state:
+        summary["survey"] = _session.survey_state.stats()
+    if _session.call_recorder:
+        summary["recording"] = _session.call_recorder.stats()
+    return summary
+
+
+async def emit_call_summary() -> None:
+    """Log the call summary and forward it to the frontend."""
+    if not _session.stream_sid:
+        return
+
+    summary = build_call_summary()
+    logger.info("Call summary: %s", json.dumps(summary))
+    event_broadcaster.publish({"type": "call.summary", "summary": summary})
+
+
 async def close_model() -> None:
     """Close the OpenAI model connection."""
     await cleanup_connection(_session.model_conn)
     _session.model_conn = None
 
-    if not _session.twilio_conn and not _session.frontend_conn:
+    if not _session.twilio_conn and not event_broadcaster.has_subscribers():
         reset_session()
 
 
 async def close_all_connections() -> None:
-    """Close all active connections."""
+    """Close the call's connections. `/logs` subscribers stay connected for the next call."""
     await cleanup_connection(_session.twilio_conn)
     await cleanup_connection(_session.model_conn)
-    await cleanup_connection(_session.frontend_conn)
 
 
 async def cleanup_connection(ws: Optional[Union[WebSocket, websockets.WebSocketClientProtocol]]) -> None:
@@ -423,7 +1362,7 @@ async def cleanup_connection(ws: Optional[Union[WebSocket, websockets.WebSocketC
             if ws.open:
                 await ws.close()
     except Exception as e:
-        logger.error(f"Error closing WebSocket: {e}")
+        logger.error("Error closing WebSocket: %s", e)
 
 
 async def json_send(ws: Optional[Union[WebSocket, websockets.WebSocketClientProtocol]], obj: Any) -> None:
@@ -442,5 +1381,5 @@ async def json_send(ws: Optional[Union[WebSocket, websockets.WebSocketClientProt
         else:
             await ws.send(json.dumps(obj))
     except Exception as e:
-        logger.error(f"Error sending message: {e}")
+        logger.error("Error sending message: %s", e)
 
@@ -0,0 +1,194 @@
+"""Per-call survey progress, served to the model one question at a time."""
+import logging
+from typing import Dict, Any, List, Optional, Set
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# Schema of the session tool that walks the model through the survey
+next_question_schema = {
+    "name": "next_question",
+    "type": "function",
+    "description": (
+        "Get the next survey question to ask. Pass the caller's answer to the "
+        "current question to record it; answers are saved when the call ends."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "question_id": {
+                "type": "string",
+                "description": "The question being answered; defaults to the current question."
+            },
+            "choice_id": {
+                "type": "string",
+                "description": "The ID of the choice the caller picked."
+            },
+            "answer_text": {
+                "type": "string",
+                "description": "The caller's answer in their own words, for open questions."
+            },
+            "skip": {
+                "type": "boolean",
+                "description": "Skip an optional question the caller declined to answer."
+            }
+        },
+        "required": []
+    }
+}
+
+
+class SurveyState:
+    """Tracks the campaign's survey through one call.
+
+    Questions are asked in `order_position` order; the current question is
+    the first one not answered yet, whether it was answered on the keypad,
+    through `next_question` or by the model with `save_survey_response`.
+    Answers are held in memory and written in one batch when the call ends.
+    """
+
+    def __init__(self, survey_id: str, questions: List[Dict[str, Any]], choices: Dict[str, List[Dict[str, Any]]]):
+        """Create the state for one call.
+
+        Args:
+            survey_id: ID of the campaign's survey
+            questions: Survey questions in asking order
+            choices: Question ID -> choices in display order
+        """
+        self.survey_id = survey_id
+        self.questions = questions
+        self.choices = choices
+        self.answered: Set[str] = set()
+        self.answers: Dict[str, Dict[str, Any]] = {}
+        self.keypad_answers = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["SurveyState"]:
+        """Build the state from `VBSystemUtilities.get_survey_config` output.
+
+        Returns:
+            The survey state, or None when the campaign has no survey questions
+        """
+        if not config or not config.get("survey_id") or not config.get("questions"):
+            return None
+        choices = {str(qid): rows for qid, rows in (config.get("choices") or {}).items()}
+        return cls(str(config["survey_id"]), list(config["questions"]), choices)
+
+    def get_question(self, question_id: Any) -> Optional[Dict[str, Any]]:
+        """Get a question of this survey by ID"""
+        return next((q for q in self.questions if str(q["id"]) == str(question_id)), None)
+
+    @property
+    def current_question(self) -> Optional[Dict[str, Any]]:
+        """The first unanswered question, or None once the survey is done"""
+        return next((q for q in self.questions if str(q["id"]) not in self.answered), None)
+
+    def choice_for_digit(self, question_id: str, digit: str) -> Optional[Dict[str, Any]]:
+        """Resolve a keypad digit to one of a question's choices.
+
+        When the choices have numeric `choice_value`s the digit must match
+        one of them; otherwise digits count through the choices in order, so
+        "1" is the first choice.
+
+        Args:
+            question_id: Question being answered
+            digit: Digit pressed on the keypad
+
+        Returns:
+            The matching `survey_choice` row, or None
+        """
+        choices = self.choices.get(str(question_id)) or []
+        keyed = {str(c.get("choice_value") or "").strip(): c for c in choices}
+        if any(value.isdigit() for value in keyed):
+            return keyed.get(digit)
+        if digit.isdigit() and 1 <= int(digit) <= len(choices):
+            return choices[int(digit) - 1]
+        return None
+
+    def mark_answered(self, question_id: Any) -> None:
+        """Move past a question once its answer is recorded"""
+        if question_id is not None:
+            self.answered.add(str(question_id))
+
+    def record_answer(self, question_id: Any, choice_id: Any = None, answer_text: Optional[str] = None) -> None:
+        """Hold an answer until the batch flush at call end; a later answer replaces it"""
+        question_id = str(question_id)
+        self.answers[question_id] = {
+            "question_id": question_id,
+            "choice_id": str(choice_id) if choice_id else None,
+            "answer_text": answer_text,
+        }
+        self.mark_answered(question_id)
+
+    def answer(
+        self,
+        question_id: Any = None,
+        choice_id: Any = None,
+        answer_text: Optional[str] = None,
+        skip: bool = False,
+    ) -> Optional[str]:
+        """Validate and record an answer given through `next_question`.
+
+        Args:
+            question_id: Question answered; defaults to the current question
+            choice_id: Choice picked, for questions with choices
+            answer_text: Free text answer
+            skip: Skip the question without an answer
+
+        Returns:
+            An error message, or None if the answer was recorded
+        """
+        question = self.get_question(question_id) if question_id else self.current_question
+        if not question:
+            return f"Unknown question {question_id}" if question_id else "The survey is already complete"
+
+        question_id = str(question["id"])
+        if skip:
+            if question.get("is_required"):
+                return f"Question {question_id} is required"
+            self.mark_answered(question_id)
+            return None
+
+        choices = self.choices.get(question_id) or []
+        if choice_id:
+            if not any(str(c["id"]) == str(choice_id) for c in choices):
+                return f"Choice {choice_id} does not belong to question {question_id}"
+        elif not answer_text:
+            return f"An answer to question {question_id} is required"
+        self.record_answer(question_id, choice_id, answer_text)
+        return None
+
+    def next_question(self) -> Dict[str, Any]:
+        """Compact payload of the current question for the model"""
+        question = self.current_question
+        if not question:
+            return {"done": True, "answered": len(self.answers)}
+
+        question_id = str(question["id"])
+        payload: Dict[str, Any] = {
+            "question_id": question_id,
+            "text": question.get("question_text", ""),
+            "remaining": len(self.questions) - len(self.answered),
+        }
+        choices = self.choices.get(question_id)
+        if choices:
+            payload["choices"] = {str(c["id"]): c.get("choice_text", "") for c in choices}
+        if not question.get("is_required"):
+            payload["optional"] = True
+        return payload
+
+    def pending_answers(self) -> List[Dict[str, Any]]:
+        """Answers to write at call end, in asking order"""
+        order = {str(q["id"]): i for i, q in enumerate(self.questions)}
+        return sorted(self.answers.values(), key=lambda a: order.get(a["question_id"], len(order)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Survey progress for the call summary"""
+        return {
+            "survey_id": self.survey_id,
+            "questions": len(self.questions),
+            "answered": len(self.answered),
+            "recorded": len(self.answers),
+            "keypad_answers": self.keypad_answers,
+        }
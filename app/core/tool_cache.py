@@ -0,0 +1,159 @@
+"""Per-session memoization of read-only tool results."""
+import json
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from app.core.metrics import tool_cache_lookups
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCache:
+    """Memoizes read-only tool outputs for the lifetime of one call.
+
+    Entries are keyed by tool name and normalized arguments and tagged with
+    the entities they were read from (e.g. ``contact:42``). Running a write
+    tool drops every entry tagged with an entity the write touches.
+    """
+
+    def __init__(self, read_only: Set[str], entities: Dict[str, List[Tuple[str, str]]]):
+        """Create an empty cache.
+
+        Args:
+            read_only: Names of the tools whose results may be memoized
+            entities: Tool name -> (entity kind, argument name) pairs it reads or writes
+        """
+        self.read_only = read_only
+        self.entities = entities
+        self._entries: Dict[str, str] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.invalidations = 0
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.prefetched = 0
+        self.prefetch_hits = 0
+
+    @staticmethod
+    def normalize_args(args: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize arguments so `12`, `"12"` and `" 12 "` share an entry"""
+        normalized = {}
+        for key, value in args.items():
+            if value is None or value == "":
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            elif isinstance(value, str):
+                value = value.strip()
+            normalized[key] = value
+        return normalized
+
+    def make_key(self, name: str, args: Dict[str, Any]) -> str:
+        """Build the cache key for a tool call"""
+        return json.dumps([name, self.normalize_args(args)], sort_keys=True, separators=(",", ":"))
+
+    def entity_tags(self, name: str, args: Dict[str, Any]) -> Set[str]:
+        """Get the entities a tool call reads or writes"""
+        normalized = self.normalize_args(args)
+        return {
+            f"{kind}:{normalized[arg]}"
+            for kind, arg in self.entities.get(name, [])
+            if arg in normalized
+        }
+
+    def is_cacheable(self, name: str) -> bool:
+        """Check whether a tool's results may be memoized"""
+        return name in self.read_only
+
+    def get(self, name: str, args: Dict[str, Any]) -> Optional[str]:
+        """Get a memoized output and record the hit or miss.
+
+        Args:
+            name: Tool name
+            args: Parsed tool arguments
+
+        Returns:
+            The memoized output, or None on a miss
+        """
+        output = self._entries.get(self.make_key(name, args))
+        if output is None:
+            self.misses[name] = self.misses.get(name, 0) + 1
+            tool_cache_lookups.inc_labels("miss")
+        else:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            tool_cache_lookups.inc_labels("hit")
+        return output
+
+    def put(self, name: str, args: Dict[str, Any], output: str) -> None:
+        """Memoize the output of a read-only tool call"""
+        key = self.make_key(name, args)
+        self._entries[key] = output
+        for tag in self.entity_tags(name, args):
+            self._tags.setdefault(tag, set()).add(key)
+
+    def has(self, name: str, args: Dict[str, Any]) -> bool:
+        """Check for a memoized or in-flight result without recording a lookup"""
+        key = self.make_key(name, args)
+        return key in self._entries or key in self._pending
+
+    def add_pending(self, name: str, args: Dict[str, Any], task: asyncio.Task) -> None:
+        """Register a speculative tool run that a later call can reuse"""
+        key = self.make_key(name, args)
+        self._pending[key] = task
+        for tag in self.entity_tags(name, args):
+            self._tags.setdefault(tag, set()).add(key)
+        self.prefetched += 1
+
+    def pop_pending(self, name: str, args: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """Claim the in-flight run matching a tool call, if any"""
+        task = self._pending.pop(self.make_key(name, args), None)
+        if task is not None:
+            self.prefetch_hits += 1
+        return task
+
+    def cancel_pending(self) -> None:
+        """Cancel speculative runs nobody claimed"""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+    def invalidate(self, name: str, args: Dict[str, Any]) -> int:
+        """Drop the entries read from any entity a write tool call touches.
+
+        Args:
+            name: Name of the write tool
+            args: Parsed tool arguments
+
+        Returns:
+            Number of entries dropped
+        """
+        dropped = 0
+        for tag in self.entity_tags(name, args):
+            for key in self._tags.pop(tag, set()):
+                if self._entries.pop(key, None) is not None:
+                    dropped += 1
+                task = self._pending.pop(key, None)
+                if task is not None:
+                    task.cancel()
+        self.invalidations += dropped
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate summary for the call summary"""
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "prefetched": self.prefetched,
+            "prefetch_hits": self.prefetch_hits,
+            "by_tool": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                for name in sorted(set(self.hits) | set(self.misses))
+            },
+        }
@@ -0,0 +1,99 @@
+"""Compact serialization and size accounting of tool outputs sent to the model."""
+import json
+from typing import Dict, Any, Tuple
+
+# JSON without the spaces json.dumps puts after separators by default
+COMPACT_SEPARATORS = (",", ":")
+
+# Rough characters per token for English text and JSON
+CHARS_PER_TOKEN = 4
+
+
+def project(value: Any, spec: Any) -> Any:
+    """Keep only the parts of a tool result described by a projection spec.
+
+    A spec is True (keep the value), a dict of key -> spec (keep those keys;
+    "*" applies to every key), a one-item list [spec] (apply to each list
+    element) or a callable that transforms the value. Empty values are
+    dropped so they do not cost tokens.
+
+    Args:
+        value: Tool result or part of it
+        spec: Projection spec
+
+    Returns:
+        The projected value
+    """
+    if spec is True:
+        return value
+    if callable(spec):
+        return spec(value)
+    if isinstance(spec, list):
+        if not isinstance(value, list):
+            return value
+        return [project(item, spec[0]) for item in value]
+    if isinstance(spec, dict) and isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            item_spec = spec.get(key, spec.get("*"))
+            if item_spec is None or item in (None, "", [], {}):
+                continue
+            projected[key] = project(item, item_spec)
+        return projected
+    return value
+
+
+def short_scalars(max_length: int = 80) -> Any:
+    """Projection keeping only short scalar fields of a free-form dict, like `additional_vars`"""
+    def keep(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return {}
+        return {
+            key: item for key, item in value.items()
+            if isinstance(item, (bool, int, float)) or (isinstance(item, str) and 0 < len(item) <= max_length)
+        }
+    return keep
+
+
+def compact_json(value: Any) -> str:
+    """Serialize a tool result compactly; dates and other objects become strings"""
+    return json.dumps(value, separators=COMPACT_SEPARATORS, ensure_ascii=False, default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the model tokens a tool output costs"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ToolOutputStats:
+    """Per-call size and token totals of the tool outputs sent to the model"""
+
+    def __init__(self):
+        self.by_tool: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, output: str) -> Tuple[int, int]:
+        """Count one tool output.
+
+        Args:
+            name: Tool name
+            output: Output sent as `function_call_output`
+
+        Returns:
+            The output's size in bytes and estimated tokens
+        """
+        size = len(output.encode("utf-8"))
+        tokens = estimate_tokens(output)
+        totals = self.by_tool.setdefault(name, {"calls": 0, "bytes": 0, "tokens": 0})
+        totals["calls"] += 1
+        totals["bytes"] += size
+        totals["tokens"] += tokens
+        return size, tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals for the call summary"""
+        return {
+            "calls": sum(t["calls"] for t in self.by_tool.values()),
+            "bytes": sum(t["bytes"] for t in self.by_tool.values()),
+            "tokens": sum(t["tokens"] for t in self.by_tool.values()),
+            "by_tool": self.by_tool,
+        }
@@ -0,0 +1,94 @@
+"""Speculative prefetch of read-only tools from streaming function-call arguments."""
+import re
+import json
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# A complete `"key": "string"` or `"key": 123` pair inside partial JSON. Numbers
+# only count once a delimiter follows, so "12" is not mistaken for "123".
+_ARGUMENT_PAIR = re.compile(
+    r'"(\w+)"\s*:\s*(?:"((?:[^"\\]|\\.)*)"|(-?\d+)(?=\s*[,}]))'
+)
+
+
+def extract_complete_arguments(partial: str) -> Dict[str, Any]:
+    """Extract the scalar arguments that are already complete in partial JSON.
+
+    Args:
+        partial: Function call arguments streamed so far
+
+    Returns:
+        Argument name -> value for every fully streamed string or integer
+    """
+    args: Dict[str, Any] = {}
+    for match in _ARGUMENT_PAIR.finditer(partial):
+        key, text, number = match.groups()
+        if number is not None:
+            args[key] = int(number)
+        else:
+            try:
+                args[key] = json.loads(f'"{text}"')
+            except json.JSONDecodeError:
+                continue
+    return args
+
+
+class FunctionCallPrefetcher:
+    """Tracks function calls while their arguments stream in.
+
+    Reports a call as ready for prefetch once the tool name and all of its
+    key arguments are known, well before `response.output_item.done`.
+    """
+
+    def __init__(self, prefetch_args: Dict[str, List[str]]):
+        """Create a prefetcher.
+
+        Args:
+            prefetch_args: Tool name -> arguments that must be known before prefetching
+        """
+        self.prefetch_args = prefetch_args
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self.started = 0
+
+    def on_item_added(self, item: Dict[str, Any]) -> None:
+        """Start tracking a function call announced by `response.output_item.added`"""
+        name = item.get("name")
+        if item.get("type") != "function_call" or name not in self.prefetch_args:
+            return
+        self._calls[item.get("id")] = {"name": name, "arguments": "", "started": False}
+
+    def on_arguments_delta(self, item_id: Optional[str], delta: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Feed an argument delta.
+
+        Args:
+            item_id: Output item ID of the function call
+            delta: Next chunk of the arguments JSON
+
+        Returns:
+            (tool name, arguments) the first time the call becomes prefetchable
+        """
+        call = self._calls.get(item_id)
+        if not call or call["started"]:
+            return None
+
+        call["arguments"] += delta or ""
+        args = extract_complete_arguments(call["arguments"])
+        required = self.prefetch_args[call["name"]]
+        if not all(arg in args for arg in required):
+            return None
+
+        call["started"] = True
+        self.started += 1
+        logger.info("Prefetching %s from streamed arguments", call["name"])
+        return call["name"], self.key_arguments(call["name"], args)
+
+    def key_arguments(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the arguments a prefetch of the tool is started and claimed with"""
+        return {arg: args[arg] for arg in self.prefetch_args.get(name, []) if arg in args}
+
+    def finish(self, item_id: Optional[str]) -> None:
+        """Stop tracking a function call once it is complete"""
+        self._calls.pop(item_id, None)
@@ -0,0 +1,251 @@
+"""Lightweight per-call tracing, exported as OTLP JSON lines.
+
+Each call gets a trace when Twilio starts the stream; spans for the model
+connection, responses, tool calls and database queries join it through
+context variables, so code that never sees the session (the DB client)
+still lands in the right trace. Sampling is decided once per call, and an
+unsampled call costs one context variable read per would-be span.
+
+Finished spans are buffered and appended to `TRACE_EXPORT_PATH` in batches,
+one OTLP `ExportTraceServiceRequest` per line, the format the OpenTelemetry
+collector's `otlpjsonfile` receiver reads.
+"""
+import os
+import json
+import time
+import atexit
+import random
+import asyncio
+import logging
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional
+
+from app.core.metrics import registry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Fraction of calls that are traced; 0 disables tracing
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+
+# File spans are appended to
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces/spans.jsonl")
+
+# Finished spans buffered before a batch is written
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "512"))
+
+SERVICE_NAME = "callhub-realtime"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+spans_exported = registry.counter("callhub_trace_spans_exported_total", "Spans written to the trace export file")
+traces_started = registry.counter("callhub_traces_total", "Calls by tracing decision", ("sampled",))
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "status", "message")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.status = STATUS_OK
+        self.message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+
+    def end(self) -> None:
+        """Finish the span and queue it for export; later calls do nothing"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        exporter.add(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.message} if self.message else {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """The trace of one call"""
+
+    def __init__(self, sampled: bool, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = "%032x" % random.getrandbits(128)
+        self.sampled = sampled
+        self.attributes = attributes or {}
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        parent: Optional[Span] = None,
+    ) -> Optional[Span]:
+        """Start a span that is ended explicitly, e.g. one spanning several events.
+
+        Returns:
+            The span, or None when the call is not sampled
+        """
+        if not self.sampled:
+            return None
+        if parent is None:
+            parent = current_span.get()
+        return Span(name, self.trace_id, parent.span_id if parent else None, kind, {**self.attributes, **(attributes or {})})
+
+
+def start_trace(attributes: Optional[Dict[str, Any]] = None, sample_rate: Optional[float] = None) -> Trace:
+    """Start the trace of a call and make it current for this task and the tasks it creates.
+
+    Args:
+        attributes: Attributes copied onto every span, e.g. the stream SID
+        sample_rate: Overrides TRACE_SAMPLE_RATE
+    """
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    trace = Trace(rate > 0 and random.random() < rate, attributes)
+    traces_started.inc_labels("true" if trace.sampled else "false")
+    current_trace.set(trace)
+    current_span.set(None)
+    return trace
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = SPAN_KIND_INTERNAL) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span.
+
+    Yields None when there is no sampled trace, so callers guard attribute
+    updates with `if s:`. An exception escaping the block marks the span
+    as failed and is re-raised.
+    """
+    trace = current_trace.get()
+    if trace is None or not trace.sampled:
+        yield None
+        return
+    s = trace.start_span(name, attributes, kind)
+    token = current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current_span.reset(token)
+        s.end()
+
+
+def otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Render attributes as OTLP `KeyValue`s"""
+    rendered = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        rendered.append({"key": key, "value": typed})
+    return rendered
+
+
+class SpanExporter:
+    """Buffers finished spans and appends them to a file in batches.
+
+    Writes run on a single dedicated thread, so a slow disk never delays
+    audio and batches flushed close together land whole and in order.
+    """
+
+    def __init__(self, path: str = TRACE_EXPORT_PATH, batch_size: int = TRACE_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="span-export")
+
+    def add(self, span: Span) -> None:
+        self._buffer.append(span)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered spans, in the background when a loop is running"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop, e.g. at exit: write behind any batch still in flight. At
+            # interpreter exit the export thread has already finished its work
+            try:
+                ok = self._executor.submit(self.write, batch).result()
+            except RuntimeError:
+                ok = self.write(batch)
+            if ok:
+                spans_exported.inc(len(batch))
+            return
+
+        def count(written: "asyncio.Future") -> None:
+            # Done callbacks run on the loop, so the counter is only updated there
+            if written.result():
+                spans_exported.inc(len(batch))
+
+        loop.run_in_executor(self._executor, self.write, batch).add_done_callback(count)
+
+    def write(self, batch: List[Span]) -> bool:
+        """Append one batch as an OTLP export request; runs on the export thread"""
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [s.to_otlp() for s in batch]}],
+            }]
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(request, separators=(",", ":")) + "\n")
+            return True
+        except Exception as e:
+            logger.error("Failed to export %d spans to %s: %s", len(batch), self.path, e)
+            return False
+
+
+# Process-wide exporter
+exporter = SpanExporter()
+atexit.register(exporter.flush)
@@ -0,0 +1,85 @@
+"""Per-call latency of conversational turns, as the caller hears it."""
+import time
+from typing import Dict, Any, List, Optional
+
+from app.core.metrics import (
+    vad_to_response_ms, vad_to_first_delta_ms, vad_to_twilio_ms, call_first_audio_ms, tool_call_ms, percentile
+)
+
+
+def _elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000
+
+
+class TurnTimer:
+    """Times each turn from the end of caller speech to assistant audio on the line.
+
+    A turn starts at `input_audio_buffer.speech_stopped` and is measured at
+    `response.created`, at the first `response.audio.delta` and when that
+    delta is sent to Twilio. Each stage is recorded in the worker histograms,
+    labeled by campaign, and kept for the per-call summary.
+    """
+
+    STAGES = ("response_created", "first_delta", "first_audio_sent")
+
+    def __init__(self, campaign: Optional[str] = None):
+        """Start timing a call at its Twilio `start` event.
+
+        Args:
+            campaign: Campaign ID used as the histogram label
+        """
+        self.campaign = str(campaign) if campaign else "unknown"
+        self.call_start = time.perf_counter()
+        self.first_audio_ms: Optional[float] = None
+        self.turns: Dict[str, List[float]] = {stage: [] for stage in self.STAGES}
+        self.tools: Dict[str, List[float]] = {}
+        self._speech_stopped: Optional[float] = None
+        self._stages_done: set = set()
+
+    def speech_stopped(self) -> None:
+        """Start a turn"""
+        self._speech_stopped = time.perf_counter()
+        self._stages_done = set()
+
+    def _stage(self, stage: str, histogram: Any) -> None:
+        if self._speech_stopped is None or stage in self._stages_done:
+            return
+        self._stages_done.add(stage)
+        elapsed = _elapsed_ms(self._speech_stopped)
+        self.turns[stage].append(elapsed)
+        histogram.observe(elapsed, self.campaign)
+
+    def response_created(self) -> None:
+        self._stage("response_created", vad_to_response_ms)
+
+    def audio_delta(self) -> None:
+        self._stage("first_delta", vad_to_first_delta_ms)
+
+    def audio_sent(self) -> None:
+        """Assistant or local audio was sent to Twilio"""
+        if self.first_audio_ms is None:
+            self.first_audio_ms = _elapsed_ms(self.call_start)
+            call_first_audio_ms.observe(self.first_audio_ms, self.campaign)
+        self._stage("first_audio_sent", vad_to_twilio_ms)
+
+    def tool_finished(self, name: str, started: float) -> None:
+        """Record a tool call that started at `started` (time.perf_counter)"""
+        elapsed = _elapsed_ms(started)
+        self.tools.setdefault(name, []).append(elapsed)
+        tool_call_ms.observe(elapsed, self.campaign, name)
+
+    def summary(self) -> Dict[str, Any]:
+        """Latency summary for the call, in milliseconds"""
+        def describe(values: List[float]) -> Dict[str, Any]:
+            return {
+                "count": len(values),
+                "p50": round(percentile(values, 0.5), 1) if values else None,
+                "p95": round(percentile(values, 0.95), 1) if values else None,
+                "max": round(max(values), 1) if values else None,
+            }
+
+        return {
+            "first_audio_ms": round(self.first_audio_ms, 1) if self.first_audio_ms is not None else None,
+            "turns": {stage: describe(values) for stage, values in self.turns.items()},
+            "tools": {name: describe(values) for name, values in self.tools.items()},
+        }
@@ -2,10 +2,11 @@
 import logging
 import asyncio
 from typing import Dict, Any, List, Optional, Callable
-import json
 
 from app.models import FunctionHandler
 from app.services.vb_system import get_vb_utilities
+from app.services.contact_index import contact_index
+from app.core.tool_output import project, short_scalars, compact_json
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,10 +27,10 @@ async def get_campaign_info(args: Dict[str, Any]) -> Dict[str, Any]:
         campaign_data = await utils.get_campaign_data(campaign_id)
         return campaign_data
     except ValueError as ve:
-        logger.error(f"Value error in get_campaign_info: {ve}")
+        logger.error("Value error in get_campaign_info: %s", ve)
         return {"error": str(ve)}
     except Exception as e:
-        logger.error(f"Error in get_campaign_info: {e}")
+        logger.error("Error in get_campaign_info: %s", e)
         return {"error": f"Failed to get campaign info: {str(e)}"}
 
 
@@ -45,10 +46,10 @@ async def get_contact_info(args: Dict[str, Any]) -> Dict[str, Any]:
         contact_data = await utils.get_contact_info(contact_id)
         return contact_data
     except ValueError as ve:
-        logger.error(f"Value error in get_contact_info: {ve}")
+        logger.error("Value error in get_contact_info: %s", ve)
         return {"error": str(ve)}
     except Exception as e:
-        logger.error(f"Error in get_contact_info: {e}")
+        logger.error("Error in get_contact_info: %s", e)
         return {"error": f"Failed to get contact info: {str(e)}"}
 
 
@@ -64,10 +65,10 @@ async def get_survey_questions(args: Dict[str, Any]) -> Dict[str, Any]:
         survey_data = await utils.get_survey_config(campaign_id)
         return survey_data
     except ValueError as ve:
-        logger.error(f"Value error in get_survey_questions: {ve}")
+        logger.error("Value error in get_survey_questions: %s", ve)
         return {"error": str(ve)}
     except Exception as e:
-        logger.error(f"Error in get_survey_questions: {e}")
+        logger.error("Error in get_survey_questions: %s", e)
         return {"error": f"Failed to get survey questions: {str(e)}"}
 
 
@@ -96,7 +97,7 @@ async def save_survey_response(args: Dict[str, Any]) -> Dict[str, Any]:
         else:
             return {"error": "Failed to save survey response"}
     except Exception as e:
-        logger.error(f"Error in save_survey_response: {e}")
+        logger.error("Error in save_survey_response: %s", e)
         return {"error": f"Failed to save survey response: {str(e)}"}
 
 
@@ -121,7 +122,7 @@ async def update_subscriber_disposition(args: Dict[str, Any]) -> Dict[str, Any]:
         else:
             return {"error": "Failed to update subscriber disposition"}
     except Exception as e:
-        logger.error(f"Error in update_subscriber_disposition: {e}")
+        logger.error("Error in update_subscriber_disposition: %s", e)
         return {"error": f"Failed to update subscriber disposition: {str(e)}"}
 
 
@@ -142,6 +143,7 @@ async def add_contact_opt_out(args: Dict[str, Any]) -> Dict[str, Any]:
         if opt_out_id:
             # Also update contact status
             await utils.contact_dao.update_contact_status(contact_id, 5)  # 5 = OPTED_OUT from enum
+            contact_index.discard_contact(contact_id, campaign_id)
             
             return {
                 "status": "success",
@@ -151,7 +153,7 @@ async def add_contact_opt_out(args: Dict[str, Any]) -> Dict[str, Any]:
         else:
             return {"error": "Failed to opt out contact"}
     except Exception as e:
-        logger.error(f"Error in add_contact_opt_out: {e}")
+        logger.error("Error in add_contact_opt_out: %s", e)
         return {"error": f"Failed to opt out contact: {str(e)}"}
 
 
@@ -277,17 +279,64 @@ add_contact_opt_out_schema = {
 }
 
 
+# Fields of each tool result the model needs (see app.core.tool_output.project).
+# Results are serialized compactly; tools without a projection are sent whole.
+output_projections = {
+    "get_campaign_info": {
+        "campaign": {"id": True, "name": True, "description": True, "status": True},
+        "ai_config": {"custom_instructions": True},
+        "persona": {"name": True},
+    },
+    "get_contact_info": {
+        "contact": {
+            "id": True, "first_name": True, "last_name": True, "status": True,
+            "city": True, "state": True, "country": True,
+        },
+        "preferences": short_scalars(),
+    },
+    "get_survey_questions": {
+        "survey_id": True,
+        "questions": [{"id": True, "question_text": True, "question_type": True, "is_required": True}],
+        "choices": {"*": [{"id": True, "choice_text": True, "choice_value": True}]},
+    },
+}
+
+# Tools whose results are memoized per session (see app.core.tool_cache)
+read_only_tools = {"get_campaign_info", "get_contact_info", "get_survey_questions"}
+
+# Entities each tool reads or writes, as (entity kind, argument name) pairs.
+# A write tool invalidates memoized reads that share one of its entities.
+# Survey responses and dispositions are not part of any read above, so
+# save_survey_response and update_subscriber_disposition invalidate nothing.
+tool_entities = {
+    "get_campaign_info": [("campaign", "campaign_id")],
+    "get_contact_info": [("contact", "contact_id")],
+    "get_survey_questions": [("survey", "campaign_id")],
+    "add_contact_opt_out": [("contact", "contact_id")],
+}
+
+# Arguments that identify the data a read-only tool fetches. Once these have
+# streamed in, the tool is started speculatively (see app.core.tool_prefetch).
+prefetch_args = {
+    "get_campaign_info": ["campaign_id"],
+    "get_contact_info": ["contact_id"],
+    "get_survey_questions": ["campaign_id"],
+}
+
+
 # Helper function to register async handlers
 def register_async_handler(schema: Dict[str, Any], async_handler: Callable) -> None:
-    """Register an async handler function with adapter to make it sync-compatible."""
+    """Register an async handler function with adapter to serialize its result."""
+    projection = output_projections.get(schema["name"])
     
-    def sync_adapter(args: Dict[str, Any]) -> str:
-        """Adapter to convert async handler to sync for the function registry."""
-        loop = asyncio.get_event_loop()
-        result = loop.run_until_complete(async_handler(args))
-        return json.dumps(result)
+    async def json_adapter(args: Dict[str, Any]) -> str:
+        """Adapter that awaits the handler on the running loop and returns compact JSON."""
+        result = await async_handler(args)
+        if projection and not (isinstance(result, dict) and "error" in result):
+            result = project(result, projection)
+        return compact_json(result)
     
-    vb_functions.append(FunctionHandler(schema=schema, handler=sync_adapter))
+    vb_functions.append(FunctionHandler(schema=schema, handler=json_adapter))
 
 
 # Register all the VB System functions
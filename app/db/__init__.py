@@ -2,4 +2,5 @@ from app.db.client import VBDatabaseClient, create_vb_database_client
 from app.db.campaign_dao import CampaignDataAccess
 from app.db.contact_dao import ContactDataAccess
 from app.db.survey_dao import SurveyDataAccess
-from app.db.call_dao import CallDataAccess 
\ No newline at end of file
+from app.db.call_dao import CallDataAccess
+from app.db.analytics_dao import AnalyticsDataAccess 
\ No newline at end of file
@@ -0,0 +1,73 @@
+import logging
+from typing import Dict, Any, List
+from datetime import datetime, timezone
+
+from app.db.client import VBDatabaseClient
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsDataAccess:
+    """Data access layer for post-call analytics"""
+
+    def __init__(self, db_client: VBDatabaseClient):
+        self.db = db_client
+
+    async def save_call_analytics(self, rows: List[Dict[str, Any]]) -> int:
+        """Save the analytics of several calls in one statement.
+
+        The `call_analytics` table is defined in the README (Call Analytics).
+
+        Args:
+            rows: One dict per call, with the call's IDs and its conversation metrics
+
+        Returns:
+            Number of rows saved, 0 on failure
+        """
+        if not rows:
+            return 0
+
+        query = """
+        INSERT INTO call_analytics (
+            stream_sid, campaign_id, contact_id, subscriber_id,
+            duration_seconds, caller_talk_seconds, assistant_talk_seconds, talk_ratio,
+            silence_pct, overlap_seconds, interruptions, responses, response_gap_ms,
+            created_date
+        )
+        SELECT r.*, $14
+        FROM unnest(
+            $1::text[], $2::int[], $3::int[], $4::int[],
+            $5::real[], $6::real[], $7::real[], $8::real[],
+            $9::real[], $10::real[], $11::int[], $12::int[], $13::real[]
+        ) AS r
+        """
+
+        def ids(key: str) -> List[Any]:
+            return [int(r[key]) if r.get(key) else None for r in rows]
+
+        def column(key: str) -> List[Any]:
+            return [r.get(key) for r in rows]
+
+        try:
+            await self.db.execute_command(
+                query,
+                column('stream_sid'),
+                ids('campaign_id'),
+                ids('contact_id'),
+                ids('subscriber_id'),
+                column('duration_seconds'),
+                column('caller_talk_seconds'),
+                column('assistant_talk_seconds'),
+                column('talk_ratio'),
+                column('silence_pct'),
+                column('overlap_seconds'),
+                column('interruptions'),
+                column('responses'),
+                column('response_gap_ms'),
+                datetime.now(timezone.utc)
+            )
+            return len(rows)
+        except Exception as e:
+            logger.error("Failed to save call analytics: %s", e)
+            return 0
@@ -55,7 +55,7 @@ class CallDataAccess:
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to update call status: {e}")
+            logger.error("Failed to update call status: %s", e)
             return False
     
     async def add_call_disposition(self, subscriber_id: str, campaign_id: str, disposition_code: str, notes: str = None) -> Optional[str]:
@@ -79,7 +79,7 @@ class CallDataAccess:
             )
             return str(result['id']) if result else None
         except Exception as e:
-            logger.error(f"Failed to add call disposition: {e}")
+            logger.error("Failed to add call disposition: %s", e)
             return None
     
     async def update_subscriber_disposition(self, subscriber_id: str, disposition: str) -> bool:
@@ -99,5 +99,5 @@ class CallDataAccess:
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to update subscriber disposition: {e}")
+            logger.error("Failed to update subscriber disposition: %s", e)
             return False 
\ No newline at end of file
@@ -1,8 +1,10 @@
 import json
 import logging
 from typing import Dict, Any, Optional
+from datetime import datetime
 
 from app.db.client import VBDatabaseClient
+from app.models.db_models import CampaignStatus
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -121,7 +123,8 @@ class CampaignDataAccess:
             aap.name as persona_name,
             aap.voice_config,
             aap.personality_traits,
-            aap.behavior_settings
+            aap.behavior_settings,
+            GREATEST(pc.updated_date, aac.updated_date, aap.updated_date) as config_updated_date
         FROM power_campaign pc
         JOIN auth_user u ON pc.user_id = u.id
         LEFT JOIN ai_agent_config aac ON pc.ai_agent_config_id = aac.id
@@ -137,4 +140,23 @@ class CampaignDataAccess:
                 if result.get(field) and isinstance(result[field], str):
                     result[field] = json.loads(result[field])
         
-        return result 
\ No newline at end of file
+        return result 
+    
+    async def get_active_ai_campaign_versions(self) -> Dict[str, Optional[datetime]]:
+        """Get all running AI agent campaigns with the last change to their AI configuration.
+
+        Returns:
+            Campaign ID -> latest `updated_date` of the campaign, its AI config and persona
+        """
+        query = """
+        SELECT
+            pc.id,
+            GREATEST(pc.updated_date, aac.updated_date, aap.updated_date) as config_updated_date
+        FROM power_campaign pc
+        LEFT JOIN ai_agent_config aac ON pc.ai_agent_config_id = aac.id
+        LEFT JOIN ai_agent_persona aap ON aac.persona_id = aap.id
+        WHERE pc.is_ai_agent = true AND pc.status = $1
+        """
+        
+        rows = await self.db.execute_query(query, CampaignStatus.START.value)
+        return {str(row['id']): row['config_updated_date'] for row in rows}
@@ -6,6 +6,7 @@ import asyncpg
 from asyncpg import Pool
 
 from app.models.db_models import DatabaseConfig
+from app.core.tracing import span, SPAN_KIND_CLIENT
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ class VBDatabaseClient:
             )
             logger.info("Database connection pool created successfully")
         except Exception as e:
-            logger.error(f"Failed to create database pool: {e}")
+            logger.error("Failed to create database pool: %s", e)
             raise
     
     async def disconnect(self) -> None:
@@ -52,43 +53,48 @@ class VBDatabaseClient:
         if not self.pool:
             raise RuntimeError("Database not connected")
         
-        async with self.pool.acquire() as conn:
-            try:
-                rows = await conn.fetch(query, *args)
-                return [dict(row) for row in rows]
-            except Exception as e:
-                logger.error(f"Query execution failed: {e}")
-                logger.error(f"Query: {query}")
-                logger.error(f"Args: {args}")
-                raise
+        with span("db.query", {"db.system": "postgresql", "db.statement": query}, kind=SPAN_KIND_CLIENT) as s:
+            async with self.pool.acquire() as conn:
+                try:
+                    rows = await conn.fetch(query, *args)
+                    if s:
+                        s.set_attribute("db.rows", len(rows))
+                    return [dict(row) for row in rows]
+                except Exception as e:
+                    logger.error("Query execution failed: %s", e)
+                    logger.error("Query: %s", query)
+                    logger.error("Args: %s", args)
+                    raise
     
     async def execute_command(self, query: str, *args) -> str:
         """Execute INSERT/UPDATE/DELETE command"""
         if not self.pool:
             raise RuntimeError("Database not connected")
         
-        async with self.pool.acquire() as conn:
-            try:
-                result = await conn.execute(query, *args)
-                return result
-            except Exception as e:
-                logger.error(f"Command execution failed: {e}")
-                logger.error(f"Query: {query}")
-                logger.error(f"Args: {args}")
-                raise
+        with span("db.command", {"db.system": "postgresql", "db.statement": query}, kind=SPAN_KIND_CLIENT):
+            async with self.pool.acquire() as conn:
+                try:
+                    result = await conn.execute(query, *args)
+                    return result
+                except Exception as e:
+                    logger.error("Command execution failed: %s", e)
+                    logger.error("Query: %s", query)
+                    logger.error("Args: %s", args)
+                    raise
     
     async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Execute query and return first result"""
         if not self.pool:
             raise RuntimeError("Database not connected")
         
-        async with self.pool.acquire() as conn:
-            try:
-                row = await conn.fetchrow(query, *args)
-                return dict(row) if row else None
-            except Exception as e:
-                logger.error(f"Fetch one failed: {e}")
-                raise
+        with span("db.fetch_one", {"db.system": "postgresql", "db.statement": query}, kind=SPAN_KIND_CLIENT):
+            async with self.pool.acquire() as conn:
+                try:
+                    row = await conn.fetchrow(query, *args)
+                    return dict(row) if row else None
+                except Exception as e:
+                    logger.error("Fetch one failed: %s", e)
+                    raise
 
 
 # Factory function to create database client
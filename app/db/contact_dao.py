@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
 from app.db.client import VBDatabaseClient
@@ -92,6 +92,31 @@ class ContactDataAccess:
         
         return await self.db.fetch_one(query, int(contact_id), int(campaign_id))
     
+    async def get_campaign_contact_phones(self, campaign_id: str, updated_since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get phone numbers of all PowerSubscribers in a campaign, optionally only rows changed since a timestamp"""
+        query = """
+        SELECT 
+            ps.id as subscriber_id,
+            ps.contact_id,
+            ps.campaign_id,
+            c.first_name,
+            c.last_name,
+            c.phone_number,
+            c.mobile,
+            c.city,
+            c.state,
+            c.status
+        FROM power_subscriber ps
+        JOIN dialer_contact c ON ps.contact_id = c.id
+        WHERE ps.campaign_id = $1
+        """
+        
+        if updated_since is None:
+            return await self.db.execute_query(query, int(campaign_id))
+        
+        query += "AND (c.updated_date > $2 OR ps.updated_date > $2)"
+        return await self.db.execute_query(query, int(campaign_id), updated_since)
+    
     async def update_contact_status(self, contact_id: str, status: int) -> bool:
         """Update contact status"""
         query = """
@@ -104,7 +129,7 @@ class ContactDataAccess:
             await self.db.execute_command(query, int(contact_id), status, datetime.now(timezone.utc))
             return True
         except Exception as e:
-            logger.error(f"Failed to update contact status: {e}")
+            logger.error("Failed to update contact status: %s", e)
             return False
     
     async def add_contact_opt_out(self, contact_id: str, campaign_id: str, reason: str) -> Optional[str]:
@@ -125,5 +150,5 @@ class ContactDataAccess:
             )
             return str(result['id']) if result else None
         except Exception as e:
-            logger.error(f"Failed to add contact opt-out: {e}")
+            logger.error("Failed to add contact opt-out: %s", e)
             return None 
\ No newline at end of file
@@ -85,5 +85,41 @@ class SurveyDataAccess:
             )
             return str(result['id']) if result else None
         except Exception as e:
-            logger.error(f"Failed to save survey response: {e}")
-            return None 
\ No newline at end of file
+            logger.error("Failed to save survey response: %s", e)
+            return None
+    
+    async def save_survey_responses(self, subscriber_id: str, responses: List[Dict[str, Any]]) -> List[str]:
+        """Save a call's survey responses in one statement.
+
+        Args:
+            subscriber_id: Subscriber who answered
+            responses: Dicts with question_id, choice_id and answer_text
+
+        Returns:
+            IDs of the saved responses, empty on failure
+        """
+        if not responses:
+            return []
+        
+        query = """
+        INSERT INTO survey_response (
+            powersubscriber_id, question_id, choice_id, answer_text, created_date
+        )
+        SELECT $1, r.question_id, r.choice_id, r.answer_text, $5
+        FROM unnest($2::int[], $3::int[], $4::text[]) AS r(question_id, choice_id, answer_text)
+        RETURNING id
+        """
+        
+        try:
+            rows = await self.db.execute_query(
+                query,
+                int(subscriber_id),
+                [int(r['question_id']) for r in responses],
+                [int(r['choice_id']) if r.get('choice_id') else None for r in responses],
+                [r.get('answer_text') for r in responses],
+                datetime.now(timezone.utc)
+            )
+            return [str(row['id']) for row in rows]
+        except Exception as e:
+            logger.error("Failed to save survey responses: %s", e)
+            return []
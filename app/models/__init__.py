@@ -1,7 +1,7 @@
 from app.models.base_models import (
     Session, FunctionHandler, FunctionSchema, FunctionCallItem,
     FunctionParameter, FunctionParameters, FunctionHandlerType,
-    TwilioStartMessage, TwilioMediaMessage, TwilioCloseMessage
+    TwilioStartMessage, TwilioMediaMessage, TwilioDtmfMessage, TwilioCloseMessage
 )
 
 from app.models.db_models import (
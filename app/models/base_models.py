@@ -1,8 +1,26 @@
-from typing import Optional, Dict, List, Any, Callable, Awaitable, Union
+import asyncio
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Callable, Awaitable, Union
 from pydantic import BaseModel, Field
 import websockets
 from fastapi import WebSocket
 
+if TYPE_CHECKING:
+    # Per-call state classes, for type checking only: importing the app
+    # packages at runtime loads session_manager, which imports this module
+    from app.audio.amd import AnsweringMachineDetector
+    from app.audio.recorder import CallRecorder
+    from app.audio.silence import SilenceGate
+    from app.audio.vad import EnergyBargeInDetector
+    from app.core.context_budget import ConversationContext
+    from app.core.event_recorder import EventRecorder
+    from app.core.survey_state import SurveyState
+    from app.core.tool_cache import ToolResultCache
+    from app.core.tool_output import ToolOutputStats
+    from app.core.tool_prefetch import FunctionCallPrefetcher
+    from app.core.tracing import Span, Trace
+    from app.core.turn_timing import TurnTimer
+    from app.services.greeting_cache import GreetingRecorder
+
 
 class FunctionParameter(BaseModel):
     type: str
@@ -35,7 +53,6 @@ class Session:
     which cannot be serialized.
     """
     twilio_conn: Optional[WebSocket] = None
-    frontend_conn: Optional[WebSocket] = None
     model_conn: Optional[websockets.WebSocketClientProtocol] = None
     stream_sid: Optional[str] = None
     saved_config: Optional[Any] = None
@@ -43,6 +60,31 @@ class Session:
     response_start_timestamp: Optional[int] = None
     latest_media_timestamp: Optional[int] = None
     openai_api_key: Optional[str] = None
+    caller_context: Optional[Dict[str, Any]] = None
+    tool_cache: Optional["ToolResultCache"] = None
+    tool_prefetcher: Optional["FunctionCallPrefetcher"] = None
+    tool_output_stats: Optional["ToolOutputStats"] = None
+    conversation_context: Optional["ConversationContext"] = None
+    turn_timer: Optional["TurnTimer"] = None
+    trace: Optional["Trace"] = None
+    call_span: Optional["Span"] = None
+    response_span: Optional["Span"] = None
+    event_recorder: Optional["EventRecorder"] = None
+    call_recorder: Optional["CallRecorder"] = None
+    local_playback: Optional[str] = None
+    greeting_played: Optional[str] = None
+    greeting_recorder: Optional["GreetingRecorder"] = None
+    conversation_settings: Optional[Dict[str, Any]] = None
+    playback_end_timestamp: Optional[int] = None
+    barge_in_detector: Optional["EnergyBargeInDetector"] = None
+    barge_in_reconcile: Optional[asyncio.Task] = None
+    barge_in_stats: Optional[Dict[str, int]] = None
+    silence_gate: Optional["SilenceGate"] = None
+    amd: Optional["AnsweringMachineDetector"] = None
+    amd_beep_wait: Optional[asyncio.Task] = None
+    survey_state: Optional["SurveyState"] = None
+    survey_loader: Optional[asyncio.Task] = None
+    suppress_response_audio: bool = False
 
 
 class TwilioStartMessage(BaseModel):
@@ -56,6 +98,12 @@ class TwilioMediaMessage(BaseModel):
     media: Dict[str, Any]
 
 
+class TwilioDtmfMessage(BaseModel):
+    event: str = "dtmf"
+    streamSid: str
+    dtmf: Dict[str, str]
+
+
 class TwilioCloseMessage(BaseModel):
     event: str = "close"
     streamSid: str
@@ -0,0 +1,139 @@
+"""Post-call conversation analytics off the event loop.
+
+At hangup the session hands the call's recording and interruption timeline
+to `call_analytics`. The recording is analysed in a process pool (see
+app.audio.call_metrics), so live calls on this worker never wait on it, and
+the results are saved to `call_analytics` in batches through the DAO layer.
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Set
+
+from app.audio.call_metrics import analyze_recording
+from app.core.metrics import registry
+from app.services.file_writer import file_writer
+from app.services.vb_system import get_vb_utilities
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Worker processes analysing recordings
+ANALYTICS_WORKERS = int(os.getenv("ANALYTICS_WORKERS", "1"))
+
+# Results saved per database write, and the longest a result waits for a full batch
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "20"))
+ANALYTICS_FLUSH_SECONDS = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "30"))
+
+analytics_jobs = registry.counter("callhub_analytics_jobs_total", "Post-call analytics jobs by outcome", ("outcome",))
+analytics_job_ms = registry.histogram("callhub_analytics_job_ms", "Worker time analysing one call's recording")
+analytics_wait_ms = registry.histogram("callhub_analytics_wait_ms", "Hangup to the start of a call's analysis")
+analytics_rows_saved = registry.counter("callhub_analytics_rows_saved_total", "Call analytics rows written to the database")
+
+
+class CallAnalytics:
+    """Queues recordings for analysis in worker processes and saves the results in batches"""
+
+    def __init__(
+        self,
+        workers: int = ANALYTICS_WORKERS,
+        batch_size: int = ANALYTICS_BATCH_SIZE,
+        flush_seconds: float = ANALYTICS_FLUSH_SECONDS,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._batch: List[Dict[str, Any]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # Jobs submitted and not yet analysed
+        self.pending = 0
+        registry.gauge("callhub_analytics_queue_depth", "Calls waiting for or in analysis",
+                       callback=lambda: self.pending)
+        registry.gauge("callhub_analytics_unsaved_rows", "Analysed calls waiting for the batch write",
+                       callback=lambda: len(self._batch))
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned, not forked: the server has logging and writer threads whose locks a fork could copy held
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def submit(self, path: str, fmt: str, interruptions_ms: List[int], call: Dict[str, Any]) -> None:
+        """Analyse a finished call's recording in the background.
+
+        Args:
+            path: Recording file; it is read once the file writer has finished it
+            fmt: Recording format, "wav" or "raw"
+            interruptions_ms: Media times at which the caller cut off assistant audio
+            call: IDs stored with the metrics: stream_sid, campaign_id, contact_id, subscriber_id
+        """
+        self.pending += 1
+        task = asyncio.create_task(self._analyze(path, fmt, interruptions_ms, call, time.monotonic()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _analyze(self, path: str, fmt: str, interruptions_ms: List[int], call: Dict[str, Any], submitted: float) -> None:
+        try:
+            await file_writer.drain()
+            loop = asyncio.get_running_loop()
+            metrics = await loop.run_in_executor(self._executor(), analyze_recording, path, fmt, interruptions_ms)
+        except Exception as e:
+            analytics_jobs.inc_labels("failed")
+            logger.error("Analytics of %s failed: %s", path, e)
+            return
+        finally:
+            self.pending -= 1
+
+        analysis_ms = metrics.pop("analysis_ms")
+        analytics_job_ms.observe(analysis_ms)
+        analytics_wait_ms.observe(max(0.0, (time.monotonic() - submitted) * 1000 - analysis_ms))
+        analytics_jobs.inc_labels("done")
+        logger.info("Call analytics for %s: %s", call.get("stream_sid"), metrics)
+
+        self._batch.append({**call, **metrics})
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_seconds, self._flush_soon)
+
+    def _flush_soon(self) -> None:
+        self._flush_timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Save the analysed calls waiting for a batch"""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._batch:
+            return
+        rows, self._batch = self._batch, []
+        try:
+            utils = await get_vb_utilities()
+            saved = await utils.analytics_dao.save_call_analytics(rows)
+        except Exception as e:
+            logger.error("Failed to save analytics for %d calls: %s", len(rows), e)
+            saved = 0
+        analytics_rows_saved.inc(saved)
+        if saved != len(rows):
+            logger.error("Call analytics not saved: %s", rows)
+
+    async def close(self) -> None:
+        """Finish queued jobs, save their results and stop the workers"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# Process-wide analytics queue
+call_analytics = CallAnalytics()
@@ -0,0 +1,266 @@
+"""In-memory phone number index for resolving callers to VB System contacts."""
+import re
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from app.models.db_models import SubscriberStatus
+from app.services.vb_system import get_vb_utilities
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How often the background task pulls changed contacts, in seconds
+CONTACT_INDEX_REFRESH_INTERVAL = 60
+
+# How often each campaign is reloaded in full, dropping subscribers removed from it
+CONTACT_INDEX_FULL_SYNC_INTERVAL = 3600
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Normalize a phone number to its digits, dropping the NANP country code.
+
+    Args:
+        phone: Phone number in any format (E.164, dashed, with parentheses...)
+
+    Returns:
+        Digits-only phone number, or an empty string if nothing usable was given
+    """
+    if not phone:
+        return ""
+    digits = re.sub(r"\D", "", str(phone))
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits
+
+
+@dataclass
+class ContactPhoneEntry:
+    """A campaign subscriber reachable at one or more phone numbers"""
+    subscriber_id: str
+    contact_id: str
+    campaign_id: str
+    first_name: str = ""
+    last_name: str = ""
+    city: str = ""
+    state: str = ""
+    phones: List[str] = field(default_factory=list)
+
+    def to_context(self) -> Dict[str, Any]:
+        """Caller context handed to the session"""
+        return {
+            "subscriber_id": self.subscriber_id,
+            "contact_id": self.contact_id,
+            "campaign_id": self.campaign_id,
+            "contact_name": f"{self.first_name} {self.last_name}".strip(),
+            "contact_city": self.city,
+            "contact_state": self.state,
+        }
+
+
+class ContactPhoneIndex:
+    """Normalized phone number -> campaign subscriber index.
+
+    Bulk-loaded per active AI campaign and kept current by pulling rows
+    changed since the previous sync, so lookups on the call path never
+    touch the database. Deleted rows never show up as changes, so each
+    campaign is also reloaded in full every `full_sync_interval` seconds.
+    The campaign's AI configuration and survey are cached alongside; the
+    survey is fetched again with the configuration and on each full reload.
+    """
+
+    def __init__(self, full_sync_interval: float = CONTACT_INDEX_FULL_SYNC_INTERVAL):
+        self.full_sync_interval = full_sync_interval
+        self._by_phone: Dict[str, Dict[str, ContactPhoneEntry]] = {}
+        self._by_subscriber: Dict[str, ContactPhoneEntry] = {}
+        self._campaigns: Dict[str, Dict[str, Any]] = {}
+        self._surveys: Dict[str, Dict[str, Any]] = {}
+        self._synced_at: Dict[str, datetime] = {}
+        self._full_synced_at: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._by_subscriber)
+
+    def lookup(self, phone: Optional[str], campaign_id: Optional[str] = None) -> Optional[ContactPhoneEntry]:
+        """Resolve a phone number to a subscriber.
+
+        Args:
+            phone: Caller phone number in any format
+            campaign_id: Preferred campaign when the number is in several
+
+        Returns:
+            The matching entry, or None if the number is unknown
+        """
+        entries = self._by_phone.get(normalize_phone(phone))
+        if not entries:
+            return None
+        if campaign_id:
+            for entry in entries.values():
+                if entry.campaign_id == str(campaign_id):
+                    return entry
+        return next(iter(entries.values()))
+
+    def get_campaign(self, campaign_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get the cached AI configuration of an indexed campaign"""
+        if not campaign_id:
+            return None
+        return self._campaigns.get(str(campaign_id))
+
+    def get_survey(self, campaign_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get the cached `get_survey_config` output of an indexed campaign"""
+        if not campaign_id:
+            return None
+        return self._surveys.get(str(campaign_id))
+
+    def upsert(self, row: Dict[str, Any]) -> None:
+        """Add or update a subscriber from a `get_campaign_contact_phones` row"""
+        subscriber_id = str(row['subscriber_id'])
+        self.discard(subscriber_id)
+
+        if row.get('status') == SubscriberStatus.OPTED_OUT.value:
+            return
+
+        phones = []
+        for value in (row.get('phone_number'), row.get('mobile')):
+            phone = normalize_phone(value)
+            if phone and phone not in phones:
+                phones.append(phone)
+        if not phones:
+            return
+
+        entry = ContactPhoneEntry(
+            subscriber_id=subscriber_id,
+            contact_id=str(row['contact_id']),
+            campaign_id=str(row['campaign_id']),
+            first_name=row.get('first_name') or "",
+            last_name=row.get('last_name') or "",
+            city=row.get('city') or "",
+            state=row.get('state') or "",
+            phones=phones,
+        )
+        self._by_subscriber[subscriber_id] = entry
+        for phone in phones:
+            self._by_phone.setdefault(phone, {})[subscriber_id] = entry
+
+    def discard(self, subscriber_id: str) -> None:
+        """Remove a subscriber from the index"""
+        entry = self._by_subscriber.pop(str(subscriber_id), None)
+        if not entry:
+            return
+        for phone in entry.phones:
+            entries = self._by_phone.get(phone)
+            if entries:
+                entries.pop(entry.subscriber_id, None)
+                if not entries:
+                    del self._by_phone[phone]
+
+    def discard_contact(self, contact_id: str, campaign_id: Optional[str] = None) -> None:
+        """Remove every subscriber of a contact, e.g. after an opt-out"""
+        for entry in list(self._by_subscriber.values()):
+            if entry.contact_id != str(contact_id):
+                continue
+            if campaign_id and entry.campaign_id != str(campaign_id):
+                continue
+            self.discard(entry.subscriber_id)
+
+    def drop_campaign(self, campaign_id: str) -> None:
+        """Remove a campaign and all of its subscribers"""
+        campaign_id = str(campaign_id)
+        for entry in list(self._by_subscriber.values()):
+            if entry.campaign_id == campaign_id:
+                self.discard(entry.subscriber_id)
+        self._campaigns.pop(campaign_id, None)
+        self._surveys.pop(campaign_id, None)
+        self._synced_at.pop(campaign_id, None)
+        self._full_synced_at.pop(campaign_id, None)
+
+    async def load_campaign(self, campaign_id: str, config_updated_date: Optional[datetime] = None) -> int:
+        """Load a campaign, or pull its changes if it was loaded recently.
+
+        A full load also drops the campaign's subscribers that are no longer returned.
+
+        Args:
+            campaign_id: Campaign to sync
+            config_updated_date: Last change to the campaign's AI configuration;
+                the configuration is fetched again when it differs from the cached one
+
+        Returns:
+            Number of subscriber rows applied
+        """
+        campaign_id = str(campaign_id)
+        utils = await get_vb_utilities()
+        since = self._synced_at.get(campaign_id)
+        started_at = datetime.now(timezone.utc)
+
+        cached = self._campaigns.get(campaign_id)
+        config_changed = since is None or not cached or cached.get("config_updated_date") != config_updated_date
+        if config_changed:
+            campaign = await utils.campaign_dao.get_campaign_with_ai_config(campaign_id)
+            if campaign:
+                self._campaigns[campaign_id] = campaign
+
+        full_synced_at = self._full_synced_at.get(campaign_id)
+        full = since is None or full_synced_at is None or \
+            (started_at - full_synced_at).total_seconds() >= self.full_sync_interval
+        if config_changed or full:
+            self._surveys[campaign_id] = await utils.get_survey_config(campaign_id)
+
+        rows = await utils.contact_dao.get_campaign_contact_phones(campaign_id, None if full else since)
+        for row in rows:
+            self.upsert(row)
+
+        if full:
+            current = {str(row['subscriber_id']) for row in rows}
+            for entry in list(self._by_subscriber.values()):
+                if entry.campaign_id == campaign_id and entry.subscriber_id not in current:
+                    self.discard(entry.subscriber_id)
+            self._full_synced_at[campaign_id] = started_at
+
+        self._synced_at[campaign_id] = started_at
+        return len(rows)
+
+    async def refresh(self) -> None:
+        """Sync all active AI campaigns and drop the ones that stopped"""
+        utils = await get_vb_utilities()
+        active = await utils.campaign_dao.get_active_ai_campaign_versions()
+
+        for campaign_id in list(self._synced_at):
+            if campaign_id not in active:
+                self.drop_campaign(campaign_id)
+
+        for campaign_id, config_updated_date in active.items():
+            try:
+                count = await self.load_campaign(campaign_id, config_updated_date)
+                if count:
+                    logger.info("Contact index synced %d rows for campaign %s", count, campaign_id)
+            except Exception as e:
+                logger.error("Failed to sync contact index for campaign %s: %s", campaign_id, e)
+
+    async def run_refresh_loop(self, interval: float = CONTACT_INDEX_REFRESH_INTERVAL) -> None:
+        """Keep the index in sync until cancelled"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Error refreshing contact index: %s", e)
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start the background sync on the running loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background sync and wait for it to end"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+# Process-wide index shared by all calls
+contact_index = ContactPhoneIndex()
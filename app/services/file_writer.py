@@ -0,0 +1,120 @@
+"""Append-only file writes on a background thread.
+
+Recorders hand over buffered chunks and return at once; one thread performs
+the writes in the order they were queued, so each file's chunks land in
+sequence and a slow disk never blocks the event loop.
+"""
+import os
+import queue
+import atexit
+import asyncio
+import logging
+import threading
+from typing import BinaryIO, Callable, Dict, Optional
+
+from app.core.metrics import registry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+file_writer_bytes = registry.counter("callhub_file_writer_bytes_total", "Bytes written by the background file writer")
+file_writer_errors = registry.counter("callhub_file_writer_errors_total", "Failed background file writes")
+
+
+class BackgroundFileWriter:
+    """Serializes appends, seeks and closes of many files onto one thread"""
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._files: Dict[str, BinaryIO] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Each counter is only updated by one thread
+        self.queued_bytes = 0
+        self.written_bytes = 0
+        registry.gauge("callhub_file_writer_pending_bytes", "Bytes queued for the background file writer",
+                       callback=lambda: self.queued_bytes - self.written_bytes)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+                    self._thread.start()
+
+    def write(self, path: str, data: bytes) -> None:
+        """Append `data` to `path`; the first write creates (or truncates) the file and its directory"""
+        self._ensure_thread()
+        self.queued_bytes += len(data)
+        self._queue.put((path, data, None))
+
+    def run(self, path: str, action: Callable[[BinaryIO], None]) -> None:
+        """Run `action` on the open file after the writes queued before it, e.g. to patch a header"""
+        self._ensure_thread()
+        self._queue.put((path, None, action))
+
+    def close(self, path: str) -> None:
+        """Close the file once everything queued for it is written"""
+        self._ensure_thread()
+        self._queue.put((path, None, None))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written; for tools and shutdown, not the event loop"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((None, None, lambda: done.set()))
+        return done.wait(timeout)
+
+    async def drain(self) -> None:
+        """Wait, without blocking the event loop, until everything queued so far is written"""
+        if self._thread is None:
+            return
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._queue.put((None, None, lambda: loop.call_soon_threadsafe(done.set_result, None)))
+        await done
+
+    def _open(self, path: str) -> BinaryIO:
+        f = self._files.get(path)
+        if f is None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            f = self._files[path] = open(path, "wb+")
+        return f
+
+    def _run(self) -> None:
+        while True:
+            path, data, action = self._queue.get()
+            try:
+                if path is None:
+                    action()
+                elif data is not None:
+                    self._open(path).write(data)
+                    self.written_bytes += len(data)
+                    file_writer_bytes.inc(len(data))
+                elif action is not None:
+                    f = self._open(path)
+                    f.flush()
+                    action(f)
+                    f.seek(0, os.SEEK_END)
+                else:
+                    f = self._files.pop(path, None)
+                    if f is not None:
+                        f.close()
+            except Exception as e:
+                file_writer_errors.inc()
+                logger.error("Background write to %s failed: %s", path, e)
+            if self._queue.empty():
+                # Idle: hand buffered data to the OS so a crash loses little
+                for f in self._files.values():
+                    try:
+                        f.flush()
+                    except Exception as e:
+                        logger.error("Flushing %s failed: %s", f.name, e)
+
+
+# Process-wide writer
+file_writer = BackgroundFileWriter()
+atexit.register(file_writer.wait, 5)
@@ -0,0 +1,106 @@
+"""Pre-encoded filler clips ("one sec...", "let me check") played while slow tools run."""
+import os
+import base64
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# 20 ms of 8 kHz G.711 mu-law audio, the frame size Twilio streams
+FRAME_BYTES = 160
+
+# Persona whose clips are used when the call's persona has none
+DEFAULT_PERSONA = "default"
+
+# Directory holding one sub-directory of raw mu-law clips (*.ulaw) per persona
+FILLER_AUDIO_DIR = os.getenv("FILLER_AUDIO_DIR", "audio/fillers")
+
+# Same layout, holding the messages left on answering machines
+VOICEMAIL_AUDIO_DIR = os.getenv("VOICEMAIL_AUDIO_DIR", "audio/voicemail")
+
+# How long a tool call may run before a filler clip is played, in seconds
+FILLER_DELAY_SECONDS = float(os.getenv("FILLER_DELAY_MS", "400")) / 1000
+
+
+def encode_frames(audio: bytes, frame_bytes: int = FRAME_BYTES) -> List[str]:
+    """Split raw mu-law audio into base64 media payloads ready for Twilio.
+
+    Args:
+        audio: Raw 8 kHz mu-law bytes
+        frame_bytes: Bytes per frame
+
+    Returns:
+        Base64 payload per frame
+    """
+    return [
+        base64.b64encode(audio[i:i + frame_bytes]).decode("ascii")
+        for i in range(0, len(audio), frame_bytes)
+    ]
+
+
+class FillerAudioLibrary:
+    """In-memory library of filler clips per persona, stored as encoded frames"""
+
+    def __init__(self):
+        self._clips: Dict[str, List[List[str]]] = {}
+        self._next: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(clips) for clips in self._clips.values())
+
+    def add_clip(self, persona: str, audio: bytes) -> None:
+        """Add a raw mu-law clip for a persona"""
+        if audio:
+            self._clips.setdefault(persona.lower(), []).append(encode_frames(audio))
+
+    def load(self, directory: str = FILLER_AUDIO_DIR) -> int:
+        """Load every `<persona>/*.ulaw` clip under a directory.
+
+        Args:
+            directory: Root directory of the clip library
+
+        Returns:
+            Number of clips loaded
+        """
+        root = Path(directory)
+        if not root.is_dir():
+            logger.info("No filler audio directory at %s", root)
+            return 0
+
+        loaded = 0
+        for persona_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            for clip_path in sorted(persona_dir.glob("*.ulaw")):
+                try:
+                    self.add_clip(persona_dir.name, clip_path.read_bytes())
+                    loaded += 1
+                except OSError as e:
+                    logger.error("Failed to load filler clip %s: %s", clip_path, e)
+        logger.info("Loaded %d filler clips from %s", loaded, root)
+        return loaded
+
+    def get_clip(self, persona: Optional[str] = None) -> Optional[List[str]]:
+        """Get the next clip for a persona, rotating through its clips.
+
+        Args:
+            persona: Persona name; falls back to the default persona
+
+        Returns:
+            Base64 frames of the clip, or None if no clip is available
+        """
+        key = (persona or DEFAULT_PERSONA).lower()
+        if key not in self._clips:
+            key = DEFAULT_PERSONA
+        clips = self._clips.get(key)
+        if not clips:
+            return None
+
+        index = self._next.get(key, 0)
+        self._next[key] = (index + 1) % len(clips)
+        return clips[index]
+
+
+# Process-wide clip libraries
+filler_library = FillerAudioLibrary()
+voicemail_library = FillerAudioLibrary()
@@ -0,0 +1,193 @@
+"""Cache of recorded opening greetings, played the moment a call starts."""
+import os
+import json
+import base64
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from app.services.filler_audio import encode_frames
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Directory holding `<key>.ulaw` audio and `<key>.json` transcript per greeting
+GREETING_CACHE_DIR = os.getenv("GREETING_CACHE_DIR", "audio/greetings")
+
+# Seconds of the opening line that are captured, as 8 kHz mu-law
+GREETING_MAX_SECONDS = float(os.getenv("GREETING_MAX_SECONDS", "6"))
+
+# Greetings kept; the least recently played are evicted, from memory and disk
+GREETING_CACHE_SIZE = int(os.getenv("GREETING_CACHE_SIZE", "200"))
+
+
+def greeting_key(persona: str, voice: str, prompt: str, campaign: str = "") -> str:
+    """Build the cache key of a greeting from what determines its content.
+
+    Only campaign-wide inputs belong in the key; caller details would give
+    every contact their own greeting.
+
+    Args:
+        persona: Persona name
+        voice: Realtime voice
+        prompt: Base instructions, without the caller context
+        campaign: Campaign ID and name
+
+    Returns:
+        Hex digest identifying the greeting
+    """
+    digest = hashlib.sha256(f"{persona}\n{voice}\n{campaign}\n{prompt}".encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+@dataclass
+class CachedGreeting:
+    """A greeting ready to stream to Twilio"""
+    frames: List[str]
+    transcript: str
+
+
+class GreetingRecorder:
+    """Captures the first seconds of the model's first response of a call as a cacheable greeting"""
+
+    def __init__(self, key: str, max_seconds: float = GREETING_MAX_SECONDS):
+        self.key = key
+        self.max_bytes = int(max_seconds * 8000)
+        self.audio = bytearray()
+        self.response_bytes = 0
+        self.transcript = ""
+        self.discarded = False
+
+    @property
+    def full(self) -> bool:
+        """Whether the first `max_seconds` of the greeting are captured"""
+        return len(self.audio) >= self.max_bytes
+
+    def add_delta(self, delta: Optional[str]) -> None:
+        """Append a `response.audio.delta` payload, up to `max_seconds` of audio"""
+        if self.discarded or not delta:
+            return
+        if self.full:
+            # Past the cap only the response length matters, for captured_transcript
+            self.response_bytes += len(delta) * 3 // 4
+            return
+        chunk = base64.b64decode(delta)
+        self.response_bytes += len(chunk)
+        self.audio.extend(chunk[:self.max_bytes - len(self.audio)])
+
+    def discard(self) -> None:
+        """Drop the capture, e.g. when the caller interrupted the greeting"""
+        self.discarded = True
+        self.audio = bytearray()
+
+    def captured_transcript(self) -> str:
+        """Transcript of the captured audio.
+
+        When the greeting ran past `max_seconds`, its words are cut in
+        proportion to the audio kept.
+        """
+        if len(self.audio) >= self.response_bytes:
+            return self.transcript
+        words = self.transcript.split()
+        return " ".join(words[:round(len(words) * len(self.audio) / self.response_bytes)])
+
+    def is_complete(self) -> bool:
+        """Check whether the capture holds an uninterrupted greeting"""
+        return not self.discarded and bool(self.audio) and bool(self.captured_transcript())
+
+
+class GreetingCache:
+    """Greetings keyed by persona, voice, campaign and prompt hash, in memory and on disk"""
+
+    def __init__(self, directory: str = GREETING_CACHE_DIR, max_size: int = GREETING_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        # Least recently played first
+        self._greetings: "OrderedDict[str, CachedGreeting]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._greetings)
+
+    def get(self, key: str) -> Optional[CachedGreeting]:
+        """Get a greeting from memory"""
+        greeting = self._greetings.get(key)
+        if greeting:
+            self._greetings.move_to_end(key)
+        return greeting
+
+    def load(self) -> int:
+        """Load the greetings stored on disk into memory, the newest `max_size` of them.
+
+        Older files beyond the cap are deleted.
+
+        Returns:
+            Number of greetings loaded
+        """
+        if not self.directory.is_dir():
+            return 0
+
+        paths = sorted(self.directory.glob("*.ulaw"), key=lambda p: p.stat().st_mtime)
+        excess = max(0, len(paths) - self.max_size)
+        for audio_path in paths[:excess]:
+            self._delete(audio_path.stem)
+        loaded = 0
+        for audio_path in paths[excess:]:
+            try:
+                meta = json.loads(audio_path.with_suffix(".json").read_text(encoding="utf-8"))
+                self._greetings[audio_path.stem] = CachedGreeting(
+                    frames=encode_frames(audio_path.read_bytes()),
+                    transcript=meta["transcript"],
+                )
+                loaded += 1
+            except (OSError, ValueError, KeyError) as e:
+                logger.error("Failed to load cached greeting %s: %s", audio_path, e)
+        logger.info("Loaded %d cached greetings from %s", loaded, self.directory)
+        return loaded
+
+    def _delete(self, key: str) -> None:
+        """Remove an evicted greeting from disk"""
+        for suffix in (".ulaw", ".json"):
+            try:
+                (self.directory / f"{key}{suffix}").unlink(missing_ok=True)
+            except OSError as e:
+                logger.error("Failed to delete cached greeting %s%s: %s", key, suffix, e)
+
+    def _write(self, key: str, audio: bytes, transcript: str, evicted: List[str]) -> None:
+        """Write a greeting to disk and delete the evicted ones (runs in an executor)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.ulaw").write_bytes(audio)
+        (self.directory / f"{key}.json").write_text(
+            json.dumps({"transcript": transcript}), encoding="utf-8"
+        )
+        for old in evicted:
+            self._delete(old)
+
+    async def save(self, recorder: GreetingRecorder) -> None:
+        """Store a completed capture in memory and, off the event loop, on disk"""
+        if not recorder.is_complete():
+            return
+
+        audio = bytes(recorder.audio)
+        transcript = recorder.captured_transcript()
+        self._greetings[recorder.key] = CachedGreeting(
+            frames=encode_frames(audio),
+            transcript=transcript,
+        )
+        self._greetings.move_to_end(recorder.key)
+        evicted = []
+        while len(self._greetings) > self.max_size:
+            evicted.append(self._greetings.popitem(last=False)[0])
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write, recorder.key, audio, transcript, evicted)
+            logger.info("Cached greeting %s (%d bytes)", recorder.key, len(audio))
+        except OSError as e:
+            logger.error("Failed to write cached greeting %s: %s", recorder.key, e)
+
+
+# Process-wide greeting cache
+greeting_cache = GreetingCache()
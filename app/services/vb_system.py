@@ -1,12 +1,15 @@
 import os
 import logging
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
 
 from app.db.client import VBDatabaseClient, create_vb_database_client
 from app.db.campaign_dao import CampaignDataAccess
 from app.db.contact_dao import ContactDataAccess
 from app.db.survey_dao import SurveyDataAccess
 from app.db.call_dao import CallDataAccess
+from app.db.analytics_dao import AnalyticsDataAccess
+from app.core.metrics import registry
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -21,6 +24,7 @@ class VBSystemUtilities:
         self.contact_dao = ContactDataAccess(db_client)
         self.survey_dao = SurveyDataAccess(db_client)
         self.call_dao = CallDataAccess(db_client)
+        self.analytics_dao = AnalyticsDataAccess(db_client)
     
     async def get_instruction(self, campaign_id: str) -> Dict[str, Any]:
         """Get AI agent instructions for a specific campaign"""
@@ -162,8 +166,38 @@ class VBSystemUtilities:
         }
 
 
+# Shared utilities instance so every caller reuses one connection pool
+_vb_utilities: Optional[VBSystemUtilities] = None
+_vb_utilities_lock: Optional[asyncio.Lock] = None
+
+
 # Utility function to get VB system utilities
 async def get_vb_utilities(database_url: str = None) -> VBSystemUtilities:
     """Get VB system utilities with initialized database client"""
-    client = await create_vb_database_client(database_url)
-    return VBSystemUtilities(client) 
\ No newline at end of file
+    global _vb_utilities, _vb_utilities_lock
+    if database_url:
+        client = await create_vb_database_client(database_url)
+        return VBSystemUtilities(client)
+    
+    if _vb_utilities_lock is None:
+        _vb_utilities_lock = asyncio.Lock()
+    async with _vb_utilities_lock:
+        if _vb_utilities is None:
+            client = await create_vb_database_client()
+            _vb_utilities = VBSystemUtilities(client)
+    return _vb_utilities
+
+
+def db_pool_usage() -> Dict[tuple, int]:
+    """Connection counts of the shared pool for `/metrics`"""
+    pool = _vb_utilities.db.pool if _vb_utilities else None
+    if not pool:
+        return {}
+    return {
+        ("size",): pool.get_size(),
+        ("idle",): pool.get_idle_size(),
+        ("max",): pool.get_max_size(),
+    }
+
+
+registry.gauge("callhub_db_pool_connections", "Shared database pool connections", ("state",), callback=db_pool_usage)
@@ -0,0 +1,80 @@
+"""Throughput benchmark for the app.audio codec and analysis helpers.
+
+Reports frames/sec on one core for 20 ms (160-sample) frames, both one frame
+per call (the live-call pattern) and in one-second batches.
+
+    python -m benchmarks.bench_audio [--seconds 1.0]
+"""
+import time
+import base64
+import argparse
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from app.audio import (
+    ulaw_decode, ulaw_encode, decode_base64, frame_rms, frame_energy,
+    resample, upsample, FRAME_SAMPLES, SAMPLE_RATE
+)
+
+# Frames in a one-second batch
+BATCH_FRAMES = SAMPLE_RATE // FRAME_SAMPLES
+
+
+def measure(fn: Callable[[], object], frames_per_call: int, seconds: float) -> float:
+    """Run `fn` repeatedly for about `seconds` and return frames processed per second"""
+    fn()  # warm up
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for _ in range(100):
+            fn()
+        calls += 100
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    return calls * frames_per_call / (now - start)
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object], int]]:
+    """Benchmark cases as (name, callable, frames per call)"""
+    rng = np.random.default_rng(0)
+    frame_ulaw = rng.integers(0, 256, FRAME_SAMPLES, dtype=np.uint8).tobytes()
+    frame_b64 = base64.b64encode(frame_ulaw).decode("ascii")
+    frame_pcm = ulaw_decode(frame_ulaw)
+    batch_ulaw = rng.integers(0, 256, FRAME_SAMPLES * BATCH_FRAMES, dtype=np.uint8).tobytes()
+    batch_pcm = ulaw_decode(batch_ulaw)
+
+    pcm_buffer = np.empty(FRAME_SAMPLES * BATCH_FRAMES, dtype=np.int16)
+    ulaw_buffer = np.empty(FRAME_SAMPLES * BATCH_FRAMES, dtype=np.uint8)
+
+    return [
+        ("decode (frame)", lambda: ulaw_decode(frame_ulaw, pcm_buffer), 1),
+        ("decode base64 (frame)", lambda: decode_base64(frame_b64, pcm_buffer), 1),
+        ("encode (frame)", lambda: ulaw_encode(frame_pcm, ulaw_buffer), 1),
+        ("frame rms (frame)", lambda: frame_rms(frame_pcm), 1),
+        ("decode + rms (frame)", lambda: frame_rms(decode_base64(frame_b64, pcm_buffer)), 1),
+        ("upsample x2 (frame)", lambda: upsample(frame_pcm, 2), 1),
+        ("upsample x3 (frame)", lambda: upsample(frame_pcm, 3), 1),
+        ("decode (1 s batch)", lambda: ulaw_decode(batch_ulaw, pcm_buffer), BATCH_FRAMES),
+        ("encode (1 s batch)", lambda: ulaw_encode(batch_pcm, ulaw_buffer), BATCH_FRAMES),
+        ("frame energy (1 s batch)", lambda: frame_energy(batch_pcm), BATCH_FRAMES),
+        ("resample 8k->16k (1 s batch)", lambda: resample(batch_pcm, SAMPLE_RATE, 16000), BATCH_FRAMES),
+        ("resample 8k->24k (1 s batch)", lambda: resample(batch_pcm, SAMPLE_RATE, 24000), BATCH_FRAMES),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent per case")
+    args = parser.parse_args()
+
+    print(f"{'case':<32}{'frames/sec/core':>18}{'us/frame':>12}")
+    for name, fn, frames_per_call in build_cases():
+        rate = measure(fn, frames_per_call, args.seconds)
+        print(f"{name:<32}{rate:>18,.0f}{1e6 / rate:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
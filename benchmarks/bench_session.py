@@ -0,0 +1,351 @@
+"""Microbenchmarks of the session manager hot paths.
+
+Runs the per-frame and per-event handlers against in-memory sockets and
+reports ops/sec, transient bytes allocated per op (tracemalloc peak) and
+bytes retained per op. Results are compared with a stored baseline, so a
+change to the per-frame cost shows up as a regression:
+
+    python -m benchmarks.bench_session [--seconds 1.0] [--save-baseline] [--check]
+
+`get_prompt` reads fixture rows by default. With --database-url it runs
+against a real database instead, for the given --campaign-id and --contact-id.
+"""
+import sys
+import json
+import asyncio
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.audio import encode_base64, FRAME_SAMPLES
+from app.audio.vad import EnergyBargeInDetector
+from app.audio.silence import SilenceGate
+from app.audio.amd import AnsweringMachineDetector
+from app.core import session_manager as sm
+from app.audio.recorder import CallRecorder
+from app.models import FunctionHandler
+from app.services.vb_system import VBSystemUtilities
+from app.db.client import create_vb_database_client
+
+BASELINE_PATH = Path(__file__).with_name("baselines") / "bench_session.json"
+
+# Ops per tracemalloc measurement
+ALLOCATION_OPS = 500
+
+# Campaign settings turning on every per-frame audio feature
+AUDIO_FEATURES = {
+    "barge_in": {"enabled": True},
+    "silence_suppression": {"enabled": True},
+    "amd": {"enabled": True},
+}
+
+CAMPAIGN_ROW = {
+    "campaign_id": 1,
+    "campaign_name": "Spring Survey",
+    "campaign_description": "Resident satisfaction survey",
+    "campaign_status": 1,
+    "is_ai_agent": True,
+    "user_id": 1,
+    "username": "ops",
+    "email": "ops@example.com",
+    "ai_config_id": 1,
+    "custom_instructions": "Keep each answer under two sentences. Offer to call back if the caller is busy.",
+    "system_prompt": (
+        "You are calling {contact_name} from {contact_city}, {contact_state} on behalf of {campaign_name}. "
+        "Introduce yourself, confirm you are speaking with {contact_name} and ask the survey questions in order. "
+    ) * 8,
+    "conversation_settings": json.dumps({"temperature": 0.7, "turn_detection": {"type": "server_vad"}}),
+    "persona_id": 1,
+    "persona_name": "Alex",
+    "voice_config": json.dumps({"voice": "ash"}),
+    "personality_traits": json.dumps({"tone": "friendly"}),
+    "behavior_settings": json.dumps({"interruptions": "allow"}),
+}
+
+CONTACT_ROW = {
+    "id": 1,
+    "first_name": "Jordan",
+    "last_name": "Lee",
+    "email": "jordan@example.com",
+    "phone_number": "+15555550100",
+    "mobile": None,
+    "status": 1,
+    "city": "Springfield",
+    "state": "IL",
+    "country": "US",
+    "zip_code": "62701",
+    "created_date": None,
+    "updated_date": None,
+    "additional_vars": json.dumps({"ward": "3"}),
+}
+
+
+class MemorySocket:
+    """Stands in for both the Twilio and the model WebSocket"""
+
+    open = True
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, message: str) -> None:
+        self.sent += 1
+
+    async def close(self) -> None:
+        self.open = False
+
+
+class FixtureDatabaseClient:
+    """Returns fixture rows the way asyncpg does, JSON columns as text"""
+
+    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        if "power_campaign" in query:
+            return dict(CAMPAIGN_ROW)
+        if "dialer_contact" in query:
+            return dict(CONTACT_ROW)
+        return None
+
+    async def execute_query(self, query: str, *args) -> List[Dict[str, Any]]:
+        return []
+
+
+async def bench_lookup(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Tool used by the function-call cases; returns a typical small record"""
+    return {"contact_id": args.get("contact_id"), "status": "active", "city": "Springfield", "attempts": 2}
+
+
+bench_tool = FunctionHandler(
+    schema={
+        "name": "bench_lookup",
+        "type": "function",
+        "description": "Benchmark tool",
+        "parameters": {"type": "object", "properties": {"contact_id": {"type": "string"}}, "required": []},
+    },
+    handler=bench_lookup,
+)
+
+
+async def start_call(settings: Optional[Dict[str, Any]] = None) -> Tuple[MemorySocket, MemorySocket]:
+    """Put the session in the state of a connected call.
+
+    The API key is left unset, so the start event does not dial the model;
+    in-memory sockets are attached afterwards.
+    """
+    sm.reset_session()
+    await sm.handle_twilio_message(json.dumps({
+        "event": "start",
+        "start": {"streamSid": "MZbench", "callSid": "CAbench", "customParameters": {"campaign_id": "1"}},
+    }))
+    session = sm.get_session()
+    if settings:
+        session.conversation_settings = settings
+        session.barge_in_detector = EnergyBargeInDetector.from_settings(settings)
+        session.silence_gate = SilenceGate.from_settings(settings)
+        session.amd = AnsweringMachineDetector.from_settings(settings)
+    twilio, model = MemorySocket(), MemorySocket()
+    session.twilio_conn = twilio
+    session.model_conn = model
+    return twilio, model
+
+
+def media_message(timestamp: int = 20) -> str:
+    rng = np.random.default_rng(0)
+    frame = (rng.normal(0, 2000, FRAME_SAMPLES)).astype(np.int16)
+    return json.dumps({
+        "event": "media", "streamSid": "MZbench",
+        "media": {"track": "inbound", "chunk": "1", "timestamp": str(timestamp), "payload": encode_base64(frame)},
+    })
+
+
+def audio_delta_message() -> str:
+    # 100 ms of assistant audio, a typical delta
+    delta = encode_base64(np.zeros(800, dtype=np.int16))
+    return json.dumps({"type": "response.audio.delta", "response_id": "resp_1", "item_id": "item_1", "delta": delta})
+
+
+def function_call_item() -> Dict[str, Any]:
+    return {
+        "id": "item_2", "type": "function_call", "name": "bench_lookup",
+        "call_id": "call_1", "arguments": json.dumps({"contact_id": "1"}),
+    }
+
+
+async def build_cases(args: argparse.Namespace) -> List[Tuple[str, Callable[[], Awaitable[Any]], Callable[[], Awaitable[Any]]]]:
+    """Benchmark cases as (name, setup, op)"""
+    if bench_tool not in sm.functions:
+        sm.functions.append(bench_tool)
+
+    media = media_message()
+    delta = audio_delta_message()
+    call_done = json.dumps({"type": "response.output_item.done", "response_id": "resp_1", "item": function_call_item()})
+    item = function_call_item()
+    twilio_media = {"event": "media", "streamSid": "MZbench", "media": {"payload": json.loads(delta)["delta"]}}
+
+    if args.database_url:
+        utils = VBSystemUtilities(await create_vb_database_client(args.database_url))
+    else:
+        utils = VBSystemUtilities(FixtureDatabaseClient())
+
+    async def twilio_media_op() -> None:
+        await sm.handle_twilio_message(media)
+
+    async def audio_delta_op() -> None:
+        await sm.handle_model_message(delta)
+
+    async def function_call_op() -> None:
+        await sm.handle_model_message(call_done)
+        # Let the cancelled filler task finish, as the live loop would
+        await asyncio.sleep(0)
+
+    async def json_send_op() -> None:
+        await sm.json_send(sm.get_session().twilio_conn, twilio_media)
+
+    async def dispatch_op() -> None:
+        await sm.handle_function_call(item)
+
+    async def get_prompt_op() -> None:
+        await utils.get_prompt(args.campaign_id, args.contact_id)
+
+    recording_dir = tempfile.mkdtemp(prefix="bench_recording_")
+    caller_payload = json.loads(media)["media"]["payload"]
+    recorder_clock = [0]
+
+    async def start_recording() -> None:
+        await start_call()
+        recorder_clock[0] = 0
+        sm.get_session().call_recorder = CallRecorder(f"{recording_dir}/MZbench.wav")
+
+    async def recorded_media_op() -> None:
+        # Timestamps advance as on a live call, so the recorder flushes once a second
+        recorder_clock[0] += 20
+        sm.get_session().call_recorder.add_caller(recorder_clock[0], caller_payload)
+
+    async def recorded_delta_op() -> None:
+        recorder = sm.get_session().call_recorder
+        await sm.handle_model_message(delta)
+        # Keep the assistant channel inside the window; the caller frame above covers flushing
+        recorder.clear_assistant(0)
+
+    return [
+        ("twilio media", start_call, twilio_media_op),
+        ("twilio media (audio features)", lambda: start_call(AUDIO_FEATURES), twilio_media_op),
+        ("model audio delta", start_call, audio_delta_op),
+        ("model function call", start_call, function_call_op),
+        ("json_send", start_call, json_send_op),
+        ("handle_function_call", start_call, dispatch_op),
+        ("get_prompt", start_call, get_prompt_op),
+        ("recorder caller frame", start_recording, recorded_media_op),
+        ("model audio delta (recording)", start_recording, recorded_delta_op),
+    ]
+
+
+async def measure(op: Callable[[], Awaitable[Any]], seconds: float) -> float:
+    """Run `op` repeatedly for about `seconds` and return ops per second"""
+    loop = asyncio.get_running_loop()
+    await op()  # warm up
+    ops = 0
+    start = loop.time()
+    deadline = start + seconds
+    while True:
+        for _ in range(100):
+            await op()
+        ops += 100
+        now = loop.time()
+        if now >= deadline:
+            break
+    return ops / (now - start)
+
+
+async def measure_allocations(op: Callable[[], Awaitable[Any]], ops: int = ALLOCATION_OPS) -> Tuple[float, float]:
+    """Bytes allocated and still held per op, from tracemalloc.
+
+    Returns:
+        (mean peak bytes above the pre-op level, bytes retained per op)
+    """
+    await op()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        transient = 0
+        for _ in range(ops):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await op()
+            _, peak = tracemalloc.get_traced_memory()
+            transient += peak - before
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return transient / ops, (end - start) / ops
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(result: Dict[str, float], baseline: Optional[Dict[str, float]], tolerance: float) -> Tuple[str, bool]:
+    """Change against the baseline, and whether it is a regression"""
+    if not baseline:
+        return "", False
+    speed = result["ops_per_sec"] / baseline["ops_per_sec"] - 1
+    alloc = result["alloc_bytes"] - baseline["alloc_bytes"]
+    regressed = speed < -tolerance or result["alloc_bytes"] > baseline["alloc_bytes"] * (1 + tolerance) + 64
+    return f"{speed:+.0%} ops, {alloc:+.0f} B", regressed
+
+
+async def run(args: argparse.Namespace) -> int:
+    baseline = load_baseline(args.baseline)
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+
+    print(f"{'case':<32}{'ops/sec':>12}{'us/op':>10}{'alloc B/op':>12}{'kept B/op':>11}  vs baseline")
+    for name, setup, op in await build_cases(args):
+        await setup()
+        rate = await measure(op, args.seconds)
+        await setup()
+        alloc, retained = await measure_allocations(op)
+        results[name] = {"ops_per_sec": round(rate, 1), "alloc_bytes": round(alloc), "retained_bytes": round(retained, 1)}
+        change, regressed = compare(results[name], baseline.get("cases", {}).get(name), args.tolerance)
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<32}{rate:>12,.0f}{1e6 / rate:>10.2f}{alloc:>12,.0f}{retained:>11,.1f}  {change}{'  REGRESSION' if regressed else ''}")
+    sm.reset_session()
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+            "cases": results,
+        }, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif baseline and baseline.get("python") != platform.python_version():
+        print(f"Baseline was recorded on Python {baseline.get('python')}; comparisons are approximate")
+
+    return 1 if args.check and regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent per case")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a case regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown or allocation growth")
+    parser.add_argument("--database-url", help="run get_prompt against this database instead of fixture rows")
+    parser.add_argument("--campaign-id", default="1")
+    parser.add_argument("--contact-id", default="1")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Local stand-in for the OpenAI Realtime API, for load tests.
+
+Speaks enough of the Realtime protocol to drive a call. It detects caller
+turns from the energy of the appended audio, like server VAD. It answers each
+turn with a response of mu-law audio deltas, and every Nth turn with a
+function call first.
+
+Each audio delta starts with a 4-byte sequence number. A load test in the
+same process can look up when that delta was sent, in `sent_at`, and when
+its turn ended, in `turn_ended_at`, to time the worker's relay.
+
+    python -m benchmarks.fake_realtime [--port 8765] [--response-delay-ms 300]
+"""
+import json
+import time
+import base64
+import asyncio
+import argparse
+import itertools
+from typing import Dict, Any, Optional
+
+import numpy as np
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from app.audio import decode_base64, rms
+
+# Caller frames louder than this RMS count as speech
+SPEECH_RMS = 500
+
+# Silence that ends a caller turn, as server VAD's silence_duration_ms
+SILENCE_MS = 500
+
+# Audio in each response.audio.delta
+DELTA_MS = 100
+DELTA_BYTES = DELTA_MS * 8
+
+
+class FakeRealtimeServer:
+    """Realtime API stand-in with configurable delays"""
+
+    def __init__(
+        self,
+        response_delay_ms: int = 300,
+        response_ms: int = 2000,
+        delta_interval_ms: int = 50,
+        function_call_every: int = 3,
+        function_name: str = "get_campaign_data",
+        function_arguments: Optional[Dict[str, Any]] = None,
+    ):
+        """Create the server.
+
+        Args:
+            response_delay_ms: End of caller speech to response.created
+            response_ms: Audio in each response
+            delta_interval_ms: Time between audio deltas; below DELTA_MS streams faster than real time, as the API does
+            function_call_every: Every Nth turn calls a function before answering; 0 never does
+            function_name: Function the model calls
+            function_arguments: Its arguments
+        """
+        self.response_delay = response_delay_ms / 1000
+        self.response_ms = response_ms
+        self.delta_interval = delta_interval_ms / 1000
+        self.function_call_every = function_call_every
+        self.function_name = function_name
+        self.function_arguments = function_arguments or {"campaign_id": "1"}
+        # delta sequence number -> perf_counter when sent
+        self.sent_at: Dict[int, float] = {}
+        # sequence number of a response's first delta -> perf_counter when its turn ended
+        self.turn_ended_at: Dict[int, float] = {}
+        self.stats = {"connections": 0, "turns": 0, "responses": 0, "function_calls": 0, "cancelled": 0}
+        self._sequence = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._server = None
+
+    def next_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids)}"
+
+    def next_delta(self) -> tuple:
+        """A delta payload tagged with a new sequence number"""
+        sequence = next(self._sequence)
+        payload = sequence.to_bytes(4, "big") + bytes([0xFF]) * (DELTA_BYTES - 4)
+        return sequence, base64.b64encode(payload).decode("ascii")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving and return the bound port"""
+        self._server = await websockets.serve(self.handle, host, port, max_size=None)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle(self, ws, path: str = "") -> None:
+        self.stats["connections"] += 1
+        await FakeRealtimeConnection(self, ws).run()
+
+
+class FakeRealtimeConnection:
+    """One model connection: caller VAD and the response in progress"""
+
+    def __init__(self, server: FakeRealtimeServer, ws):
+        self.server = server
+        self.ws = ws
+        self.samples = np.empty(8000, dtype=np.int16)
+        self.audio_ms = 0
+        self.speaking = False
+        self.silent_ms = 0
+        self.speech_item: Optional[str] = None
+        self.turns = 0
+        self.response: Optional[asyncio.Task] = None
+        # End of the turn whose function call awaits its output
+        self.pending_call: Optional[float] = None
+
+    async def send(self, event: Dict[str, Any]) -> None:
+        await self.ws.send(json.dumps(event))
+
+    async def run(self) -> None:
+        await self.send({"type": "session.created", "session": {"id": self.server.next_id("sess")}})
+        try:
+            async for message in self.ws:
+                await self.on_event(json.loads(message))
+        except ConnectionClosed:
+            pass
+        finally:
+            if self.response:
+                self.response.cancel()
+
+    async def on_event(self, event: Dict[str, Any]) -> None:
+        event_type = event.get("type")
+        if event_type == "input_audio_buffer.append":
+            await self.on_audio(event.get("audio", ""))
+        elif event_type == "session.update":
+            await self.send({"type": "session.updated", "session": event.get("session", {})})
+        elif event_type == "conversation.item.create":
+            item = event.get("item", {})
+            item.setdefault("id", self.server.next_id("item"))
+            await self.send({"type": "conversation.item.created", "item": item})
+        elif event_type == "response.create":
+            if self.pending_call is not None:
+                turn_ended, self.pending_call = self.pending_call, None
+                self.start_response(turn_ended, function_call=False)
+        elif event_type == "response.cancel":
+            self.cancel_response()
+
+    async def on_audio(self, payload: str) -> None:
+        pcm = decode_base64(payload, self.samples)
+        frame_ms = len(pcm) // 8
+        self.audio_ms += frame_ms
+        if rms(pcm) >= SPEECH_RMS:
+            self.silent_ms = 0
+            if not self.speaking:
+                self.speaking = True
+                self.speech_item = self.server.next_id("item")
+                self.cancel_response()
+                await self.send({
+                    "type": "input_audio_buffer.speech_started",
+                    "audio_start_ms": self.audio_ms, "item_id": self.speech_item,
+                })
+        elif self.speaking:
+            self.silent_ms += frame_ms
+            if self.silent_ms >= SILENCE_MS:
+                self.speaking = False
+                await self.end_turn()
+
+    async def end_turn(self) -> None:
+        self.turns += 1
+        self.server.stats["turns"] += 1
+        ended = time.perf_counter()
+        await self.send({
+            "type": "input_audio_buffer.speech_stopped", "audio_end_ms": self.audio_ms, "item_id": self.speech_item,
+        })
+        await self.send({"type": "input_audio_buffer.committed", "item_id": self.speech_item})
+        await self.send({"type": "conversation.item.created", "item": {
+            "id": self.speech_item, "type": "message", "role": "user",
+            "content": [{"type": "input_audio", "transcript": None}],
+        }})
+        every = self.server.function_call_every
+        self.start_response(ended, function_call=bool(every) and self.turns % every == 0)
+
+    def start_response(self, turn_ended: float, function_call: bool) -> None:
+        self.cancel_response()
+        self.response = asyncio.create_task(self.respond(turn_ended, function_call))
+
+    def cancel_response(self) -> None:
+        if self.response and not self.response.done():
+            self.response.cancel()
+            self.server.stats["cancelled"] += 1
+        self.response = None
+
+    async def respond(self, turn_ended: float, function_call: bool) -> None:
+        server = self.server
+        await asyncio.sleep(server.response_delay)
+        response_id = server.next_id("resp")
+        await self.send({"type": "response.created", "response": {"id": response_id, "status": "in_progress"}})
+        server.stats["responses"] += 1
+        try:
+            if function_call:
+                await self.call_function(response_id, turn_ended)
+            else:
+                await self.speak(response_id, turn_ended)
+        except asyncio.CancelledError:
+            await self.send({"type": "response.done", "response": {"id": response_id, "status": "cancelled"}})
+            raise
+        await self.send({"type": "response.done", "response": {
+            "id": response_id, "status": "completed", "usage": {"input_tokens": 120, "output_tokens": 40},
+        }})
+
+    async def call_function(self, response_id: str, turn_ended: float) -> None:
+        item_id = self.server.next_id("item")
+        call_id = self.server.next_id("call")
+        arguments = json.dumps(self.server.function_arguments)
+        item = {"id": item_id, "type": "function_call", "name": self.server.function_name, "call_id": call_id, "arguments": ""}
+        await self.send({"type": "response.output_item.added", "response_id": response_id, "item": item})
+        await self.send({
+            "type": "response.function_call_arguments.delta", "response_id": response_id,
+            "item_id": item_id, "call_id": call_id, "delta": arguments,
+        })
+        await self.send({"type": "response.output_item.done", "response_id": response_id, "item": {**item, "arguments": arguments}})
+        self.server.stats["function_calls"] += 1
+        # The answer follows the worker's function_call_output and response.create
+        self.pending_call = turn_ended
+
+    async def speak(self, response_id: str, turn_ended: float) -> None:
+        server = self.server
+        item_id = server.next_id("item")
+        await self.send({"type": "response.output_item.added", "response_id": response_id, "item": {
+            "id": item_id, "type": "message", "role": "assistant", "content": [],
+        }})
+        await self.send({"type": "conversation.item.created", "item": {"id": item_id, "type": "message", "role": "assistant"}})
+        for index in range(max(1, server.response_ms // DELTA_MS)):
+            sequence, delta = server.next_delta()
+            now = time.perf_counter()
+            server.sent_at[sequence] = now
+            if index == 0:
+                server.turn_ended_at[sequence] = turn_ended
+            await self.send({"type": "response.audio.delta", "response_id": response_id, "item_id": item_id, "delta": delta})
+            await asyncio.sleep(server.delta_interval)
+        await self.send({"type": "response.audio.done", "response_id": response_id, "item_id": item_id})
+        await self.send({
+            "type": "response.audio_transcript.done", "response_id": response_id,
+            "item_id": item_id, "transcript": "Thanks, let me note that down.",
+        })
+        await self.send({"type": "response.output_item.done", "response_id": response_id, "item": {
+            "id": item_id, "type": "message", "role": "assistant", "status": "completed",
+        }})
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shaping the fake model's behaviour, shared with the load test"""
+    parser.add_argument("--response-delay-ms", type=int, default=300, help="end of caller speech to response.created")
+    parser.add_argument("--response-ms", type=int, default=2000, help="audio per response")
+    parser.add_argument("--delta-interval-ms", type=int, default=50, help="time between 100 ms audio deltas")
+    parser.add_argument("--function-call-every", type=int, default=3, help="every Nth turn calls a function; 0 never")
+    parser.add_argument("--function-name", default="get_campaign_data")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    return parser
+
+
+def server_from_args(args: argparse.Namespace) -> FakeRealtimeServer:
+    return FakeRealtimeServer(
+        response_delay_ms=args.response_delay_ms,
+        response_ms=args.response_ms,
+        delta_interval_ms=args.delta_interval_ms,
+        function_call_every=args.function_call_every,
+        function_name=args.function_name,
+    )
+
+
+async def serve_forever(args: argparse.Namespace) -> None:
+    server = server_from_args(args)
+    port = await server.start(args.host, args.port)
+    print(f"Fake Realtime API on ws://{args.host}:{port}/v1/realtime")
+    await asyncio.Future()
+
+
+def main() -> None:
+    try:
+        asyncio.run(serve_forever(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""Load test: simulated Twilio callers against a worker's `/call` endpoint.
+
+Runs a fake Realtime API (benchmarks.fake_realtime) in this process and
+opens N calls that stream paced 20 ms mu-law frames, alternating speech and
+silence, as Twilio does. It reports how many calls the worker held, the
+relay latency of assistant audio frames (fake model to caller) and of whole
+turns, and the worker's CPU and memory per call.
+
+With --spawn the worker is started here, pointed at the fake server through
+OPENAI_REALTIME_URL. Otherwise start it with that variable set and pass its
+--url and --pid:
+
+    python -m benchmarks.load_test --spawn --calls 10 --duration 30
+    OPENAI_REALTIME_URL=ws://127.0.0.1:8765/v1/realtime uvicorn main:app --port 8081
+    python -m benchmarks.load_test --url ws://127.0.0.1:8081/call --pid <worker pid> --fake-port 8765
+"""
+import os
+import sys
+import json
+import time
+import base64
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from app.audio import encode_base64, FRAME_SAMPLES, SAMPLE_RATE
+from app.core.metrics import percentile
+from benchmarks.fake_realtime import FakeRealtimeServer, add_server_arguments, server_from_args
+
+# Seconds between samples of the worker's CPU time and memory
+SAMPLE_INTERVAL = 1.0
+
+FRAME_SECONDS = FRAME_SAMPLES / SAMPLE_RATE
+
+
+def caller_frames(talk_ms: int, listen_ms: int, seed: int = 0) -> List[str]:
+    """One talk/listen cycle of caller audio as base64 mu-law frames.
+
+    Talking is a few voiced harmonics with a syllable-rate envelope plus
+    noise; listening is line noise well below the speech threshold.
+    """
+    rng = np.random.default_rng(seed)
+    talk = int(talk_ms * SAMPLE_RATE / 1000)
+    listen = int(listen_ms * SAMPLE_RATE / 1000)
+    t = np.arange(talk) / SAMPLE_RATE
+    voiced = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((140, 280, 420, 700)))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    speech = 6000 * envelope * voiced + rng.normal(0, 300, talk)
+    silence = rng.normal(0, 30, listen)
+    pcm = np.clip(np.concatenate([speech, silence]), -32768, 32767).astype(np.int16)
+    count = len(pcm) // FRAME_SAMPLES
+    return [encode_base64(pcm[i * FRAME_SAMPLES:(i + 1) * FRAME_SAMPLES]) for i in range(count)]
+
+
+class CallResult:
+    """What one simulated call saw"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.connected = False
+        self.completed = False
+        self.error: Optional[str] = None
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.clears = 0
+        self.frame_latency_ms: List[float] = []
+        self.turn_latency_ms: List[float] = []
+        # How late this harness sent frames; large values mean the harness, not the worker, is overloaded
+        self.send_lag_ms: List[float] = []
+
+
+class SimulatedCaller:
+    """One Twilio media stream: paced inbound frames, outbound frames timed against the fake model"""
+
+    def __init__(self, index: int, url: str, duration: float, frames: List[str], server: FakeRealtimeServer, campaign_id: str):
+        self.url = url
+        self.duration = duration
+        self.frames = frames
+        self.server = server
+        self.campaign_id = campaign_id
+        self.stream_sid = f"MZload{index:05d}"
+        self.result = CallResult(index)
+
+    async def run(self) -> CallResult:
+        result = self.result
+        try:
+            async with websockets.connect(self.url, max_size=None) as ws:
+                result.connected = True
+                await ws.send(json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"}))
+                await ws.send(json.dumps({"event": "start", "sequenceNumber": "1", "streamSid": self.stream_sid, "start": {
+                    "streamSid": self.stream_sid,
+                    "callSid": f"CAload{result.index:05d}",
+                    "accountSid": "ACload",
+                    "tracks": ["inbound"],
+                    "customParameters": {"campaign_id": self.campaign_id},
+                    "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": SAMPLE_RATE, "channels": 1},
+                }}))
+                receiver = asyncio.create_task(self.receive(ws))
+                try:
+                    await self.send_media(ws)
+                    result.completed = not receiver.done()
+                    await ws.send(json.dumps({"event": "stop", "streamSid": self.stream_sid}))
+                finally:
+                    receiver.cancel()
+        except (OSError, ConnectionClosed) as e:
+            result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    async def send_media(self, ws) -> None:
+        result = self.result
+        count = int(self.duration / FRAME_SECONDS)
+        start = time.perf_counter()
+        for i in range(count):
+            due = start + i * FRAME_SECONDS
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                result.send_lag_ms.append(-delay * 1000)
+            await ws.send(json.dumps({"event": "media", "sequenceNumber": str(i + 2), "streamSid": self.stream_sid, "media": {
+                "track": "inbound", "chunk": str(i + 1), "timestamp": str(i * 20),
+                "payload": self.frames[i % len(self.frames)],
+            }}))
+            result.frames_sent += 1
+
+    async def receive(self, ws) -> None:
+        result = self.result
+        sent_at = self.server.sent_at
+        turn_ended_at = self.server.turn_ended_at
+        async for message in ws:
+            now = time.perf_counter()
+            msg = json.loads(message)
+            event = msg.get("event")
+            if event == "media":
+                result.frames_received += 1
+                sequence = delta_sequence(msg.get("media", {}).get("payload", ""))
+                sent = sent_at.pop(sequence, None)
+                if sent is not None:
+                    result.frame_latency_ms.append((now - sent) * 1000)
+                ended = turn_ended_at.pop(sequence, None)
+                if ended is not None:
+                    result.turn_latency_ms.append((now - ended) * 1000)
+            elif event == "mark":
+                # Twilio acknowledges a mark once the audio before it has played
+                await ws.send(json.dumps({"event": "mark", "streamSid": self.stream_sid, "mark": msg.get("mark", {})}))
+            elif event == "clear":
+                result.clears += 1
+
+
+def delta_sequence(payload: str) -> Optional[int]:
+    """Sequence number the fake server put in the first 4 bytes of a delta"""
+    try:
+        return int.from_bytes(base64.b64decode(payload[:8])[:4], "big")
+    except Exception:
+        return None
+
+
+class ProcessSampler:
+    """Samples a process's CPU time and resident memory from /proc"""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+        self.samples: List[Dict[str, float]] = []
+
+    def read(self) -> Optional[Dict[str, float]]:
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{self.pid}/status") as f:
+                rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except (OSError, StopIteration, ValueError):
+            return None
+        # utime and stime are fields 14 and 15 of stat, 12 and 13 after the command name
+        cpu = (int(fields[11]) + int(fields[12])) / self.ticks
+        return {"time": time.perf_counter(), "cpu": cpu, "rss_mb": rss_kb / 1024}
+
+    async def run(self, active: Dict[str, int]) -> None:
+        while True:
+            sample = self.read()
+            if sample:
+                sample["calls"] = active["calls"]
+                self.samples.append(sample)
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    def summary(self, baseline: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """CPU and memory at peak concurrency, overall and per call"""
+        if not baseline or len(self.samples) < 2:
+            return {}
+        peak_calls = max(s["calls"] for s in self.samples)
+        steady = [s for s in self.samples if s["calls"] == peak_calls and peak_calls > 0]
+        summary: Dict[str, Any] = {
+            "baseline_rss_mb": round(baseline["rss_mb"], 1),
+            "peak_rss_mb": round(max(s["rss_mb"] for s in self.samples), 1),
+            "peak_calls": peak_calls,
+        }
+        if len(steady) >= 2:
+            cpu_percent = (steady[-1]["cpu"] - steady[0]["cpu"]) / (steady[-1]["time"] - steady[0]["time"]) * 100
+            summary["cpu_percent"] = round(cpu_percent, 1)
+            summary["cpu_percent_per_call"] = round(cpu_percent / peak_calls, 2)
+            summary["rss_mb_per_call"] = round((max(s["rss_mb"] for s in steady) - baseline["rss_mb"]) / peak_calls, 2)
+            if cpu_percent > 0:
+                # Calls one core could carry before the worker is CPU bound
+                summary["calls_per_core"] = int(100 / (cpu_percent / peak_calls))
+        return summary
+
+
+def spawn_worker(port: int, realtime_url: str) -> subprocess.Popen:
+    """Start `main:app` under uvicorn, pointed at the fake Realtime server"""
+    env = {
+        **os.environ,
+        "OPENAI_REALTIME_URL": realtime_url,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "load-test"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Worker did not listen on port {port} within {timeout:.0f} s")
+
+
+def describe(values: List[float]) -> str:
+    if not values:
+        return "n/a"
+    return " / ".join(f"{percentile(values, p):.1f}" for p in (0.5, 0.95, 0.99)) + f" (n={len(values)})"
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    server = server_from_args(args)
+    fake_port = await server.start("127.0.0.1", args.fake_port)
+    realtime_url = f"ws://127.0.0.1:{fake_port}/v1/realtime"
+
+    worker = None
+    pid = args.pid
+    url = args.url
+    if args.spawn:
+        worker = spawn_worker(args.worker_port, realtime_url)
+        pid = worker.pid
+        url = f"ws://127.0.0.1:{args.worker_port}/call"
+        await wait_for_port(args.worker_port)
+
+    sampler = ProcessSampler(pid) if pid else None
+    baseline = sampler.read() if sampler else None
+    active = {"calls": 0}
+    sampling = asyncio.create_task(sampler.run(active)) if sampler else None
+    frames = caller_frames(args.talk_ms, args.listen_ms)
+
+    async def one_call(index: int) -> CallResult:
+        await asyncio.sleep(index * args.ramp / max(1, args.calls))
+        caller = SimulatedCaller(index, url, args.duration, frames, server, args.campaign_id)
+        active["calls"] += 1
+        try:
+            return await caller.run()
+        finally:
+            active["calls"] -= 1
+
+    try:
+        results = await asyncio.gather(*(one_call(i) for i in range(args.calls)))
+    finally:
+        if sampling:
+            sampling.cancel()
+        await server.stop()
+        if worker:
+            worker.terminate()
+            worker.wait(timeout=10)
+
+    frame_latency = [v for r in results for v in r.frame_latency_ms]
+    turn_latency = [v for r in results for v in r.turn_latency_ms]
+    send_lag = [v for r in results for v in r.send_lag_ms]
+    return {
+        "calls": args.calls,
+        "connected": sum(r.connected for r in results),
+        "completed": sum(r.completed for r in results),
+        "errors": sorted({r.error for r in results if r.error}),
+        "frames_sent": sum(r.frames_sent for r in results),
+        "frames_received": sum(r.frames_received for r in results),
+        "frame_latency_ms": describe(frame_latency),
+        "turn_latency_ms": describe(turn_latency),
+        "harness_send_lag_ms": describe(send_lag),
+        "fake_model": server.stats,
+        "worker": sampler.summary(baseline) if sampler else {},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10, help="concurrent calls")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of audio each call streams")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which calls are started")
+    parser.add_argument("--talk-ms", type=int, default=1500, help="caller speech per turn")
+    parser.add_argument("--listen-ms", type=int, default=3000, help="caller silence after each turn")
+    parser.add_argument("--campaign-id", default="1")
+    parser.add_argument("--fake-port", type=int, default=0, help="port of the fake Realtime API; 0 picks one")
+    parser.add_argument("--spawn", action="store_true", help="start the worker with uvicorn")
+    parser.add_argument("--worker-port", type=int, default=8091, help="port of a spawned worker")
+    parser.add_argument("--url", default="ws://127.0.0.1:8081/call", help="`/call` of a running worker")
+    parser.add_argument("--pid", type=int, help="pid of a running worker, for CPU and memory")
+    parser.add_argument("--json", help="also write the report to this file")
+    add_server_arguments(parser)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = asyncio.run(run_load_test(args))
+
+    print(f"calls held to the end   {report['completed']}/{report['calls']} ({report['connected']} connected)")
+    for error in report["errors"]:
+        print(f"  error: {error}")
+    print(f"frames sent/received    {report['frames_sent']:,} / {report['frames_received']:,}")
+    print(f"frame latency ms        {report['frame_latency_ms']}   p50 / p95 / p99")
+    print(f"turn latency ms         {report['turn_latency_ms']}   speech end to first frame")
+    print(f"harness send lag ms     {report['harness_send_lag_ms']}")
+    print(f"fake model              {report['fake_model']}")
+    for key, value in report["worker"].items():
+        print(f"worker {key:<17}{value}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Replay a recorded call through the session pipeline.
+
+Feeds a recording from app.core.event_recorder back through
+`handle_twilio_message` and `handle_model_message`, in recorded order, against
+in-memory sockets. Tool results come from the recording, so no database or
+model connection is needed. Run in real time to reproduce a call, or as fast
+as possible to use production calls as throughput benchmarks:
+
+    python -m benchmarks.replay recordings/events/MZ123.chev [--speed 1.0 | --fast] [--repeat 5]
+"""
+import sys
+import json
+import asyncio
+import argparse
+from typing import Dict, Any, List, Tuple
+
+import orjson
+
+from app.core import session_manager as sm
+from app.core.event_recorder import read_recording, METADATA, TWILIO, MODEL, TOOL
+from benchmarks.bench_session import MemorySocket
+
+
+def load(path: str) -> Tuple[Dict[str, Any], List[Tuple[float, int, bytes]], Dict[str, str]]:
+    """Split a recording into metadata, the events to replay and tool outputs by call ID"""
+    metadata: Dict[str, Any] = {}
+    events = []
+    tool_outputs: Dict[str, str] = {}
+    for offset, source, payload in read_recording(path):
+        if source == METADATA:
+            metadata = orjson.loads(payload)
+        elif source == TOOL:
+            result = orjson.loads(payload)
+            tool_outputs[result.get("call_id")] = result.get("output")
+        elif source in (TWILIO, MODEL):
+            events.append((offset, source, payload))
+    return metadata, events, tool_outputs
+
+
+def install(metadata: Dict[str, Any], tool_outputs: Dict[str, str]) -> None:
+    """Make the session resolve the recorded caller and settings and serve recorded tool results"""
+    settings = dict(metadata.get("conversation_settings") or {})
+    # Replaying must not record the call again
+    settings.pop("event_recording", None)
+
+    async def recorded_function_call(item: Dict[str, Any]) -> str:
+        output = tool_outputs.get(item.get("call_id"))
+        if output is None:
+            return json.dumps({"error": f"No recorded output for {item.get('name')} ({item.get('call_id')})"})
+        return output
+
+    sm.resolve_caller = lambda start: metadata.get("caller_context")
+    sm.load_conversation_settings = lambda start: settings
+    sm.handle_function_call = recorded_function_call
+
+
+async def replay(events: List[Tuple[float, int, bytes]], speed: float) -> Dict[str, Any]:
+    """Replay the events once.
+
+    Args:
+        events: (offset, source, payload) in recorded order
+        speed: Playback speed relative to the recording; 0 runs as fast as possible
+    """
+    sm.reset_session()
+    session = sm.get_session()
+    twilio, model = MemorySocket(), MemorySocket()
+    session.twilio_conn = twilio
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for offset, source, payload in events:
+        if speed > 0:
+            delay = start + offset / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        data = payload.decode()
+        if source == TWILIO:
+            await sm.handle_twilio_message(data)
+            session = sm.get_session()
+            if session.stream_sid and session.model_conn is None:
+                # The start event has been handled; attach the stand-in model
+                session.twilio_conn = twilio
+                session.model_conn = model
+        else:
+            await sm.handle_model_message(data)
+        if speed <= 0:
+            # Let tasks the handlers started run, as the live loop would between messages
+            await asyncio.sleep(0)
+    elapsed = loop.time() - start
+
+    summary = sm.build_call_summary() if sm.get_session().stream_sid else {}
+    sm.reset_session()
+    return {
+        "events": len(events),
+        "elapsed": elapsed,
+        "events_per_sec": len(events) / elapsed if elapsed > 0 else 0.0,
+        "sent_to_twilio": twilio.sent,
+        "sent_to_model": model.sent,
+        "summary": summary,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    metadata, events, tool_outputs = load(args.recording)
+    install(metadata, tool_outputs)
+    speed = 0.0 if args.fast else args.speed
+    recorded = events[-1][0] if events else 0.0
+    print(f"Call {metadata.get('stream_sid')}: {len(events)} events over {recorded:.1f} s, {len(tool_outputs)} tool results")
+
+    results = []
+    for _ in range(args.repeat):
+        results.append(await replay(events, speed))
+    best = max(results, key=lambda r: r["events_per_sec"])
+    print(f"replayed in {best['elapsed']:.3f} s ({best['events_per_sec']:,.0f} events/sec, best of {len(results)})")
+    print(f"sent to Twilio {best['sent_to_twilio']}, to the model {best['sent_to_model']}")
+    if args.summary:
+        print(json.dumps(best["summary"], indent=2, default=str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="recording file (.chev)")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed relative to the recording")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    parser.add_argument("--repeat", type=int, default=1, help="replays; the fastest is reported")
+    parser.add_argument("--summary", action="store_true", help="print the replayed call summary")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except ValueError as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
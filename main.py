@@ -7,12 +7,18 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import router
 from app.core import set_openai_api_key
+from app.core.loop_monitor import loop_monitor
+from app.core.logging_config import configure_logging
+from app.services.contact_index import contact_index
+from app.services.filler_audio import filler_library, voicemail_library, VOICEMAIL_AUDIO_DIR
+from app.services.greeting_cache import greeting_cache
+from app.services.call_analytics import call_analytics
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Configure logging: queued, written as JSON lines by a background thread
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Get environment variables
@@ -49,6 +55,37 @@ app.add_middleware(
 # Include API router
 app.include_router(router)
 
+# Load the filler clips played while slow tools run, the voicemail messages
+# and the cached greetings
+filler_library.load()
+voicemail_library.load(VOICEMAIL_AUDIO_DIR)
+greeting_cache.load()
+
+
+@app.on_event("startup")
+async def start_loop_monitor() -> None:
+    """Probe event-loop lag for `/metrics`."""
+    loop_monitor.start()
+
+
+@app.on_event("startup")
+async def start_contact_index() -> None:
+    """Bulk-load the caller phone index in the background and keep it in sync."""
+    if VB_DATABASE_URL:
+        contact_index.start()
+
+
+@app.on_event("shutdown")
+async def stop_contact_index() -> None:
+    """Stop the contact index sync."""
+    await contact_index.stop()
+
+
+@app.on_event("shutdown")
+async def stop_call_analytics() -> None:
+    """Finish the queued post-call analytics and save the last batch."""
+    await call_analytics.close()
+
 
 def run_server() -> None:
     """Entry point for the script defined in pyproject.toml."""
@@ -0,0 +1,53 @@
+"""Shared test setup.
+
+app.core is imported first: the DB and service modules import it while they
+initialize, so importing one of them first runs into a circular import.
+"""
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pytest
+
+import app.core  # noqa: F401
+from app.core import session_manager as sm
+from models import Session
+
+
+class FakeSocket:
+    """Stands in for the Twilio and Realtime WebSockets, keeping what was sent"""
+    open = True
+
+    def __init__(self) -> None:
+        self.sent: List[str] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+    async def close(self) -> None:
+        self.open = False
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Sent messages, parsed"""
+        return [json.loads(message) for message in self.sent]
+
+
+async def _start_call(custom_parameters: Optional[Dict[str, Any]] = None) -> Session:
+    sm.reset_session()
+    await sm.handle_twilio_message(json.dumps({
+        "event": "start",
+        "start": {"streamSid": "MZtest", "callSid": "CAtest", "customParameters": custom_parameters or {}},
+    }))
+    session = sm.get_session()
+    session.twilio_conn = FakeSocket()
+    session.model_conn = FakeSocket()
+    return session
+
+
+@pytest.fixture
+def start_call() -> Iterator[Callable]:
+    """Coroutine function that starts a call on fake Twilio and model sockets.
+
+    Await it inside the test's event loop; the session is reset afterwards.
+    """
+    yield _start_call
+    sm.reset_session()
@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.audio.amd import AnsweringMachineDetector, HUMAN, MACHINE, UNKNOWN, BEEP
+
+SILENCE = np.zeros(160, dtype=np.int16)
+# Broadband noise stands in for speech; a pure tone would read as a beep
+SPEECH = np.random.default_rng(0).normal(0, 3000, 160).astype(np.int16)
+TONE = (8000 * np.sin(2 * np.pi * 1000 * np.arange(160) / 8000)).astype(np.int16)
+
+
+def feed(detector: AnsweringMachineDetector, frames: int, samples: np.ndarray) -> list:
+    return [event for event in (detector.process(samples) for _ in range(frames)) if event]
+
+
+def test_short_greeting_then_silence_is_human():
+    detector = AnsweringMachineDetector()
+    assert feed(detector, 25, SPEECH) == []
+    # 800 ms of silence after a 500 ms "Hello?"
+    assert feed(detector, 40, SILENCE) == [HUMAN]
+    assert detector.stats() == {"verdict": HUMAN, "reason": "short_greeting", "decided_ms": 1300.0, "beep": False}
+
+
+def test_long_greeting_is_machine_and_beep_follows():
+    detector = AnsweringMachineDetector()
+    assert feed(detector, 125, SPEECH) == [MACHINE]
+    assert detector.reason == "long_greeting"
+    assert feed(detector, 10, TONE) == [BEEP]
+    assert detector.beep_detected
+    # Nothing is reported once the beep is heard
+    assert feed(detector, 10, SPEECH) == []
+
+
+def test_beep_before_verdict_is_machine():
+    detector = AnsweringMachineDetector()
+    assert feed(detector, 10, TONE) == [MACHINE]
+    assert detector.reason == "beep"
+
+
+def test_silence_times_out_as_unknown():
+    detector = AnsweringMachineDetector(analysis_ms=1000)
+    assert feed(detector, 60, SILENCE) == [UNKNOWN]
+    assert detector.decided_ms == 1000.0
+
+
+def test_from_settings():
+    assert AnsweringMachineDetector.from_settings({"amd": {"enabled": False}}) is None
+    detector = AnsweringMachineDetector.from_settings({"amd": {"enabled": True, "beep_ms": 200}})
+    assert detector.beep_frames == 10
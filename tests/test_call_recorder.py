@@ -0,0 +1,60 @@
+import json
+import asyncio
+
+import numpy as np
+
+from app.core import session_manager as sm
+from app.audio import encode_base64
+from app.audio import recorder as recorder_module
+
+
+def frames(count: int, amplitude: int = 4000) -> list:
+    tone = (np.sin(np.arange(160) * 0.3) * amplitude).astype(np.int16)
+    return [encode_base64(tone)] * count
+
+
+def audio_delta() -> str:
+    delta = encode_base64((np.sin(np.arange(1600) * 0.3) * 4000).astype(np.int16))
+    return json.dumps({"type": "response.audio.delta", "response_id": "resp_1", "item_id": "item_1", "delta": delta})
+
+
+def run_call(monkeypatch, tmp_path, start_call, steps) -> list:
+    monkeypatch.setattr(recorder_module, "CALL_RECORDING_DIR", str(tmp_path))
+    monkeypatch.setattr(sm, "load_conversation_settings", lambda start: {"recording": {"enabled": True}})
+
+    async def call() -> list:
+        session = await start_call()
+        session.latest_media_timestamp = 100
+        await steps()
+        interruptions = list(session.call_recorder.interruptions)
+        session.call_recorder.close()
+        return interruptions
+
+    return asyncio.run(call())
+
+
+def test_filler_cut_by_response_audio_is_not_an_interruption(monkeypatch, tmp_path, start_call):
+    async def steps() -> None:
+        # A one second filler clip is still queued when the response audio arrives
+        await sm.play_local_audio(frames(50), "filler")
+        await sm.handle_model_message(audio_delta())
+
+    assert run_call(monkeypatch, tmp_path, start_call, steps) == []
+
+
+def test_barge_in_during_response_is_an_interruption(monkeypatch, tmp_path, start_call):
+    async def steps() -> None:
+        await sm.handle_model_message(audio_delta())
+        sm.get_session().latest_media_timestamp = 150
+        await sm.handle_model_message(json.dumps({"type": "input_audio_buffer.speech_started", "item_id": "item_2"}))
+
+    assert run_call(monkeypatch, tmp_path, start_call, steps) == [150]
+
+
+def test_barge_in_during_filler_is_an_interruption(monkeypatch, tmp_path, start_call):
+    async def steps() -> None:
+        await sm.play_local_audio(frames(50), "filler")
+        sm.get_session().latest_media_timestamp = 300
+        await sm.handle_model_message(json.dumps({"type": "input_audio_buffer.speech_started", "item_id": "item_2"}))
+
+    assert run_call(monkeypatch, tmp_path, start_call, steps) == [300]
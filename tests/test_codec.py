@@ -0,0 +1,53 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from app.audio import (
+    ulaw_decode, ulaw_encode, decode_base64, encode_base64, frame_rms, rms_dbfs,
+    ULAW_DECODE_TABLE, ULAW_ENCODE_TABLE, FRAME_SAMPLES,
+)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    audioop = pytest.importorskip("audioop")
+
+
+def test_decode_table_matches_audioop():
+    codes = bytes(range(256))
+    expected = np.frombuffer(audioop.ulaw2lin(codes, 2), dtype=np.int16)
+    assert np.array_equal(ULAW_DECODE_TABLE, expected)
+
+
+def test_encode_table_matches_audioop():
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16)
+    expected = np.frombuffer(audioop.lin2ulaw(samples.tobytes(), 2), dtype=np.uint8)
+    assert np.array_equal(ULAW_ENCODE_TABLE[samples.view(np.uint16)], expected)
+
+
+def test_encode_decode_into_buffers():
+    samples = (np.sin(np.arange(480) * 0.05) * 12000).astype(np.int16)
+    codes = np.empty(1024, dtype=np.uint8)
+    pcm = np.empty(1024, dtype=np.int16)
+
+    encoded = ulaw_encode(samples, codes)
+    assert np.shares_memory(encoded, codes)
+    assert bytes(encoded) == audioop.lin2ulaw(samples.tobytes(), 2)
+    decoded = ulaw_decode(encoded, pcm)
+    assert len(decoded) == 480 and np.shares_memory(decoded, pcm)
+    assert np.array_equal(decoded, ulaw_decode(bytes(encoded)))
+
+
+def test_base64_round_trip():
+    samples = (np.sin(np.arange(160) * 0.3) * 8000).astype(np.int16)
+    payload = encode_base64(samples)
+    assert np.array_equal(decode_base64(payload), ulaw_decode(ulaw_encode(samples)))
+
+
+def test_frame_levels():
+    tone = (np.sin(np.arange(FRAME_SAMPLES * 2) * 0.3) * 16384).astype(np.int16)
+    silence = np.zeros(FRAME_SAMPLES, dtype=np.int16)
+    levels = frame_rms(np.concatenate((tone, silence)))
+    assert len(levels) == 3
+    assert levels[2] == 0
+    assert rms_dbfs(tone) == pytest.approx(-9.0, abs=0.2)
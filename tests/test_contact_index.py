@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from app.models.db_models import SubscriberStatus
+from app.services import contact_index as contact_index_module
+from app.services.contact_index import ContactPhoneIndex, normalize_phone
+
+
+def row(subscriber_id: int, phone: str, campaign_id: int = 7, mobile: str = None, status: int = 1) -> dict:
+    return {
+        "subscriber_id": subscriber_id, "contact_id": subscriber_id + 100, "campaign_id": campaign_id,
+        "first_name": "Ada", "last_name": "Lovelace", "city": "Austin", "state": "TX",
+        "phone_number": phone, "mobile": mobile, "status": status,
+    }
+
+
+class FakeContactDAO:
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.calls = []
+
+    async def get_campaign_contact_phones(self, campaign_id, updated_since=None):
+        self.calls.append(updated_since)
+        return list(self.rows)
+
+
+class FakeCampaignDAO:
+    async def get_campaign_with_ai_config(self, campaign_id):
+        return {"campaign_id": campaign_id, "config_updated_date": None}
+
+
+class FakeUtilities:
+    def __init__(self, rows: list):
+        self.contact_dao = FakeContactDAO(rows)
+        self.campaign_dao = FakeCampaignDAO()
+        self.survey_loads = 0
+
+    async def get_survey_config(self, campaign_id):
+        self.survey_loads += 1
+        return {"survey_id": "3", "questions": [{"id": 30, "question_text": "Do you plan to vote?"}], "choices": {}}
+
+
+@pytest.fixture
+def utils(monkeypatch) -> FakeUtilities:
+    utils = FakeUtilities([row(1, "5125550100"), row(2, "5125550101")])
+
+    async def get_vb_utilities():
+        return utils
+
+    monkeypatch.setattr(contact_index_module, "get_vb_utilities", get_vb_utilities)
+    return utils
+
+
+def test_normalize_phone():
+    assert normalize_phone("+1 (512) 555-0100") == "5125550100"
+    assert normalize_phone("512.555.0100") == "5125550100"
+    assert normalize_phone("15125550100") == "5125550100"
+    # Only an 11-digit number loses a leading 1
+    assert normalize_phone("+44 20 7946 0958") == "442079460958"
+    assert normalize_phone(None) == ""
+    assert normalize_phone("ext.") == ""
+
+
+def test_lookup_matches_any_format_and_prefers_campaign():
+    index = ContactPhoneIndex()
+    index.upsert(row(1, "+15125550100", campaign_id=7))
+    index.upsert(row(2, "512-555-0100", campaign_id=8, mobile="(512) 555-0199"))
+
+    assert index.lookup("(512) 555-0100", campaign_id="8").subscriber_id == "2"
+    assert index.lookup("5125550100", campaign_id="7").subscriber_id == "1"
+    assert index.lookup("1-512-555-0199").to_context()["contact_name"] == "Ada Lovelace"
+    assert index.lookup("5125550111") is None
+    assert index.lookup("") is None
+
+
+def test_upsert_moves_and_removes_numbers():
+    index = ContactPhoneIndex()
+    index.upsert(row(1, "5125550100"))
+    index.upsert(row(1, "5125550122"))
+    assert index.lookup("5125550100") is None
+    assert index.lookup("5125550122").subscriber_id == "1"
+
+    # Opted-out contacts are not indexed
+    index.upsert(row(1, "5125550122", status=SubscriberStatus.OPTED_OUT.value))
+    assert index.lookup("5125550122") is None
+    assert len(index) == 0
+
+
+def test_full_sync_drops_deleted_subscribers(utils):
+    contacts = utils.contact_dao
+    index = ContactPhoneIndex(full_sync_interval=3600)
+
+    asyncio.run(index.load_campaign("7"))
+    assert len(index) == 2
+
+    # An incremental sync cannot see the deleted row
+    contacts.rows = [row(1, "5125550100")]
+    asyncio.run(index.load_campaign("7"))
+    assert contacts.calls[-1] is not None
+    assert index.lookup("5125550101").subscriber_id == "2"
+
+    index.full_sync_interval = 0
+    asyncio.run(index.load_campaign("7"))
+    assert contacts.calls[-1] is None
+    assert index.lookup("5125550101") is None
+    assert index.lookup("5125550100").subscriber_id == "1"
+
+
+def test_survey_is_cached_until_a_full_sync(utils):
+    index = ContactPhoneIndex(full_sync_interval=3600)
+
+    asyncio.run(index.load_campaign("7"))
+    asyncio.run(index.load_campaign("7"))
+    assert utils.survey_loads == 1
+    assert index.get_survey("7")["survey_id"] == "3"
+    assert index.get_survey("8") is None
+
+    index.full_sync_interval = 0
+    asyncio.run(index.load_campaign("7"))
+    assert utils.survey_loads == 2
+
+    index.drop_campaign("7")
+    assert index.get_survey("7") is None
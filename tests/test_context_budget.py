@@ -0,0 +1,75 @@
+from app.core.context_budget import ConversationContext
+
+
+def message(item_id: str, text: str, role: str = "user") -> dict:
+    return {"id": item_id, "type": "message", "role": role, "content": [{"type": "input_text", "text": text}]}
+
+
+def call(item_id: str, call_id: str, arguments: str) -> dict:
+    return {"id": item_id, "type": "function_call", "call_id": call_id, "name": "lookup", "arguments": arguments}
+
+
+def output(item_id: str, call_id: str, text: str) -> dict:
+    return {"id": item_id, "type": "function_call_output", "call_id": call_id, "output": text}
+
+
+def test_tool_items_are_trimmed_first_and_in_pairs():
+    context = ConversationContext(max_tokens=100, target_tokens=50, keep_recent=2)
+    for item in (
+        message("m1", "x" * 160),
+        call("fc1", "c1", "y" * 200),
+        output("fo1", "c1", "z" * 200),
+        message("m2", "hi"),
+        message("m3", "ok", "assistant"),
+    ):
+        context.add(item)
+    assert context.over_budget()
+
+    deleted, summary = context.plan_trim()
+    assert deleted == ["fc1", "fo1"]
+    assert summary is None
+    assert list(context.items) == ["m1", "m2", "m3"]
+    assert not context.over_budget()
+    assert context.stats()["trimmed_items"] == 2
+
+
+def test_tool_call_with_recent_output_is_kept_whole():
+    context = ConversationContext(max_tokens=50, target_tokens=0, keep_recent=1, summary=False)
+    context.add(message("m1", "x" * 160))
+    context.add(call("fc1", "c1", "y" * 200))
+    context.add(output("fo1", "c1", "{}"))
+
+    deleted, _ = context.plan_trim()
+    assert deleted == ["m1"]
+    assert list(context.items) == ["fc1", "fo1"]
+
+
+def test_trimmed_turns_roll_into_one_summary():
+    context = ConversationContext(max_tokens=10, target_tokens=0, keep_recent=1)
+    context.add(message("m1", "I moved to Denver"))
+    context.add(message("m2", "Noted, thanks", "assistant"))
+    context.add(message("m3", "latest"))
+
+    deleted, summary = context.plan_trim()
+    assert deleted == ["m1", "m2"]
+    assert summary == "user: I moved to Denver\nassistant: Noted, thanks"
+    assert context.summary_item_id == "context_summary_1"
+
+    # The summary item is created, then a later trim replaces it
+    context.add(message("context_summary_1", summary, "system"))
+    context.add(message("m4", "I prefer email"))
+    context.add(message("m5", "latest"))
+    deleted, summary = context.plan_trim()
+    assert deleted == ["m3", "context_summary_1", "m4"]
+    assert summary.startswith("user: I moved to Denver")
+    assert summary.endswith("user: latest\nuser: I prefer email")
+    assert context.summary_item_id == "context_summary_2"
+
+
+def test_caller_audio_counts_before_the_item_exists():
+    context = ConversationContext()
+    context.speech_started("m1", 1000)
+    context.speech_stopped("m1", 4000)
+    context.add(message("m1", ""))
+    assert context.items["m1"].audio_ms == 3000
+    assert context.total_tokens == 30
@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+
+from app.audio import encode_base64
+from app.core.event_broadcaster import (
+    AUDIO_FRAME_HEADER,
+    AUDIO_FRAME_VERSION,
+    BinaryLogSubscriber,
+    EventBroadcaster,
+    LogSubscriber,
+    parse_subscription,
+    session_tag,
+)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.texts = []
+        self.binaries = []
+
+    async def send_text(self, text: str) -> None:
+        self.texts.append(text)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.binaries.append(data)
+
+
+def test_parse_subscription():
+    assert parse_subscription({}) == {}
+    assert parse_subscription({"events": "session.created, ,response.done", "audio": "5", "queue": "64"}) == {
+        "event_types": {"session.created", "response.done"},
+        "audio_sample_every": 5,
+        "queue_size": 64,
+    }
+    # Invalid numbers are ignored; a zero queue keeps the default size
+    assert parse_subscription({"audio": "often", "queue": "0"}) == {}
+    assert parse_subscription({"audio": "-3"}) == {"audio_sample_every": 0}
+
+
+def test_audio_is_sampled_and_filtered():
+    subscriber = LogSubscriber(FakeWebSocket(), event_types={"response.audio.delta"}, audio_sample_every=2)
+    assert [subscriber.wants("response.audio.delta") for _ in range(4)] == [True, False, True, False]
+    assert not subscriber.wants("caller_audio.delta")
+    assert not subscriber.wants("session.created")
+    assert not LogSubscriber(FakeWebSocket()).wants("response.audio.delta")
+
+
+def test_full_queue_drops_the_oldest_event():
+    async def run() -> list:
+        subscriber = LogSubscriber(FakeWebSocket(), queue_size=2)
+        for n in range(3):
+            subscriber.offer({"type": "e", "n": n}, (0, 0))
+        assert subscriber.dropped == 1
+        return [subscriber.queue.get_nowait()[0]["n"] for _ in range(2)]
+
+    assert asyncio.run(run()) == [1, 2]
+
+
+def test_binary_subscriber_frames_audio_and_keeps_json_events():
+    ws = FakeWebSocket()
+    payload = encode_base64(np.zeros(160, dtype=np.int16))
+
+    async def run() -> None:
+        broadcaster = EventBroadcaster()
+        subscriber = broadcaster.subscribe(BinaryLogSubscriber(ws))
+        broadcaster.start_session("MZ123")
+        broadcaster.publish({"type": "caller_audio.delta", "delta": payload}, timestamp=2**32 + 40)
+        await asyncio.sleep(0.01)
+        broadcaster.unsubscribe(subscriber)
+
+    asyncio.run(run())
+    assert '"streamSid": "MZ123"' in ws.texts[0]
+    frame = ws.binaries[0]
+    header = AUDIO_FRAME_HEADER.unpack(frame[:AUDIO_FRAME_HEADER.size])
+    assert header == (AUDIO_FRAME_VERSION, 0, session_tag("MZ123"), 40)
+    assert len(frame) == AUDIO_FRAME_HEADER.size + 160
@@ -0,0 +1,85 @@
+import json
+import asyncio
+import base64
+
+import pytest
+
+from app.core import session_manager as sm
+from app.services.greeting_cache import GreetingCache, GreetingRecorder
+from conftest import FakeSocket
+
+
+def audio_delta(size: int) -> str:
+    delta = base64.b64encode(b"\x7f" * size).decode("ascii")
+    return json.dumps({"type": "response.audio.delta", "item_id": "item_1", "delta": delta})
+
+
+def event(event_type: str, **fields) -> str:
+    return json.dumps({"type": event_type, **fields})
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path) -> GreetingCache:
+    cache = GreetingCache(str(tmp_path))
+    monkeypatch.setattr(sm, "greeting_cache", cache)
+    return cache
+
+
+def test_recorder_keeps_the_first_seconds_of_a_long_greeting():
+    recorder = GreetingRecorder("key", max_seconds=0.1)
+    recorder.add_delta(base64.b64encode(b"\x7f" * 600).decode("ascii"))
+    assert not recorder.full
+    recorder.add_delta(base64.b64encode(b"\x7f" * 1000).decode("ascii"))
+    recorder.transcript = "Hi there, this is Sam calling about the short survey"
+
+    assert recorder.full
+    assert len(recorder.audio) == 800
+    assert recorder.captured_transcript() == "Hi there, this is Sam"
+    assert recorder.is_complete()
+
+
+def test_model_speaks_first_when_no_greeting_was_played(monkeypatch, start_call):
+    model = FakeSocket()
+
+    async def connect(*args, **kwargs):
+        return model
+
+    async def listen() -> None:
+        pass
+
+    monkeypatch.setattr(sm.websockets, "connect", connect)
+    monkeypatch.setattr(sm, "handle_model_connection", listen)
+
+    async def call() -> list:
+        session = await start_call()
+        session.model_conn = None
+        session.openai_api_key = "sk-test"
+        await sm.try_connect_model()
+        return [e["type"] for e in model.events()]
+
+    assert asyncio.run(call()) == ["session.update", "response.create"]
+
+
+def test_first_response_is_cached_despite_early_caller_speech(cache, start_call):
+    async def call() -> None:
+        await start_call()
+        # The caller says hello before the opening line starts
+        await sm.handle_model_message(event("input_audio_buffer.speech_started", item_id="item_0"))
+        await sm.handle_model_message(audio_delta(1600))
+        await sm.handle_model_message(event("response.audio_transcript.done", item_id="item_1", transcript="Hi, it's Sam."))
+        await sm.handle_model_message(event("response.done", response={"status": "completed"}))
+
+    asyncio.run(call())
+    assert len(cache) == 1
+    assert next(iter(cache._greetings.values())).transcript == "Hi, it's Sam."
+
+
+def test_greeting_cut_short_by_the_caller_is_not_cached(cache, start_call):
+    async def call() -> None:
+        await start_call()
+        await sm.handle_model_message(audio_delta(1600))
+        await sm.handle_model_message(event("input_audio_buffer.speech_started", item_id="item_2"))
+        await sm.handle_model_message(event("response.done", response={"status": "cancelled"}))
+
+    asyncio.run(call())
+    assert len(cache) == 0
@@ -0,0 +1,32 @@
+import json
+import asyncio
+
+import numpy as np
+
+from app.core import session_manager as sm
+from app.audio import encode_base64
+from app.audio.vad import EnergyBargeInDetector
+from app.core.metrics import audio_frames_rejected
+
+
+def media(payload: str, timestamp: int = 20) -> str:
+    return json.dumps({"event": "media", "media": {"timestamp": str(timestamp), "payload": payload}})
+
+
+def test_malformed_frames_are_skipped(start_call):
+    rejected = audio_frames_rejected.value
+
+    async def call() -> list:
+        session = await start_call()
+        session.conversation_settings = {"barge_in": {"enabled": True}}
+        session.barge_in_detector = EnergyBargeInDetector.from_settings(session.conversation_settings)
+        await sm.handle_twilio_message(media("not base64!"))
+        # Two seconds of audio, more than the decode buffer holds
+        await sm.handle_twilio_message(media(encode_base64(np.zeros(16000, dtype=np.int16))))
+        await sm.handle_twilio_message(media(encode_base64(np.zeros(160, dtype=np.int16)), 40))
+        return session.model_conn.sent
+
+    sent = asyncio.run(call())
+    assert len(sent) == 1
+    assert json.loads(sent[0])["type"] == "input_audio_buffer.append"
+    assert audio_frames_rejected.value == rejected + 2
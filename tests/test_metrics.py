@@ -0,0 +1,64 @@
+from app.core.metrics import MetricsRegistry, percentile
+
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames").inc(3)
+    calls = registry.counter("calls_total", "Calls", ("result",))
+    calls.inc_labels("ok")
+    calls.inc_labels("ok")
+    calls.inc_labels('say "hi"\n')
+    registry.gauge("active", "Active calls", ("campaign",), callback=lambda: {("7",): 2})
+
+    assert registry.render() == "\n".join([
+        "# HELP frames_total Frames",
+        "# TYPE frames_total counter",
+        "frames_total 3",
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        'calls_total{result="ok"} 2',
+        'calls_total{result="say \\"hi\\"\\n"} 1',
+        "# HELP active Active calls",
+        "# TYPE active gauge",
+        'active{campaign="7"} 2',
+    ]) + "\n"
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_ms", "Latency", ("campaign",), buckets=(100, 500))
+    for value in (50, 100, 300, 900):
+        latency.observe(value, "7")
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_ms_bucket{campaign="7",le="100"} 2',
+        'latency_ms_bucket{campaign="7",le="500"} 3',
+        'latency_ms_bucket{campaign="7",le="+Inf"} 4',
+        'latency_ms_sum{campaign="7"} 1350',
+        'latency_ms_count{campaign="7"} 4',
+    ]
+
+
+def test_failing_gauge_callback_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "Broken", callback=lambda: 1 / 0)
+    registry.counter("frames_total", "Frames").inc()
+
+    lines = registry.render().splitlines()
+    assert lines[-1] == "frames_total 1"
+    assert any(line.startswith("# broken unavailable:") for line in lines)
+
+
+def test_registry_returns_existing_metrics():
+    registry = MetricsRegistry()
+    counter = registry.counter("frames_total", "Frames")
+    assert registry.counter("frames_total", "Other") is counter
+    gauge = registry.gauge("active", "Active")
+    registry.gauge("active", "Active", callback=lambda: 5)
+    assert gauge.series() == [({}, 5)]
+
+
+def test_percentile():
+    assert percentile([], 0.5) is None
+    assert percentile([300, 100, 200], 0.5) == 200
+    assert percentile([300, 100, 200], 0.99) == 300
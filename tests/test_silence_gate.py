@@ -0,0 +1,50 @@
+import numpy as np
+
+from app.audio.silence import SilenceGate
+
+# 20 ms frames at 8 kHz
+SPEECH = np.full(160, 8000, dtype=np.int16)
+SILENCE = np.zeros(160, dtype=np.int16)
+
+
+def feed(gate: SilenceGate, frames: int, samples: np.ndarray, label: str) -> list:
+    forwarded = []
+    for i in range(frames):
+        forwarded.extend(gate.process(f"{label}{i}", samples))
+    return forwarded
+
+
+def test_speech_and_hangover_are_forwarded():
+    gate = SilenceGate(hangover_ms=100)
+    assert feed(gate, 3, SPEECH, "s") == ["s0", "s1", "s2"]
+    # 100 ms of hangover is five frames; the sixth silent frame is gated
+    assert feed(gate, 6, SILENCE, "q") == ["q0", "q1", "q2", "q3", "q4"]
+    assert gate.frames_forwarded == 8
+
+
+def test_preroll_is_replayed_ahead_of_speech():
+    gate = SilenceGate(hangover_ms=0, preroll_ms=60)
+    assert feed(gate, 5, SILENCE, "q") == []
+    # Only the newest three gated frames are held back
+    assert gate.process("s", SPEECH) == ["q2", "q3", "q4", "s"]
+    stats = gate.stats()
+    assert stats["frames_in"] == 6
+    assert stats["frames_forwarded"] == 4
+    assert stats["bytes_saved"] == 4
+
+
+def test_keepalive_forwards_every_nth_gated_frame():
+    gate = SilenceGate(hangover_ms=0, keepalive_every=3)
+    assert feed(gate, 7, SILENCE, "q") == ["q2", "q5"]
+
+
+def test_from_settings_derives_hangover_from_server_vad():
+    assert SilenceGate.from_settings(None) is None
+    assert SilenceGate.from_settings({"silence_suppression": {"enabled": False}}) is None
+
+    gate = SilenceGate.from_settings({
+        "silence_suppression": {"enabled": True, "threshold_dbfs": -40},
+        "turn_detection": {"silence_duration_ms": 800},
+    })
+    assert gate.hangover_ms == 1300
+    assert gate.threshold_dbfs == -40.0
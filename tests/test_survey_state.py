@@ -0,0 +1,88 @@
+import json
+import asyncio
+import logging
+
+import pytest
+
+from app.core import session_manager as sm
+from app.core.constants import SYSTEM_PROMPT_2
+from app.core.survey_state import SurveyState
+from app.services.contact_index import ContactPhoneIndex
+
+SURVEY_CONFIG = {
+    "survey_id": "3",
+    "questions": [
+        {"id": 30, "question_text": "Do you plan to vote?", "is_required": True},
+        {"id": 31, "question_text": "Where are you from?", "is_required": False},
+    ],
+    "choices": {"30": [{"id": 300, "choice_text": "Yes"}, {"id": 301, "choice_text": "No"}]},
+}
+
+
+def test_next_question_walks_the_survey():
+    survey = SurveyState.from_config(SURVEY_CONFIG)
+    assert survey.next_question() == {
+        "question_id": "30", "text": "Do you plan to vote?", "remaining": 2, "choices": {"300": "Yes", "301": "No"},
+    }
+    assert survey.answer(choice_id="999") == "Choice 999 does not belong to question 30"
+    assert survey.answer(skip=True) == "Question 30 is required"
+    assert survey.answer(choice_id="300") is None
+
+    assert survey.next_question()["optional"] is True
+    assert survey.answer(skip=True) is None
+    assert survey.next_question() == {"done": True, "answered": 1}
+    assert survey.pending_answers() == [{"question_id": "30", "choice_id": "300", "answer_text": None}]
+
+
+@pytest.fixture
+def indexed_caller(monkeypatch) -> None:
+    index = ContactPhoneIndex()
+    index.upsert({"subscriber_id": 1, "contact_id": 101, "campaign_id": 7, "phone_number": "5125550100"})
+    monkeypatch.setattr(index, "get_survey", lambda campaign_id: SURVEY_CONFIG if campaign_id == "7" else None)
+    monkeypatch.setattr(sm, "contact_index", index)
+
+    async def no_database():
+        raise AssertionError("survey loaded from the database")
+
+    monkeypatch.setattr(sm, "get_vb_utilities", no_database)
+
+
+def test_call_start_uses_the_cached_survey(indexed_caller, start_call):
+    async def call() -> dict:
+        session = await start_call({"contact_number": "+15125550100"})
+        assert session.survey_loader is None
+        return json.loads(await sm.handle_function_call({"name": "next_question", "arguments": "{}"}))
+
+    assert asyncio.run(call())["question_id"] == "30"
+
+
+def test_survey_response_for_another_subscriber_is_logged(indexed_caller, start_call, caplog):
+    def save(subscriber_id: str) -> dict:
+        arguments = {"subscriber_id": subscriber_id, "question_id": "30", "choice_id": "301"}
+        return {"name": "save_survey_response", "arguments": json.dumps(arguments)}
+
+    async def call() -> list:
+        session = await start_call({"contact_number": "5125550100"})
+        await sm.handle_function_call(save("1"))
+        await sm.handle_function_call(save("99"))
+        return session.survey_state.pending_answers()
+
+    with caplog.at_level(logging.WARNING, logger=sm.logger.name):
+        answers = asyncio.run(call())
+    assert answers == [{"question_id": "30", "choice_id": "301", "answer_text": None}]
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings == ["save_survey_response named subscriber 99; recording the answer for the caller, subscriber 1"]
+
+
+def test_instructions_match_the_survey_source(indexed_caller, start_call):
+    async def instructions(contact_number: str) -> str:
+        await start_call({"contact_number": contact_number})
+        return sm.build_instructions()
+
+    with_survey = asyncio.run(instructions("5125550100"))
+    assert "next_question" in with_survey
+    assert "note_question_answers" not in with_survey
+    assert "Subscriber ID: 1" in with_survey
+
+    # An unknown caller has no survey state and keeps the built-in script
+    assert asyncio.run(instructions("5125550111")) == SYSTEM_PROMPT_2
@@ -0,0 +1,49 @@
+from app.core.tool_cache import ToolResultCache
+from app.core.vb_function_handlers import read_only_tools, tool_entities
+
+
+def make_cache() -> ToolResultCache:
+    return ToolResultCache(read_only_tools, tool_entities)
+
+
+def test_put_then_hit_with_normalized_args():
+    cache = make_cache()
+    assert cache.get("get_contact_info", {"contact_id": 42}) is None
+    cache.put("get_contact_info", {"contact_id": 42}, '{"id":42}')
+
+    assert cache.get("get_contact_info", {"contact_id": " 42 "}) == '{"id":42}'
+    assert cache.get("get_contact_info", {"contact_id": "42", "note": ""}) == '{"id":42}'
+    assert cache.get("get_contact_info", {"contact_id": "43"}) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["by_tool"]["get_contact_info"] == {"hits": 2, "misses": 2}
+
+
+def test_write_invalidates_only_reads_of_its_entity():
+    cache = make_cache()
+    cache.put("get_contact_info", {"contact_id": "42"}, "contact 42")
+    cache.put("get_contact_info", {"contact_id": "43"}, "contact 43")
+    cache.put("get_campaign_info", {"campaign_id": "7"}, "campaign 7")
+
+    assert cache.invalidate("add_contact_opt_out", {"contact_id": 42, "campaign_id": "7"}) == 1
+    assert cache.get("get_contact_info", {"contact_id": "42"}) is None
+    assert cache.get("get_contact_info", {"contact_id": "43"}) == "contact 43"
+    assert cache.get("get_campaign_info", {"campaign_id": "7"}) == "campaign 7"
+    assert cache.stats()["invalidations"] == 1
+
+    # Nothing to drop the second time
+    assert cache.invalidate("add_contact_opt_out", {"contact_id": "42"}) == 0
+
+
+def test_only_read_only_tools_are_cacheable():
+    cache = make_cache()
+    assert cache.is_cacheable("get_survey_questions")
+    assert not cache.is_cacheable("save_survey_response")
+
+
+def test_every_write_entity_is_read_by_a_cached_tool():
+    read = {kind for name in read_only_tools for kind, _ in tool_entities.get(name, [])}
+    for name, entities in tool_entities.items():
+        if name not in read_only_tools:
+            assert {kind for kind, _ in entities} <= read, name
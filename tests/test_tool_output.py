@@ -0,0 +1,49 @@
+import json
+from datetime import date
+
+from app.core.tool_output import project, short_scalars, compact_json, estimate_tokens, ToolOutputStats
+
+
+def test_project_keeps_listed_keys_and_drops_empty_values():
+    value = {"id": 7, "name": "Spring", "notes": "", "tags": [], "internal": "x"}
+    assert project(value, {"id": True, "name": True, "notes": True, "tags": True}) == {"id": 7, "name": "Spring"}
+
+
+def test_project_applies_wildcard_list_and_callable_specs():
+    value = {
+        "choices": {
+            "q1": [{"id": 1, "choice_text": "Yes", "created": "2024-01-01"}],
+            "q2": [{"id": 2, "choice_text": "No", "created": "2024-01-01"}],
+        },
+        "additional_vars": {"plan": "gold", "blob": "x" * 200, "score": 3, "nested": {"a": 1}},
+    }
+    spec = {
+        "choices": {"*": [{"id": True, "choice_text": True}]},
+        "additional_vars": short_scalars(),
+    }
+    assert project(value, spec) == {
+        "choices": {"q1": [{"id": 1, "choice_text": "Yes"}], "q2": [{"id": 2, "choice_text": "No"}]},
+        "additional_vars": {"plan": "gold", "score": 3},
+    }
+
+
+def test_project_passes_mismatched_shapes_through():
+    assert project("text", {"id": True}) == "text"
+    assert project({"id": 1}, [True]) == {"id": 1}
+
+
+def test_compact_json_has_no_separator_spaces_and_stringifies_dates():
+    output = compact_json({"name": "José", "when": date(2024, 5, 1), "ids": [1, 2]})
+    assert output == '{"name":"José","when":"2024-05-01","ids":[1,2]}'
+    assert json.loads(output)["when"] == "2024-05-01"
+
+
+def test_stats_totals_per_tool():
+    stats = ToolOutputStats()
+    assert stats.record("get_contact_info", "x" * 10) == (10, estimate_tokens("x" * 10))
+    stats.record("get_contact_info", "é")
+    stats.record("get_campaign_info", "{}")
+    summary = stats.stats()
+    assert summary["calls"] == 3
+    assert summary["bytes"] == 14
+    assert summary["by_tool"]["get_contact_info"] == {"calls": 2, "bytes": 12, "tokens": 4}
@@ -0,0 +1,88 @@
+import json
+import asyncio
+
+import pytest
+
+from app.core import session_manager as sm
+from app.core.tool_cache import ToolResultCache
+from app.core.tool_prefetch import FunctionCallPrefetcher, extract_complete_arguments
+from app.core.vb_function_handlers import read_only_tools, tool_entities, prefetch_args
+
+
+def test_extract_complete_arguments_waits_for_delimiters():
+    assert extract_complete_arguments('{"contact_id": 12') == {}
+    assert extract_complete_arguments('{"contact_id": 123, "name": "Ad') == {"contact_id": 123}
+    assert extract_complete_arguments('{"name": "A\\"da"}') == {"name": 'A"da'}
+
+
+def test_prefetcher_reports_a_call_once_its_key_arguments_stream_in():
+    prefetcher = FunctionCallPrefetcher(prefetch_args)
+    prefetcher.on_item_added({"type": "function_call", "id": "item_1", "name": "get_contact_info"})
+    assert prefetcher.on_arguments_delta("item_1", '{"contact_id": "4') is None
+    assert prefetcher.on_arguments_delta("item_1", '2", "verbose": true') == ("get_contact_info", {"contact_id": "42"})
+    assert prefetcher.on_arguments_delta("item_1", "}") is None
+
+
+@pytest.fixture
+def tool_session(monkeypatch):
+    runs = []
+
+    async def run_function(fn_def, args):
+        runs.append(args)
+        await asyncio.sleep(0.01)
+        return json.dumps({"id": args["contact_id"]})
+
+    monkeypatch.setattr(sm, "run_function", run_function)
+    sm.reset_session()
+    session = sm.get_session()
+    session.tool_cache = ToolResultCache(read_only_tools, tool_entities)
+    session.tool_prefetcher = FunctionCallPrefetcher(prefetch_args)
+    yield session, runs
+    sm.reset_session()
+
+
+def call(arguments: dict) -> dict:
+    return {"name": "get_contact_info", "call_id": "call_1", "arguments": json.dumps(arguments)}
+
+
+def test_call_with_extra_arguments_claims_the_prefetch(tool_session):
+    session, runs = tool_session
+
+    async def run() -> str:
+        sm.start_prefetch("get_contact_info", {"contact_id": "42"})
+        return await sm.handle_function_call(call({"contact_id": 42, "fields": "all"}))
+
+    assert json.loads(asyncio.run(run())) == {"id": "42"}
+    assert len(runs) == 1
+    assert session.tool_cache.stats()["prefetch_hits"] == 1
+
+
+def test_cancelled_prefetch_runs_the_tool_again(tool_session):
+    session, runs = tool_session
+
+    async def run() -> str:
+        sm.start_prefetch("get_contact_info", {"contact_id": "42"})
+        await asyncio.sleep(0)
+        next(iter(session.tool_cache._pending.values())).cancel()
+        return await sm.handle_function_call(call({"contact_id": "42"}))
+
+    assert json.loads(asyncio.run(run())) == {"id": "42"}
+    assert len(runs) == 2
+
+
+def test_cancelling_the_call_cancels_the_prefetch(tool_session):
+    session, runs = tool_session
+
+    async def run() -> asyncio.Task:
+        sm.start_prefetch("get_contact_info", {"contact_id": "42"})
+        pending = next(iter(session.tool_cache._pending.values()))
+        handler = asyncio.create_task(sm.handle_function_call(call({"contact_id": "42"})))
+        await asyncio.sleep(0)
+        handler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handler
+        await asyncio.sleep(0)
+        return pending
+
+    assert asyncio.run(run()).cancelled()
+    assert len(runs) == 1